@@ -0,0 +1,16 @@
+from time import perf_counter
+from typing import Final
+
+
+# --------------------- CONSTANTS ---------------------
+MICROSECONDS_IN_ONE_SECOND: Final = 1000000
+# ------------------- END CONSTANTS -------------------
+
+
+def get_average_call_time(fn, args_list):
+    # returns average time of a single call in microseconds
+    start_time = perf_counter()
+    for args in args_list:
+        fn(*args)
+
+    return (perf_counter() - start_time) / len(args_list) * MICROSECONDS_IN_ONE_SECOND
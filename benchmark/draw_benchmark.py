@@ -0,0 +1,94 @@
+from random import seed, uniform
+from time import perf_counter
+from typing import Final
+
+from pyglet import gl
+from pyglet.sprite import Sprite as PygletSprite
+
+from ui import WINDOW, BATCHES, GROUPS, MAP_CAMERA, MAP_WIDTH, MAP_HEIGHT, GREEN_SIGNAL_IMAGE, RED_SIGNAL_IMAGE, \
+    SWITCHES_STRAIGHT, CAR_HEAD_IMAGE, CAR_MID_IMAGE, BOARDING_LIGHT_IMAGE
+
+# --------------------- CONSTANTS ---------------------
+MILLISECONDS_IN_ONE_SECOND: Final = 1000
+DRAW_FRAMES: Final = 600    # number of frames drawn in every mode
+WARMUP_FRAMES: Final = 60   # number of frames drawn before measurement starts
+# static scene close to fully built passenger map: number of sprites of every kind in the main batch
+SIGNALS: Final = 256
+SWITCHES: Final = 96
+TRAINS: Final = 24
+CARS: Final = 20
+# ------------------- END CONSTANTS -------------------
+
+
+def _on_create_static_map_scene():
+    # nothing is moving, created or deleted: the same as paused game or idle map
+    seed(0)
+    sprites = []
+    for i in range(SIGNALS):
+        sprites.append(
+            PygletSprite(
+                (GREEN_SIGNAL_IMAGE, RED_SIGNAL_IMAGE)[i % 2], x=uniform(0, MAP_WIDTH), y=uniform(0, MAP_HEIGHT),
+                batch=BATCHES['main_batch'], group=GROUPS['signal']
+            )
+        )
+
+    for i in range(SWITCHES):
+        sprites.append(
+            PygletSprite(
+                SWITCHES_STRAIGHT.get_region(i * 32, 0, 32, 32), x=uniform(0, MAP_WIDTH), y=uniform(0, MAP_HEIGHT),
+                batch=BATCHES['main_batch'], group=GROUPS['signal']
+            )
+        )
+
+    for i in range(TRAINS):
+        x, y = uniform(0, MAP_WIDTH), uniform(0, MAP_HEIGHT)
+        for j in range(CARS):
+            texture = CAR_HEAD_IMAGE[0][0][0] if j == 0 else CAR_MID_IMAGE[0][0]
+            if i % 4 == 0 and 0 < j < CARS - 1:
+                texture = BOARDING_LIGHT_IMAGE[0][0]
+
+            sprites.append(
+                PygletSprite(
+                    texture, x=x + j * texture.width, y=y, batch=BATCHES['main_batch'], group=GROUPS['train'],
+                    usage='stream'
+                )
+            )
+
+    return sprites
+
+
+def _get_average_frame_time(invalidate_every_frame):
+    # returns average frame time in milliseconds; glFinish() is called to include GPU time
+    for i in range(WARMUP_FRAMES + DRAW_FRAMES):
+        if i == WARMUP_FRAMES:
+            start_time = perf_counter()
+
+        WINDOW.switch_to()
+        WINDOW.dispatch_events()
+        WINDOW.clear()
+        if invalidate_every_frame:
+            for batch in BATCHES:
+                BATCHES[batch].invalidate()
+
+        with MAP_CAMERA:
+            BATCHES['main_batch'].draw()
+
+        BATCHES['mini_map_batch'].draw()
+        BATCHES['ui_batch'].draw()
+        gl.glFinish()
+        WINDOW.flip()
+
+    return (perf_counter() - start_time) / DRAW_FRAMES * MILLISECONDS_IN_ONE_SECOND
+
+
+def main():
+    # vsync would cap both modes at display refresh rate
+    WINDOW.set_vsync(False)
+    sprites = _on_create_static_map_scene()
+    print(f'static map scene: {len(sprites)} sprites, {DRAW_FRAMES} frames')
+    print(f'  invalidate every frame: {_get_average_frame_time(invalidate_every_frame=True):.3f} ms/frame')
+    print(f'  change-driven:          {_get_average_frame_time(invalidate_every_frame=False):.3f} ms/frame')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+from typing import Final
+
+from benchmark import get_average_call_time
+from model import TRAIN_MAXIMUM_SPEED, TRAIN_MAXIMUM_SPEED_STATE_TIME, get_braking_distance, get_speed_state_time, \
+    _get_speed_state_time_by_bisection
+
+# --------------------- CONSTANTS ---------------------
+BRAKING_RANGE_SAMPLES: Final = 20000  # number of braking distances checked on each map
+# ------------------- END CONSTANTS -------------------
+
+
+def main():
+    # compares table-based get_speed_state_time() with bisection across the full braking range;
+    # distance error is the one that matters for the game: it shifts train stop point
+    for map_id in range(len(TRAIN_MAXIMUM_SPEED)):
+        maximum_braking_distance = get_braking_distance(TRAIN_MAXIMUM_SPEED_STATE_TIME[map_id])
+        args_list = [
+            (maximum_braking_distance * i / BRAKING_RANGE_SAMPLES, map_id) for i in range(1, BRAKING_RANGE_SAMPLES)
+        ]
+        maximum_time_error, maximum_distance_error = 0.0, 0.0
+        for s, m in args_list:
+            t = get_speed_state_time(s, m)
+            maximum_time_error = max(maximum_time_error, abs(t - _get_speed_state_time_by_bisection(s, m)))
+            maximum_distance_error = max(maximum_distance_error, abs(get_braking_distance(t) - s))
+
+        print(f'map {map_id}: braking range 0..{maximum_braking_distance:.3f}, {len(args_list)} samples')
+        print(f'  bisection:   {get_average_call_time(_get_speed_state_time_by_bisection, args_list):.3f} us/call')
+        print(f'  table:       {get_average_call_time(get_speed_state_time, args_list):.3f} us/call')
+        print(f'  max speed state time error: {maximum_time_error:.3e}')
+        print(f'  max braking distance error: {maximum_distance_error:.3e}')
+
+
+if __name__ == '__main__':
+    main()
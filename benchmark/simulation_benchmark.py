@@ -0,0 +1,174 @@
+import sys
+from argparse import ArgumentParser
+from importlib import import_module
+from json import dumps, loads
+from subprocess import run
+from time import perf_counter
+from tracemalloc import start, stop, get_traced_memory
+from typing import Final
+
+try:
+    from resource import getrusage, RUSAGE_SELF
+except ImportError:
+    # resource module is not available on Windows, peak RSS is not reported there
+    getrusage, RUSAGE_SELF = None, None
+
+# --------------------- CONSTANTS ---------------------
+SIMULATION_HOURS: Final = 1     # number of game hours simulated in every scenario by default
+ALLOCATION_HOURS: Final = 0.25  # number of game hours simulated with allocation tracing after timing run
+SIMULATION_SEEDS: Final = (0, 1, 2)
+# scenario: map to play on, player level, time speed, True if all tracks and environment tiers are built;
+# passenger map is always unlocked, so freight map scenarios simulate both maps
+SCENARIOS: Final = {
+    'passenger_level_1_x1': ('passenger', 1, 1.0, False),
+    'passenger_level_1_x4': ('passenger', 1, 4.0, False),
+    'passenger_level_1_x16': ('passenger', 1, 16.0, False),
+    'passenger_level_50_x4': ('passenger', 50, 4.0, False),
+    'freight_level_1_x4': ('freight', 1, 4.0, False),
+    'freight_level_50_x16': ('freight', 50, 16.0, False),
+    'max_level_all_tracks_x1': ('passenger', 200, 1.0, True),
+    'max_level_all_tracks_x16': ('passenger', 200, 16.0, True),
+}
+# subsystem: module and class which on_update_time() is timed
+SUBSYSTEMS: Final = {
+    'scheduler': ('model.scheduler_model', 'SchedulerModel'),
+    'dispatcher': ('model.dispatcher_model', 'DispatcherModel'),
+    'train_routes': ('model.train_route_model', 'TrainRouteModel'),
+    'trains': ('model.train_model', 'TrainModel'),
+    'train_state_engine': ('model.train_model.train_state_engine', 'TrainStateEngine'),
+    'crossovers': ('model.crossover_model', 'CrossoverModel'),
+    'constructor': ('model.constructor_model', 'ConstructorModel'),
+    'narrator': ('model.narrator_model', 'NarratorModel'),
+}
+MILLISECONDS_IN_ONE_SECOND: Final = 1000
+# ------------------- END CONSTANTS -------------------
+
+
+def _timed(fn, subsystem, subsystem_time):
+    def _on_update_time_timed(*args, **kwargs):
+        start_time = perf_counter()
+        fn(*args, **kwargs)
+        subsystem_time[subsystem] += perf_counter() - start_time
+
+    return _on_update_time_timed
+
+
+def _on_time_subsystems(subsystem_time):
+    # class methods are replaced, so trains created during the run are timed as well
+    for subsystem, (module_name, class_name) in SUBSYSTEMS.items():
+        cls = getattr(import_module(module_name), class_name)
+        cls.on_update_time = _timed(cls.on_update_time, subsystem, subsystem_time)
+        subsystem_time[subsystem] = 0.0
+
+
+def _on_build_everything(map_controller):
+    # construction is completed right away the same way constructor does it when construction time is over
+    from database import CONSTRUCTION_STATE_MATRIX, TRACKS, ENVIRONMENT, LOCKED, UNDER_CONSTRUCTION, \
+        CONSTRUCTION_TIME, MAX_CONSTRUCTION_TIME, TRUE
+
+    construction_state = CONSTRUCTION_STATE_MATRIX[map_controller.map_id]
+    for tier in sorted(t for t in construction_state[ENVIRONMENT] if construction_state[ENVIRONMENT][t][LOCKED]):
+        construction_state[ENVIRONMENT][tier][UNDER_CONSTRUCTION] = TRUE
+        construction_state[ENVIRONMENT][tier][CONSTRUCTION_TIME] = construction_state[ENVIRONMENT][tier][
+            MAX_CONSTRUCTION_TIME
+        ]
+        map_controller.constructor.model.on_update_time(0.0)
+
+    # only one track is removed from construction matrix per update, so tracks are completed one by one
+    for track in sorted(construction_state[TRACKS]):
+        construction_state[TRACKS][track][UNDER_CONSTRUCTION] = TRUE
+        construction_state[TRACKS][track][CONSTRUCTION_TIME] = construction_state[TRACKS][track][MAX_CONSTRUCTION_TIME]
+        map_controller.constructor.model.on_update_time(0.0)
+
+
+def _run_scenario(scenario, random_seed, hours):
+    # simulation replaces view and ui packages and reads save file on import,
+    # that's why every scenario is run in a separate process
+    from simulation import Simulation
+    from database import PASSENGER_MAP, FREIGHT_MAP
+
+    map_name, level, dt_multiplier, build_everything = SCENARIOS[scenario]
+    subsystem_time = {}
+    _on_time_subsystems(subsystem_time)
+    simulation = Simulation(random_seed=random_seed, dt_multiplier=dt_multiplier)
+    map_id = {'passenger': PASSENGER_MAP, 'freight': FREIGHT_MAP}[map_name]
+    if map_id == FREIGHT_MAP:
+        simulation.game.on_unlock_map(FREIGHT_MAP)
+
+    while simulation.game.model.level < level:
+        simulation.game.on_level_up()
+
+    if build_everything:
+        _on_build_everything(simulation.game.maps[map_id])
+
+    for subsystem in subsystem_time:
+        subsystem_time[subsystem] = 0.0
+
+    start_time = perf_counter()
+    ticks = simulation.run(hours)
+    run_time = perf_counter() - start_time
+    # allocation tracing slows the game down a lot, so it is done after timing run
+    start()
+    simulation.run(ALLOCATION_HOURS)
+    traced_current, traced_peak = get_traced_memory()
+    stop()
+    return {
+        'scenario': scenario,
+        'seed': random_seed,
+        'map': map_name,
+        'level': level,
+        'dt_multiplier': dt_multiplier,
+        'unlocked_tracks': simulation.game.maps[map_id].model.unlocked_tracks,
+        'hours': hours,
+        'ticks': ticks,
+        'run_time': run_time,
+        'ticks_per_second': ticks / run_time,
+        'subsystem_time_ms': {
+            subsystem: subsystem_time[subsystem] * MILLISECONDS_IN_ONE_SECOND for subsystem in subsystem_time
+        },
+        'allocation_hours': ALLOCATION_HOURS,
+        'traced_memory_current_bytes': traced_current,
+        'traced_memory_peak_bytes': traced_peak,
+        # ru_maxrss is in kilobytes on Linux
+        'peak_rss_kb': getrusage(RUSAGE_SELF).ru_maxrss if getrusage is not None else None,
+        # final game state: the same seed must always give the same result
+        'money': simulation.game.model.money,
+        'exp': simulation.game.model.exp,
+    }
+
+
+def main():
+    parser = ArgumentParser(description='Run deterministic headless simulation benchmark scenarios.')
+    parser.add_argument('--hours', type=float, default=SIMULATION_HOURS, help='number of game hours per scenario')
+    parser.add_argument('--seeds', type=int, nargs='+', default=SIMULATION_SEEDS, help='random seeds to replay')
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--output', default=None, help='JSON file to write results to instead of stdout')
+    parser.add_argument('--scenario', choices=SCENARIOS, default=None, help='run single scenario in this process')
+    args = parser.parse_args()
+    if args.scenario is not None:
+        print(dumps(_run_scenario(args.scenario, args.seeds[0], args.hours)))
+        return
+
+    results = []
+    for scenario in args.scenarios:
+        for random_seed in args.seeds:
+            process = run(
+                [
+                    sys.executable, '-m', 'benchmark.simulation_benchmark', '--scenario', scenario,
+                    '--seeds', str(random_seed), '--hours', str(args.hours)
+                ], capture_output=True, text=True, check=True
+            )
+            results.append(loads(process.stdout.splitlines()[-1]))
+            print(f'{scenario}, seed {random_seed}: {results[-1]["ticks_per_second"]:.1f} ticks per second',
+                  file=sys.stderr)
+
+    report = dumps({'python': sys.version, 'results': results}, indent=2)
+    if args.output is None:
+        print(report)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(report)
+
+
+if __name__ == '__main__':
+    main()
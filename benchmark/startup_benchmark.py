@@ -0,0 +1,166 @@
+import sys
+from argparse import ArgumentParser
+from json import dumps, loads
+from subprocess import run
+from time import perf_counter
+from typing import Final
+
+# --------------------- CONSTANTS ---------------------
+MILLISECONDS_IN_ONE_SECOND: Final = 1000
+STARTUP_RUNS: Final = 10    # number of times trail points are loaded for every map
+BUILD_RUNS: Final = 5       # number of processes in which game controller is built with every trail points loader
+# trail points loader used during game controller build: 'bulk' is the current one, 'per_route' is the one used before
+TRAIL_POINTS_LOADERS: Final = ('per_route', 'bulk')
+# ------------------- END CONSTANTS -------------------
+
+# (track, train_route) -> route index for every map, filled before timing starts
+_route_indices = [{}, {}]
+
+
+def _on_load_route_indices(map_id):
+    # route index is the row number in the same query bulk loader uses
+    from database import CONFIG_DB_CURSOR
+
+    CONFIG_DB_CURSOR.execute('''SELECT track, train_route FROM train_route_config WHERE map_id = ?''', (map_id, ))
+    _route_indices[map_id] = {r: i for i, r in enumerate(CONFIG_DB_CURSOR.fetchall())}
+
+
+def _get_trail_points_v2_by_route(map_id, track, train_route):
+    # the way trail points were loaded before: two queries and a new instance for every train route
+    from database import CONFIG_DB_CURSOR, TrailPointsV2
+
+    CONFIG_DB_CURSOR.execute(
+        '''SELECT trail_points_v2_part_1_start, trail_points_v2_part_1_end FROM train_route_config
+        WHERE track = ? AND train_route = ? AND map_id = ?''', (track, train_route, map_id)
+    )
+    part_1 = CONFIG_DB_CURSOR.fetchone()
+    CONFIG_DB_CURSOR.execute(
+        '''SELECT trail_points_v2_part_2_head_tail, trail_points_v2_part_2_mid FROM train_route_config
+        WHERE track = ? AND train_route = ? AND map_id = ?''', (track, train_route, map_id)
+    )
+    return TrailPointsV2(_route_indices[map_id][(track, train_route)], *part_1, *CONFIG_DB_CURSOR.fetchone())
+
+
+def _on_load_trail_points_v2_by_route(map_id):
+    for track, train_route in _route_indices[map_id]:
+        _get_trail_points_v2_by_route(map_id, track, train_route)
+
+
+def _on_load_train_routes_by_row(map_id):
+    # the way train route state was loaded before: one query for every train route
+    from database import USER_DB_CURSOR
+
+    USER_DB_CURSOR.execute('''SELECT track, train_route FROM train_routes WHERE map_id = ?''', (map_id, ))
+    for track, train_route in USER_DB_CURSOR.fetchall():
+        USER_DB_CURSOR.execute(
+            '''SELECT opened, last_opened_by, current_checkpoint, priority, cars FROM train_routes
+            WHERE track = ? AND train_route = ? AND map_id = ?''', (track, train_route, map_id)
+        )
+        USER_DB_CURSOR.fetchone()
+
+
+def _on_load_train_routes_from_index(map_id):
+    # new index is created every time to include full table scan
+    from database import USER_DB_CURSOR, USER_DB_CONNECTION, TableIndex
+
+    user_db_index = TableIndex(USER_DB_CONNECTION)
+    USER_DB_CURSOR.execute('''SELECT track, train_route FROM train_routes WHERE map_id = ?''', (map_id, ))
+    for track, train_route in USER_DB_CURSOR.fetchall():
+        user_db_index.get_row(
+            'train_routes', ('opened', 'last_opened_by', 'current_checkpoint', 'priority', 'cars'),
+            track=track, train_route=train_route, map_id=map_id
+        )
+
+
+def _get_average_load_time(fn, map_id):
+    # returns average load time in milliseconds
+    start_time = perf_counter()
+    for i in range(STARTUP_RUNS):
+        fn(map_id)
+
+    return (perf_counter() - start_time) / STARTUP_RUNS * MILLISECONDS_IN_ONE_SECOND
+
+
+def _build_game(trail_points_loader):
+    # simulation replaces view and ui packages and must be imported before database,
+    # that's why every build is done in a separate process; build time includes all database reads
+    from simulation import Simulation
+    from database import PASSENGER_MAP, FREIGHT_MAP
+    from controller.game_controller import GameController
+    import model.train_route_model
+
+    if trail_points_loader == 'per_route':
+        for map_id in (PASSENGER_MAP, FREIGHT_MAP):
+            _on_load_route_indices(map_id)
+
+        model.train_route_model.get_trail_points_v2 = _get_trail_points_v2_by_route
+
+    map_build_time = {}
+    on_create_map = GameController.on_create_map
+
+    def _on_create_map_timed(self, map_id):
+        start_time = perf_counter()
+        on_create_map(self, map_id)
+        map_build_time[map_id] = perf_counter() - start_time
+
+    GameController.on_create_map = _on_create_map_timed
+    start_time = perf_counter()
+    # game controller creates all unlocked maps, passenger map is unlocked by simulation if needed
+    simulation = Simulation()
+    game_build_time = perf_counter() - start_time
+    # freight map controller is built when player unlocks it
+    if simulation.game.maps[FREIGHT_MAP] is None:
+        simulation.game.on_unlock_map(FREIGHT_MAP)
+
+    return {
+        'trail_points_loader': trail_points_loader,
+        'game_build_time_ms': game_build_time * MILLISECONDS_IN_ONE_SECOND,
+        'map_build_time_ms': {
+            map_id: map_build_time[map_id] * MILLISECONDS_IN_ONE_SECOND for map_id in (PASSENGER_MAP, FREIGHT_MAP)
+        }
+    }
+
+
+def main():
+    parser = ArgumentParser(description='Measure game startup time with current and previous trail points loaders.')
+    parser.add_argument('--runs', type=int, default=BUILD_RUNS, help='number of builds with every loader')
+    parser.add_argument('--build', choices=TRAIL_POINTS_LOADERS, default=None, help='build game in this process')
+    args = parser.parse_args()
+    if args.build is not None:
+        print(dumps(_build_game(args.build)))
+        return
+
+    # game controller and map controller builds are what player waits for on startup
+    for trail_points_loader in TRAIL_POINTS_LOADERS:
+        results = []
+        for i in range(args.runs):
+            process = run(
+                [sys.executable, '-m', 'benchmark.startup_benchmark', '--build', trail_points_loader],
+                capture_output=True, text=True, check=True
+            )
+            results.append(loads(process.stdout.splitlines()[-1]))
+
+        print(f'{trail_points_loader} trail points, average of {args.runs} builds:')
+        print(f'  game controller: {sum(r["game_build_time_ms"] for r in results) / args.runs:.3f} ms')
+        for map_id in results[0]['map_build_time_ms']:
+            print(f'  map {map_id} controller: '
+                  f'{sum(r["map_build_time_ms"][map_id] for r in results) / args.runs:.3f} ms')
+
+    # trail points are the most expensive part of train route setup during map controller startup
+    from database import CONFIG_DB_CURSOR, PASSENGER_MAP, FREIGHT_MAP, on_load_trail_points_v2
+
+    for map_id in (PASSENGER_MAP, FREIGHT_MAP):
+        _on_load_route_indices(map_id)
+        CONFIG_DB_CURSOR.execute('''SELECT COUNT(*) FROM train_route_config WHERE map_id = ?''', (map_id, ))
+        print(f'map {map_id}: {CONFIG_DB_CURSOR.fetchone()[0]} train routes')
+        print(f'  query per route: {_get_average_load_time(_on_load_trail_points_v2_by_route, map_id):.3f} ms')
+        print(f'  bulk query:      {_get_average_load_time(on_load_trail_points_v2, map_id):.3f} ms')
+        # the same applies to every table read by model constructors, train routes are the biggest one
+        print(f'  train route state, query per route: '
+              f'{_get_average_load_time(_on_load_train_routes_by_row, map_id):.3f} ms')
+        print(f'  train route state, table index:     '
+              f'{_get_average_load_time(_on_load_train_routes_from_index, map_id):.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
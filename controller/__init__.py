@@ -74,9 +74,12 @@ class AppBaseController(ABC):
             controller.on_update_current_locale(new_locale)
 
     def on_save_state(self):
-        self.model.on_save_state()
+        # returns (statement, parameters) rows for the whole controller tree, written by SaveStateWorker
+        save_state_rows = [*self.model.on_save_state()]
         for controller in self.child_controllers:
-            controller.on_save_state()
+            save_state_rows.extend(controller.on_save_state())
+
+        return save_state_rows
 
     def on_update_clock_state(self, clock_24h_enabled):
         self.view.on_update_clock_state(clock_24h_enabled)
@@ -87,14 +90,9 @@ class AppBaseController(ABC):
     def on_activate_view(self):
         self.view.on_activate()
 
-    @final
-    def on_update_view(self):
-        self.view.on_update()
-        for controller in self.child_controllers:
-            controller.on_update_view()
-
     @final
     def on_fade_animation_update(self, dt):
+        # UI objects' fade animations are updated by UPDATE_SCHEDULER, see FadeAnimationV2
         self.fade_in_animation.on_update(dt)
         self.fade_out_animation.on_update(dt)
         for controller in self.child_controllers:
@@ -371,6 +369,12 @@ class GameBaseController(AppBaseController, ABC):
         for controller in self.child_controllers:
             controller.on_deactivate_construction_speed_bonus_code()
 
+    @final
+    def on_update_game_state(self, game_model):
+        self.model.on_update_game_state(game_model)
+        for controller in self.child_controllers:
+            controller.on_update_game_state(game_model)
+
 
 class MapBaseController(GameBaseController, ABC):
     def __init__(self, map_id, parent_controller=None, logger=None):
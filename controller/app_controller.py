@@ -2,7 +2,7 @@ from logging import getLogger
 from typing import final
 
 from controller import AppBaseController
-from database import on_commit, PASSENGER_MAP
+from database import COMMIT_QUEUE, SAVE_STATE_WORKER, PASSENGER_MAP
 from ui import WINDOW
 from model.app_model import AppModel
 from view.app_view import AppView
@@ -92,8 +92,8 @@ class AppController(AppBaseController):
         self.model.on_save_and_commit_locale(new_locale)
 
     def on_save_state(self):
-        super().on_save_state()
-        on_commit()
+        # only the snapshot is taken here, it is written to disk by save state worker
+        SAVE_STATE_WORKER.on_save_state([*COMMIT_QUEUE.on_pop_rows(), *super().on_save_state()])
 
     def on_update_clock_state(self, clock_24h_enabled):
         super().on_update_clock_state(clock_24h_enabled)
@@ -225,6 +225,25 @@ class AppController(AppBaseController):
         else:
             self.view.fps_display.on_deactivate()
 
+    def on_apply_settings(self, controller):
+        # controller created after settings were accepted gets the same broadcasts the rest of the app got
+        controller.on_update_fade_animation_state(self.settings.model.fade_animations_enabled)
+        controller.on_update_clock_state(self.settings.model.clock_24h_enabled)
+        controller.on_change_level_up_notification_state(self.settings.model.level_up_notification_enabled)
+        controller.on_change_feature_unlocked_notification_state(
+            self.settings.model.feature_unlocked_notification_enabled
+        )
+        controller.on_change_construction_completed_notification_state(
+            self.settings.model.construction_completed_notification_enabled
+        )
+        controller.on_change_enough_money_notification_state(self.settings.model.enough_money_notification_enabled)
+        controller.on_change_bonus_expired_notification_state(self.settings.model.bonus_expired_notification_enabled)
+        controller.on_change_shop_storage_notification_state(self.settings.model.shop_storage_notification_enabled)
+        controller.on_change_voice_not_found_notification_state(
+            self.settings.model.voice_not_found_notification_enabled
+        )
+        controller.on_update_announcements_state(self.settings.model.announcements_enabled)
+
     def on_save_and_commit_bonus_code_abuse(self):
         self.model.on_save_and_commit_bonus_code_abuse()
 
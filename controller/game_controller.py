@@ -1,6 +1,6 @@
-from itertools import chain
 from logging import getLogger
-from typing import final
+from time import perf_counter
+from typing import Final, final
 
 from controller import GameBaseController, game_is_not_paused, view_is_active
 from model.game_model import GameModel
@@ -13,7 +13,12 @@ from controller.map_switcher_controller import MapSwitcherController
 from controller.map_controller.passenger_map_controller import PassengerMapController
 from controller.map_controller.freight_map_controller import FreightMapController
 from database import PASSENGER_MAP, FREIGHT_MAP, SECONDS_IN_ONE_HOUR, BONUS_VALUE, BONUS_CODE_MATRIX, CODE_TYPE, \
-    CONSTRUCTION_SPEED_BONUS_CODE, MONEY_BONUS_CODE, EXP_BONUS_CODE
+    CONSTRUCTION_SPEED_BONUS_CODE, MONEY_BONUS_CODE, EXP_BONUS_CODE, MAP_SWITCHER_STATE_MATRIX, MAP_LOCKED
+from profiler import FRAME_PROFILER
+
+# --------------------- CONSTANTS ---------------------
+MAP_CONTROLLERS: Final = (PassengerMapController, FreightMapController)     # map controller class by map_id
+# ------------------- END CONSTANTS -------------------
 
 
 @final
@@ -26,36 +31,44 @@ class GameController(GameBaseController):
         self.fade_out_animation = GameFadeOutAnimation(self.view)
         self.bonus_code_manager = BonusCodeManagerController(self)
         self.map_switcher = MapSwitcherController(self)
-        self.maps = [PassengerMapController(self), FreightMapController(self)]
         self.fade_in_animation.bonus_code_manager_fade_in_animation = self.bonus_code_manager.fade_in_animation
         self.fade_out_animation.bonus_code_manager_fade_out_animation = self.bonus_code_manager.fade_out_animation
         self.fade_in_animation.map_switcher_fade_in_animation = self.map_switcher.fade_in_animation
         self.fade_out_animation.map_switcher_fade_out_animation = self.map_switcher.fade_out_animation
-        for m in self.maps:
-            self.fade_in_animation.map_fade_in_animations.append(m.fade_in_animation)
-            self.fade_out_animation.map_fade_out_animations.append(m.fade_out_animation)
-
-        self.child_controllers = [self.bonus_code_manager, self.map_switcher, *self.maps]
-        self.map_transition_animations = {
-            PASSENGER_MAP: {
-                FREIGHT_MAP: TransitionAnimation(
-                    fade_out_animation=self.maps[PASSENGER_MAP].fade_out_animation,
-                    fade_in_animation=self.maps[FREIGHT_MAP].fade_in_animation
-                )
-            },
-            FREIGHT_MAP: {
-                PASSENGER_MAP: TransitionAnimation(
-                    fade_out_animation=self.maps[FREIGHT_MAP].fade_out_animation,
-                    fade_in_animation=self.maps[PASSENGER_MAP].fade_in_animation
-                )
-            }
-        }
+        self.child_controllers = [self.bonus_code_manager, self.map_switcher]
+        self.maps = [None, None]
+        self.map_transition_animations = {PASSENGER_MAP: {}, FREIGHT_MAP: {}}
+        # state of locked map is not changed until it is unlocked: it has no trains, nothing is built
+        # and its schedule is not generated, so locked map is created only when player unlocks it;
+        # passenger map is the first one, it is always created and is unlocked after onboarding
+        for map_id in (PASSENGER_MAP, FREIGHT_MAP):
+            if map_id == PASSENGER_MAP or not MAP_SWITCHER_STATE_MATRIX[map_id][MAP_LOCKED]:
+                self.on_create_map(map_id)
+
+    def on_create_map(self, map_id):
+        # maps are created in map_id order, so map fade animations are still indexed by map_id
+        self.maps[map_id] = MAP_CONTROLLERS[map_id](self)
+        self.fade_in_animation.map_fade_in_animations.append(self.maps[map_id].fade_in_animation)
+        self.fade_out_animation.map_fade_out_animations.append(self.maps[map_id].fade_out_animation)
+        self.child_controllers.append(self.maps[map_id])
+        for m in [m for m in self.maps if m is not None and m.map_id != map_id]:
+            self.map_transition_animations[m.map_id][map_id] = TransitionAnimation(
+                fade_out_animation=m.fade_out_animation, fade_in_animation=self.maps[map_id].fade_in_animation
+            )
+            self.map_transition_animations[map_id][m.map_id] = TransitionAnimation(
+                fade_out_animation=self.maps[map_id].fade_out_animation, fade_in_animation=m.fade_in_animation
+            )
 
     @game_is_not_paused
     def on_update_time(self, dt):
         super().on_update_time(dt)
         if self.model.game_time % (SECONDS_IN_ONE_HOUR * 2) == 0:
-            self.parent_controller.on_save_state()
+            # this is autosave time spent in frame, disk I/O time is logged by save state worker
+            start_time = perf_counter()
+            with FRAME_PROFILER.scope('autosave'):
+                self.parent_controller.on_save_state()
+
+            self.logger.debug(f'autosave snapshot taken in {(perf_counter() - start_time) * 1000:.3f} ms')
 
     def on_resume_game(self):
         self.model.on_resume_game()
@@ -67,7 +80,7 @@ class GameController(GameBaseController):
         self.model.on_add_exp(exp)
 
     def on_deactivate_money_target_for_inactive_maps(self, active_map_id):
-        for m in [m for m in self.maps if m.map_id != active_map_id]:
+        for m in [m for m in self.maps if m is not None and m.map_id != active_map_id]:
             m.on_deactivate_money_target()
 
     def on_add_exp_bonus(self, exp_bonus):
@@ -109,8 +122,8 @@ class GameController(GameBaseController):
 
     def on_switch_map(self, new_map_id):
         if (current_map_id := self.map_switcher.get_current_map_id()) != new_map_id:
-            for m in chain(range(current_map_id), range(current_map_id + 1, len(self.maps))):
-                self.map_transition_animations[m][current_map_id].on_deactivate()
+            for m in [m for m in self.maps if m is not None and m.map_id != current_map_id]:
+                self.map_transition_animations[m.map_id][current_map_id].on_deactivate()
 
             self.map_transition_animations[current_map_id][new_map_id].on_activate()
             self.map_switcher.on_switch_map(new_map_id)
@@ -118,14 +131,35 @@ class GameController(GameBaseController):
         self.on_close_map_switcher()
 
     def on_unlock_map(self, map_id):
+        if self.maps[map_id] is None:
+            # locked map state is not saved until the map is unlocked, so map rows in the database are up to date;
+            # game progress is taken from game model, construction state comes from in-memory state matrix
+            self.on_create_map(map_id)
+            self.on_update_new_map_state(map_id)
+
         self.maps[map_id].on_unlock()
         self.map_switcher.on_unlock_map(map_id)
 
+    def on_update_new_map_state(self, map_id):
+        # map created in the middle of the game has missed window events and broadcasts made since startup,
+        # so current window size is passed to it the same way new train view gets it, settings are passed by app
+        # and game progress made since last save is copied from game model
+        for h in self.maps[map_id].on_window_resize_handlers:
+            h(*self.view.screen_resolution)
+
+        if self.view.game_progress_notifications_enabled:
+            for h in self.maps[map_id].on_window_deactivate_handlers:
+                h()
+
+        self.maps[map_id].on_update_current_locale(self.view.current_locale)
+        self.parent_controller.on_apply_settings(self.maps[map_id])
+        self.maps[map_id].on_update_game_state(self.model)
+
     def on_master_volume_update(self, new_master_volume):
         self.view.on_master_volume_update(new_master_volume)
 
     def on_update_announcements_state(self, new_state):
-        for m in self.maps:
+        for m in [m for m in self.maps if m is not None]:
             m.on_update_announcements_state(new_state)
 
     def on_send_voice_not_found_notification(self):
@@ -1,10 +1,11 @@
 from abc import ABC, abstractmethod
 from logging import getLogger
-from operator import attrgetter
+from bisect import bisect_left
 from typing import final
 
 from controller import MapBaseController, TRAIN_ROUTE_DATA_TRACK_NUMBER, TRAIN_ROUTE_DATA_TYPE, \
     TRAIN_ROUTE_DATA_SECTION_NUMBER, SECTION_TYPE, SECTION_TRACK_NUMBER_1, SECTION_TRACK_NUMBER_2
+from ui import UPDATE_SCHEDULER
 from ui.fade_animation.fade_in_animation.map_fade_in_animation import MapFadeInAnimation
 from ui.fade_animation.fade_out_animation.map_fade_out_animation import MapFadeOutAnimation
 
@@ -21,7 +22,13 @@ class MapController(MapBaseController, ABC):
         self.mini_map = self.create_mini_map()
         self.narrator = self.create_narrator()
         self.signals, self.signals_list = self.create_signals()
-        self.train_routes, self.train_routes_sorted_list = self.create_train_routes()
+        self.train_routes, train_routes_list = self.create_train_routes()
+        # train routes are sorted by priority to implement some kind of queue; routes with the same priority
+        # keep the order they were created in, route is moved when its priority is updated
+        self.train_route_sequence = {r: i for i, r in enumerate(train_routes_list)}
+        self.train_routes_sorted_list = sorted(train_routes_list, key=self.get_train_route_priority_key)
+        self.train_route_priority_keys = [self.get_train_route_priority_key(r) for r in self.train_routes_sorted_list]
+        self.train_routes_order_changed = False
         self.switches, self.switches_list = self.create_switches()
         self.crossovers, self.crossovers_list = self.create_crossovers()
         self.trains, self.trains_list = self.create_trains()
@@ -57,6 +64,7 @@ class MapController(MapBaseController, ABC):
 
         for train in self.trains_list:
             train.on_train_setup()
+            self.model.on_add_train(train.model)
             self.fade_in_animation.train_fade_in_animations.append(train.fade_in_animation)
             self.fade_out_animation.train_fade_out_animations.append(train.fade_out_animation)
             if train.model.state in ('approaching', 'approaching_pass_through'):
@@ -75,6 +83,7 @@ class MapController(MapBaseController, ABC):
             self.mini_map, *self.signals_list, *self.train_routes_sorted_list,
             *self.switches_list, *self.crossovers_list, *self.trains_list
         ]
+        self.train_routes_start_index = self.child_controllers.index(self.train_routes_sorted_list[0])
 
     @abstractmethod
     def create_scheduler(self):
@@ -124,21 +133,32 @@ class MapController(MapBaseController, ABC):
     def on_save_state(self):
         # before writing new train state to the database
         # previous data should be cleared to remove old trains
-        self.model.on_clear_trains_info()
-        super().on_save_state()
+        return [*self.model.on_clear_trains_info(), *super().on_save_state()]
 
     @final
     def on_update_time(self, dt):
-        # train routes are sorted by priority to implement some kind of queue
-        self.train_routes_sorted_list = sorted(
-            self.train_routes_sorted_list, key=attrgetter('model.priority'), reverse=True
-        )
+        # train routes are updated in priority order
+        if self.train_routes_order_changed:
+            self.child_controllers[
+                self.train_routes_start_index:self.train_routes_start_index + len(self.train_routes_sorted_list)
+            ] = self.train_routes_sorted_list
+            self.train_routes_order_changed = False
+
         super().on_update_time(dt)
+        # NOTE: update order is not the same as with per-train updates: every moving train used to move in its own
+        # place among child controllers, now all of them move after every other child controller, including shops,
+        # boarding trains and trains created during the game; signals, train routes, switches and crossovers are
+        # updated before trains either way; train which starts moving is moved by engine from the next frame,
+        # see TrainStateEngine.on_activate_train(); that's why engine is disabled by default,
+        # see TRAIN_STATE_ENGINE_ENABLED
+        self.model.on_update_train_state_engine(dt)
         # collected trains which has departed successfully should be removed from the game
         for train in self.lifecycle_ended_trains:
             train.view.on_deactivate()
             train.view.on_update_opacity(0)
             train.view.on_detach_window_handlers()
+            UPDATE_SCHEDULER.on_remove_map_view(self.map_id, train.view)
+            self.model.on_remove_train(train.model)
             self.fade_in_animation.train_fade_in_animations.remove(train.fade_in_animation)
             self.fade_out_animation.train_fade_out_animations.remove(train.fade_out_animation)
             self.trains.pop(train.train_id)
@@ -312,7 +332,21 @@ class MapController(MapBaseController, ABC):
 
     @final
     def on_update_train_route_priority(self, track, train_route, priority):
-        self.train_routes[track][train_route].on_update_priority(priority)
+        train_route_controller = self.train_routes[track][train_route]
+        index = bisect_left(self.train_route_priority_keys, self.get_train_route_priority_key(train_route_controller))
+        train_route_controller.on_update_priority(priority)
+        self.train_routes_sorted_list.pop(index)
+        self.train_route_priority_keys.pop(index)
+        new_index = bisect_left(
+            self.train_route_priority_keys, key := self.get_train_route_priority_key(train_route_controller)
+        )
+        self.train_routes_sorted_list.insert(new_index, train_route_controller)
+        self.train_route_priority_keys.insert(new_index, key)
+        self.train_routes_order_changed = self.train_routes_order_changed or new_index != index
+
+    @final
+    def get_train_route_priority_key(self, train_route_controller):
+        return -train_route_controller.model.priority, self.train_route_sequence[train_route_controller]
 
     @final
     def on_set_trail_points(self, train_id, trail_points_v2):
@@ -353,6 +387,8 @@ class MapController(MapBaseController, ABC):
         self.trains_list.append(train)
         self.child_controllers.append(train)
         self.map_element_controllers.append(train)
+        # train state engine should be aware of the train before its route is opened
+        self.model.on_add_train(train.model)
         # add new train to the dispatcher
         self.dispatcher.on_add_train(train)
         self.on_open_train_route(track, train_route, train_id, cars)
@@ -1,42 +1,170 @@
-from sqlite3 import connect
-from os import path, makedirs
-from shutil import copyfile
+from sqlite3 import connect, Error
+from re import compile, IGNORECASE
+from os import path, makedirs, environ
+from shutil import copyfile, rmtree
+from tempfile import mkdtemp
 from hashlib import sha512
 from typing import Final, final
+from bisect import bisect_left
+from heapq import heappush, heappop, heapify
+from random import choice
+from itertools import count, chain
+from operator import itemgetter
+from time import monotonic, perf_counter
+from threading import Thread, Lock
+from queue import Queue
+from logging import getLogger
+from atexit import register
+
+from numpy import array, asarray, diff, empty, newaxis, ones, zeros, concatenate, cumsum, where, inf
+
+from profiler import FRAME_PROFILER
+
+# headless simulation (see simulation package) works with a temporary copy of the given save file,
+# it requires neither pyglet nor system keyring
+_headless_user_db = environ.get('RSSIM_HEADLESS_USER_DB')
+if _headless_user_db is None:
+    from keyring import set_password, delete_password, set_keyring
+    from keyring.errors import PasswordDeleteError
+    from keyring.backends import Windows
+    from pyglet.resource import get_settings_path
+else:
+    def set_password(*args):
+        pass
+
+    def delete_password(*args):
+        pass
 
-from keyring import set_password, delete_password, set_keyring
-from keyring.errors import PasswordDeleteError
-from keyring.backends import Windows
-from pyglet.resource import get_settings_path
 
+@final
+class UserDbDigest:
+    # Integrity digest of user DB is SHA-512 of SHA-512 digests of DB schema and every table. Table digests
+    # are cached: writers report which tables they have changed, so after commit only these tables are hashed
+    # again and no copy of DB data is kept. Digest of the whole DB is calculated on startup and after changes
+    # made outside of save state rows (like migrations), see on_update_all_tables().
+    def __init__(self):
+        self.table_digests = {}
+        # None means every table has to be hashed
+        self.changed_tables = None
+
+    def on_update_tables(self, save_state_rows):
+        if self.changed_tables is None:
+            return
+
+        for statement, parameters in save_state_rows:
+            if (match := _WRITTEN_TABLE.match(statement)) is None:
+                self.changed_tables = None
+                return
+
+            self.changed_tables.add(match.group(1))
+
+        # AUTOINCREMENT counters are changed by inserts as well
+        if 'sqlite_sequence' in self.table_digests:
+            self.changed_tables.add('sqlite_sequence')
+
+    def on_update_all_tables(self):
+        self.changed_tables = None
+
+    def get_hexdigest(self, connection):
+        if self.changed_tables is None:
+            self.table_digests.clear()
+            self.changed_tables = {
+                name for name, in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+            }
+            self.changed_tables.add('sqlite_master')
+
+        for table in self.changed_tables:
+            table_digest = sha512(table.encode('utf-8'))
+            for row in connection.execute(f'SELECT * FROM "{table}" ORDER BY rowid'):
+                table_digest.update(repr(row).encode('utf-8'))
+
+            self.table_digests[table] = table_digest.digest()
+
+        self.changed_tables = set()
+        return sha512(b''.join(self.table_digests[table] for table in sorted(self.table_digests))).hexdigest()
+
+
+# table name of every statement in save state rows
+_WRITTEN_TABLE: Final = compile(
+    r'\s*(?:UPDATE|INSERT\s+(?:OR\s+\w+\s+)?INTO|REPLACE\s+INTO|DELETE\s+FROM)\s+"?(\w+)', IGNORECASE
+)
+
+
+if _headless_user_db is None:
+    set_keyring(Windows.WinVaultKeyring())
+    USER_DB_LOCATION: Final = get_settings_path("Railway Station Simulator")
+else:
+    USER_DB_LOCATION: Final = mkdtemp()
+    copyfile(_headless_user_db, path.join(USER_DB_LOCATION, 'user.db'))
+    register(rmtree, USER_DB_LOCATION, ignore_errors=True)
 
-set_keyring(Windows.WinVaultKeyring())
 # determine if user launches app for the first time, if yes - create game DB
-USER_DB_LOCATION: Final = get_settings_path("Railway Station Simulator")
 _user_db_full_path = path.join(USER_DB_LOCATION, 'user.db')
+USER_DB_DIGEST: Final = UserDbDigest()
 if not path.exists(USER_DB_LOCATION):
     makedirs(USER_DB_LOCATION)
 
-if not path.exists(_user_db_full_path):
+_user_db_created = not path.exists(_user_db_full_path)
+if _user_db_created:
     copyfile('db/default.db', _user_db_full_path)
+
+# create database connections and cursors
+USER_DB_CONNECTION: Final = connect(path.join(USER_DB_LOCATION, 'user.db'))
+USER_DB_CURSOR: Final = USER_DB_CONNECTION.cursor()
+_config_db_connection = connect('db/config.db')
+CONFIG_DB_CURSOR: Final = _config_db_connection.cursor()
+if _user_db_created:
     try:
         delete_password(sha512('user_db'.encode('utf-8')).hexdigest(), sha512('user_db'.encode('utf-8')).hexdigest())
     except PasswordDeleteError:
         pass
 
-    with open(_user_db_full_path, 'rb') as f1:
-        _data = f1.read()[::-1]
-        set_password(
-            sha512('user_db'.encode('utf-8')).hexdigest(), sha512('user_db'.encode('utf-8')).hexdigest(),
-            sha512(_data[::3] + _data[1::3] + _data[2::3]).hexdigest()
-        )
+    set_password(
+        sha512('user_db'.encode('utf-8')).hexdigest(), sha512('user_db'.encode('utf-8')).hexdigest(),
+        USER_DB_DIGEST.get_hexdigest(USER_DB_CONNECTION)
+    )
 
 
-# create database connections and cursors
-USER_DB_CONNECTION: Final = connect(path.join(USER_DB_LOCATION, 'user.db'))
-USER_DB_CURSOR: Final = USER_DB_CONNECTION.cursor()
-_config_db_connection = connect('db/config.db')
-CONFIG_DB_CURSOR: Final = _config_db_connection.cursor()
+@final
+class TableIndex:
+    # Bulk loader for model constructors: every table is read with one full scan on first request and
+    # indexed by the requested key columns, so each model gets its row from a dict instead of a single-row query.
+    # Key columns are passed as keyword arguments in the same way they are used in WHERE clause,
+    # requested columns are returned as a tuple in the same order, just like fetchone() does.
+    def __init__(self, connection):
+        self.connection = connection
+        self.tables = {}
+        self.indexes = {}
+
+    def get_rows(self, table, columns, **key):
+        if table not in self.tables:
+            cursor = self.connection.execute(f'SELECT * FROM {table}')
+            self.tables[table] = ({d[0]: i for i, d in enumerate(cursor.description)}, cursor.fetchall())
+
+        column_positions, rows = self.tables[table]
+        if (table, tuple(key)) not in self.indexes:
+            key_positions = [column_positions[c] for c in key]
+            index = self.indexes[(table, tuple(key))] = {}
+            for row in rows:
+                index.setdefault(tuple(row[i] for i in key_positions), []).append(row)
+
+        positions = [column_positions[c] for c in columns]
+        return [
+            tuple(row[i] for i in positions)
+            for row in self.indexes[(table, tuple(key))].get(tuple(key.values()), [])
+        ]
+
+    def get_row(self, table, columns, **key):
+        return self.get_rows(table, columns, **key)[0]
+
+    def on_clear(self):
+        self.tables.clear()
+        self.indexes.clear()
+
+
+# user DB index is cleared every time user DB is about to be changed, config DB is never changed
+USER_DB_INDEX: Final = TableIndex(USER_DB_CONNECTION)
+CONFIG_DB_INDEX: Final = TableIndex(_config_db_connection)
 
 # time
 SECONDS_IN_ONE_MINUTE: Final = 60
@@ -69,12 +197,12 @@ BONUS_TIME: Final = 7
 BONUS_CODE_MATRIX = {}
 CONFIG_DB_CURSOR.execute('''SELECT * FROM bonus_codes_config''')
 for _line in CONFIG_DB_CURSOR.fetchall():
-    BONUS_CODE_MATRIX[_line[0]] = [*_line[1:]]
-    USER_DB_CURSOR.execute(
-        '''SELECT activation_available, activations_left, is_activated, bonus_time 
-        FROM bonus_codes WHERE sha512_hash = ?''', (_line[0],)
-    )
-    BONUS_CODE_MATRIX[_line[0]].extend(USER_DB_CURSOR.fetchone())
+    BONUS_CODE_MATRIX[_line[0]] = [
+        *_line[1:], *USER_DB_INDEX.get_row(
+            'bonus_codes', ('activation_available', 'activations_left', 'is_activated', 'bonus_time'),
+            sha512_hash=_line[0]
+        )
+    ]
 
 # base_schedule matrix properties
 TRAIN_ID: Final = 0                            # property #0 indicates train identification number
@@ -96,14 +224,75 @@ CARS_MIN: Final = 4                     # property #4 indicates min number of ca
 CARS_MAX: Final = 5                     # property #5 indicates max number of cars
 SWITCH_DIRECTION_FLAG = 6
 
-BASE_SCHEDULE = [(), ()]
+
+@final
+class BaseSchedule:
+    # Trains are kept in a min-heap for every direction: the next train to release is the earliest head among
+    # directions with free entry, so trains are added and released in O(log n). Schedule screen pages through
+    # trains sorted by arrival time, this sorted snapshot is built on the first request after the schedule
+    # has changed. Trains with the same arrival time keep the order they were added in.
+    def __init__(self, trains):
+        self.sequence = count()
+        self.direction_queues = {}
+        self.number_of_trains = 0
+        self.sorted_trains = None
+        for train in sorted(trains, key=itemgetter(ARRIVAL_TIME)):
+            self.on_add_train(train)
+
+    def __len__(self):
+        return self.number_of_trains
+
+    def __iter__(self):
+        return (train for arrival_time, sequence, train in self.get_sorted_trains())
+
+    def __getitem__(self, index):
+        return self.get_sorted_trains()[index][-1]
+
+    def get_sorted_trains(self):
+        if self.sorted_trains is None:
+            self.sorted_trains = sorted(chain.from_iterable(self.direction_queues.values()))
+
+        return self.sorted_trains
+
+    def on_add_train(self, train):
+        heappush(
+            self.direction_queues.setdefault(train[DIRECTION], []),
+            (train[ARRIVAL_TIME], next(self.sequence), train)
+        )
+        self.number_of_trains += 1
+        self.sorted_trains = None
+
+    def get_next_train(self, game_time, entry_busy_state):
+        # returns the earliest train which has already arrived and its entry is not busy, or None
+        next_train = min(
+            (
+                queue[0] for direction, queue in self.direction_queues.items()
+                if len(queue) > 0 and queue[0][0] <= game_time and not entry_busy_state[direction]
+            ), default=None
+        )
+        if next_train is None:
+            return None
+
+        return next_train[-1]
+
+    def get_train_index(self, train):
+        # only the next train can be released, it is always the first one in its direction queue
+        return bisect_left(self.get_sorted_trains(), self.direction_queues[train[DIRECTION]][0])
+
+    def on_release_train(self, train):
+        heappop(self.direction_queues[train[DIRECTION]])
+        self.number_of_trains -= 1
+        self.sorted_trains = None
+
+
+BASE_SCHEDULE = [BaseSchedule(()), BaseSchedule(())]
 for _m in (PASSENGER_MAP, FREIGHT_MAP):
     USER_DB_CURSOR.execute(
         '''SELECT train_id, arrival, direction, new_direction, 
         cars, boarding_time, exp, money, switch_direction_required 
         FROM base_schedule WHERE map_id = ?''', (_m,)
     )
-    BASE_SCHEDULE[_m] = USER_DB_CURSOR.fetchall()
+    BASE_SCHEDULE[_m] = BaseSchedule(USER_DB_CURSOR.fetchall())
 
 CONSTRUCTION_STATE_MATRIX = [[{}, {}], [{}, {}]]
 for _m in (PASSENGER_MAP, FREIGHT_MAP):
@@ -114,12 +303,12 @@ for _m in (PASSENGER_MAP, FREIGHT_MAP):
     )
     _track_info_fetched = USER_DB_CURSOR.fetchall()
     for _info in _track_info_fetched:
-        CONSTRUCTION_STATE_MATRIX[_m][TRACKS][_info[0]] = list(_info[1:])
-        CONFIG_DB_CURSOR.execute(
-            '''SELECT price, max_construction_time, level, environment_tier FROM track_config 
-            WHERE track_number = ? AND map_id = ?''', (_info[0], _m)
-        )
-        CONSTRUCTION_STATE_MATRIX[_m][TRACKS][_info[0]].extend(CONFIG_DB_CURSOR.fetchone())
+        CONSTRUCTION_STATE_MATRIX[_m][TRACKS][_info[0]] = [
+            *_info[1:], *CONFIG_DB_INDEX.get_row(
+                'track_config', ('price', 'max_construction_time', 'level', 'environment_tier'),
+                track_number=_info[0], map_id=_m
+            )
+        ]
 
     USER_DB_CURSOR.execute(
         '''SELECT tier, locked, under_construction, construction_time, unlock_condition_from_level, 
@@ -128,12 +317,11 @@ for _m in (PASSENGER_MAP, FREIGHT_MAP):
     )
     _environment_info_fetched = USER_DB_CURSOR.fetchall()
     for _info in _environment_info_fetched:
-        CONSTRUCTION_STATE_MATRIX[_m][ENVIRONMENT][_info[0]] = [*_info[1:6], 1, _info[6]]
-        CONFIG_DB_CURSOR.execute(
-            '''SELECT price, max_construction_time, level FROM environment_config WHERE tier = ? AND map_id = ?''',
-            (_info[0], _m)
-        )
-        CONSTRUCTION_STATE_MATRIX[_m][ENVIRONMENT][_info[0]].extend(CONFIG_DB_CURSOR.fetchone())
+        CONSTRUCTION_STATE_MATRIX[_m][ENVIRONMENT][_info[0]] = [
+            *_info[1:6], 1, _info[6], *CONFIG_DB_INDEX.get_row(
+                'environment_config', ('price', 'max_construction_time', 'level'), tier=_info[0], map_id=_m
+            )
+        ]
 
 # track, environment and shop stage state matrix properties
 LOCKED: Final = 0                                      # property #0 indicates if track/env. is locked
@@ -164,13 +352,6 @@ MAP_LOCKED: Final = 0
 MAP_LEVEL_REQUIRED: Final = 1
 MAP_PRICE: Final = 2
 
-NARRATOR_QUEUE = [[], []]
-for _m in (PASSENGER_MAP, FREIGHT_MAP):
-    USER_DB_CURSOR.execute(
-        '''SELECT game_time, locked, announcement_type, train_id, track_number FROM narrator WHERE map_id = ?''', (_m,)
-    )
-    NARRATOR_QUEUE[_m] = [list(a) for a in USER_DB_CURSOR.fetchall()]
-
 ANNOUNCEMENT_TIME: Final = 0
 ANNOUNCEMENT_LOCKED: Final = 1
 ANNOUNCEMENT_TYPE: Final = 2
@@ -182,16 +363,109 @@ ARRIVAL_FINISHED_ANNOUNCEMENT: Final = 'arrival_finished'
 DEPARTURE_ANNOUNCEMENT: Final = 'departure'
 PASS_THROUGH_ANNOUNCEMENT: Final = 'pass_through'
 FIVE_MINUTES_LEFT_ANNOUNCEMENT: Final = 'five_minutes_left'
+ANNOUNCEMENT_TYPES: Final = (
+    ARRIVAL_ANNOUNCEMENT, ARRIVAL_FINISHED_ANNOUNCEMENT, DEPARTURE_ANNOUNCEMENT, PASS_THROUGH_ANNOUNCEMENT,
+    FIVE_MINUTES_LEFT_ANNOUNCEMENT
+)
+
+
+@final
+class NarratorQueue:
+    # Announcements are kept in a min-heap by announcement time; insertion number breaks ties, so announcements
+    # with the same time are played in the order they were added. Every announcement is also indexed by its type:
+    # time speed changes and narrator activation lock or unlock whole types without scanning the queue.
+    def __init__(self, announcements):
+        self.insertion_counter = count()
+        self.announcement_heap = []
+        self.announcements_by_type = {announcement_type: {} for announcement_type in ANNOUNCEMENT_TYPES}
+        for announcement in announcements:
+            self.on_add_announcement(announcement)
+
+    def __len__(self):
+        return len(self.announcement_heap)
+
+    def __iter__(self):
+        # heap array is not sorted: announcements are saved in time and insertion order,
+        # so announcements with the same time are added in the same order after the queue is loaded
+        return (announcement for announcement_time, insertion_number, announcement in sorted(self.announcement_heap))
+
+    def on_add_announcement(self, announcement):
+        insertion_number = next(self.insertion_counter)
+        heappush(self.announcement_heap, (announcement[ANNOUNCEMENT_TIME], insertion_number, announcement))
+        self.announcements_by_type[announcement[ANNOUNCEMENT_TYPE]][insertion_number] = announcement
+
+    def get_first_announcement(self):
+        return self.announcement_heap[0][2]
+
+    def on_pop_first_announcement(self):
+        announcement_time, insertion_number, announcement = heappop(self.announcement_heap)
+        self.announcements_by_type[announcement[ANNOUNCEMENT_TYPE]].pop(insertion_number)
+        return announcement
+
+    def on_update_lock_state(self, announcement_types, locked):
+        for announcement_type in announcement_types:
+            for announcement in self.announcements_by_type[announcement_type].values():
+                announcement[ANNOUNCEMENT_LOCKED] = locked
+
+
+NARRATOR_QUEUE = [None, None]
+for _m in (PASSENGER_MAP, FREIGHT_MAP):
+    USER_DB_CURSOR.execute(
+        '''SELECT game_time, locked, announcement_type, train_id, track_number FROM narrator WHERE map_id = ?
+        ORDER BY rowid''', (_m,)
+    )
+    NARRATOR_QUEUE[_m] = NarratorQueue([list(a) for a in USER_DB_CURSOR.fetchall()])
+
 
-TRAIN_ID_POOL = [{}, {}]
+@final
+class TrainIdPool:
+    # Train numbers which can be used right now are kept in a list (with their positions for O(1) removal),
+    # all other numbers wait in a min-heap by expiration time and are moved to the list as game time passes.
+    def __init__(self, expiration_time):
+        self.expiration_time = expiration_time
+        self.available_train_ids = []
+        self.available_train_id_positions = {}
+        self.expiration_queue = [(e, train_id) for train_id, e in self.expiration_time.items()]
+        heapify(self.expiration_queue)
+
+    def items(self):
+        return self.expiration_time.items()
+
+    def get_train_id(self, game_time, expiration_time):
+        # returns random train number available at given game time and locks it until expiration time
+        while len(self.expiration_queue) > 0 and self.expiration_queue[0][0] <= game_time:
+            train_id = heappop(self.expiration_queue)[1]
+            self.available_train_id_positions[train_id] = len(self.available_train_ids)
+            self.available_train_ids.append(train_id)
+
+        train_id = choice(self.available_train_ids)
+        # last available number takes place of the selected one
+        position = self.available_train_id_positions.pop(train_id)
+        last_train_id = self.available_train_ids.pop()
+        if last_train_id != train_id:
+            self.available_train_ids[position] = last_train_id
+            self.available_train_id_positions[last_train_id] = position
+
+        self.expiration_time[train_id] = expiration_time
+        heappush(self.expiration_queue, (expiration_time, train_id))
+        return train_id
+
+
+TRAIN_ID_POOL = [TrainIdPool({}), TrainIdPool({})]
 for _m in (PASSENGER_MAP, FREIGHT_MAP):
     USER_DB_CURSOR.execute('''SELECT train_id, expiration_time FROM train_numbers WHERE map_id = ?''', (_m, ))
-    TRAIN_ID_POOL[_m] = {n[0]: n[1] for n in USER_DB_CURSOR.fetchall()}
+    TRAIN_ID_POOL[_m] = TrainIdPool({n[0]: n[1] for n in USER_DB_CURSOR.fetchall()})
 
 EXP_BONUS_CODE: Final = 'exp_bonus'
 MONEY_BONUS_CODE: Final = 'money_bonus'
 CONSTRUCTION_SPEED_BONUS_CODE: Final = 'construction_speed_bonus'
 
+# these are used by both models and views, so they are defined here and not in ui which requires a window
+MAXIMUM_CAR_COLLECTIONS: Final = [20, 10]
+GREEN_SIGNAL: Final = 'green_signal'
+RED_SIGNAL: Final = 'red_signal'
+WHITE_SIGNAL: Final = 'white_signal'
+
 
 def get_announcement_types_enabled(dt_multiplier):
     if round(dt_multiplier, 1) > 8.0:
@@ -210,29 +484,171 @@ def get_announcement_types_diff(dt_multiplier_1, dt_multiplier_2):
 
 
 def on_commit():
-    delete_password(sha512('user_db'.encode('utf-8')).hexdigest(), sha512('user_db'.encode('utf-8')).hexdigest())
-    USER_DB_CONNECTION.commit()
-    with open(_user_db_full_path, 'rb') as f:
-        data1 = f.read()[::-1]
+    # commits changes made through main thread connection, this is only done during app startup
+    USER_DB_INDEX.on_clear()
+    with USER_DB_LOCK:
+        delete_password(
+            sha512('user_db'.encode('utf-8')).hexdigest(), sha512('user_db'.encode('utf-8')).hexdigest()
+        )
+        USER_DB_CONNECTION.commit()
+        USER_DB_DIGEST.on_update_all_tables()
         set_password(
             sha512('user_db'.encode('utf-8')).hexdigest(), sha512('user_db'.encode('utf-8')).hexdigest(),
-            sha512(data1[::3] + data1[1::3] + data1[2::3]).hexdigest()
+            USER_DB_DIGEST.get_hexdigest(USER_DB_CONNECTION)
         )
 
 
+def on_write_save_state_rows(connection, save_state_rows):
+    # rows are grouped by statement in order of first appearance, so every table is written
+    # with a few executemany() calls; all rows are written in one transaction
+    statements = {}
+    for statement, parameters in save_state_rows:
+        statements.setdefault(statement, []).append(parameters)
+
+    if not connection.in_transaction:
+        connection.execute('BEGIN')
+
+    try:
+        for statement, parameters_list in statements.items():
+            connection.executemany(statement, parameters_list)
+    except Error:
+        connection.rollback()
+        raise
+
+
+@final
+class SaveStateWorker:
+    # All user DB writes during the game are done by this worker thread with its own connection.
+    # Main thread only takes a snapshot of the state: list of (statement, parameters) rows with plain values,
+    # the worker writes it, commits and updates integrity digest, so frame loop never waits for disk I/O.
+    # Snapshots are written in the same order they were submitted. If a snapshot cannot be committed,
+    # it is rolled back, digest of the unchanged user DB is set again and its rows are written
+    # together with the next snapshot: settings, bonus codes and deferred updates are saved only once.
+    def __init__(self, db_full_path):
+        self.logger = getLogger('root.save_state_worker')
+        self.db_full_path = db_full_path
+        self.save_state_queue = Queue()
+        self.thread = None
+        self.failed_save_state_rows = []
+
+    def on_save_state(self, save_state_rows):
+        if len(save_state_rows) > 0:
+            USER_DB_INDEX.on_clear()
+            if self.thread is None:
+                self.thread = Thread(target=self.run, name='save_state_worker', daemon=True)
+                self.thread.start()
+
+            self.save_state_queue.put(save_state_rows)
+
+    def on_wait(self):
+        # blocks until all submitted snapshots are written, used when app is closed;
+        # rows which were not saved are tried once more before the app exits
+        if self.thread is not None:
+            self.save_state_queue.join()
+            if len(self.failed_save_state_rows) > 0:
+                self.save_state_queue.put([])
+                self.save_state_queue.join()
+
+    def run(self):
+        connection = connect(self.db_full_path)
+        while True:
+            save_state_rows = self.save_state_queue.get()
+            save_state_rows = [*self.failed_save_state_rows, *save_state_rows]
+            self.failed_save_state_rows = []
+            try:
+                start_time = perf_counter()
+                with USER_DB_LOCK, FRAME_PROFILER.scope('save_state_worker'):
+                    self.on_commit(connection, save_state_rows)
+
+                self.logger.debug(
+                    f'{len(save_state_rows)} rows saved in {(perf_counter() - start_time) * 1000:.3f} ms'
+                )
+            except Exception:
+                self.logger.exception('saving state failed')
+            finally:
+                self.save_state_queue.task_done()
+
+    def on_commit(self, connection, save_state_rows):
+        committed = False
+        try:
+            on_write_save_state_rows(connection, save_state_rows)
+            delete_password(
+                sha512('user_db'.encode('utf-8')).hexdigest(), sha512('user_db'.encode('utf-8')).hexdigest()
+            )
+            connection.commit()
+            committed = True
+            USER_DB_DIGEST.on_update_tables(save_state_rows)
+            set_password(
+                sha512('user_db'.encode('utf-8')).hexdigest(), sha512('user_db'.encode('utf-8')).hexdigest(),
+                USER_DB_DIGEST.get_hexdigest(connection)
+            )
+        except Exception:
+            if not committed:
+                self.failed_save_state_rows = save_state_rows
+                if connection.in_transaction:
+                    connection.rollback()
+
+            # digest is deleted before commit, so it is set again for the data which is on disk now
+            set_password(
+                sha512('user_db'.encode('utf-8')).hexdigest(), sha512('user_db'.encode('utf-8')).hexdigest(),
+                USER_DB_DIGEST.get_hexdigest(connection)
+            )
+            raise
+
+
+@final
+class CommitQueue:
+    # Write-behind queue for small UI-triggered updates (camera, zoom, time speed, locale, clock).
+    # Rows are collected and submitted to save state worker together: when no new updates arrived
+    # for COMMIT_QUEUE_IDLE_TIME seconds or when the oldest update is COMMIT_QUEUE_MAX_DELAY seconds old,
+    # so a drag or scroll ends with one disk sync and one digest.
+    def __init__(self):
+        self.save_state_rows = []
+        self.first_request_time = None
+        self.last_request_time = None
+
+    def on_add_row(self, statement, parameters=()):
+        self.save_state_rows.append((statement, parameters))
+        self.last_request_time = monotonic()
+        if self.first_request_time is None:
+            self.first_request_time = self.last_request_time
+
+    def on_flush(self, force=False):
+        if self.first_request_time is not None \
+                and (force or monotonic() - self.last_request_time >= COMMIT_QUEUE_IDLE_TIME
+                     or monotonic() - self.first_request_time >= COMMIT_QUEUE_MAX_DELAY):
+            SAVE_STATE_WORKER.on_save_state(self.on_pop_rows())
+
+    def on_pop_rows(self):
+        save_state_rows = self.save_state_rows
+        self.save_state_rows = []
+        self.first_request_time = None
+        self.last_request_time = None
+        return save_state_rows
+
+
+def _on_exit():
+    # pending updates are not lost if app is closed without saving state or crashes
+    COMMIT_QUEUE.on_flush(force=True)
+    SAVE_STATE_WORKER.on_wait()
+
+
+USER_DB_LOCK: Final = Lock()
+SAVE_STATE_WORKER: Final = SaveStateWorker(_user_db_full_path)
+COMMIT_QUEUE_IDLE_TIME: Final = 0.5     # seconds without new updates after which deferred commit is flushed
+COMMIT_QUEUE_MAX_DELAY: Final = 5.0     # max seconds between first deferred update and commit
+COMMIT_QUEUE: Final = CommitQueue()
+register(_on_exit)
+
+
 @final
 class TrailPointsV2:
-    def __init__(self, map_id, track, train_route):
-        CONFIG_DB_CURSOR.execute(
-            '''SELECT trail_points_v2_part_1_start, trail_points_v2_part_1_end FROM train_route_config 
-            WHERE track = ? AND train_route = ? AND map_id = ?''', (track, train_route, map_id)
-        )
-        self.part_1_start, part_1_end = (tuple(float(p) for p in s.split(',')) for s in CONFIG_DB_CURSOR.fetchone())
-        CONFIG_DB_CURSOR.execute(
-            '''SELECT trail_points_v2_part_2_head_tail, trail_points_v2_part_2_mid FROM train_route_config 
-            WHERE track = ? AND train_route = ? AND map_id = ?''', (track, train_route, map_id)
-        )
-        self.part_2_head_tail, self.part_2_mid = CONFIG_DB_CURSOR.fetchone()
+    # instances are shared between train routes and trains, use get_trail_points_v2() to get one
+    def __init__(self, route_index, part_1_start, part_1_end, part_2_head_tail, part_2_mid):
+        # row of this train route in the map TrailPointsV2Table
+        self.route_index = route_index
+        self.part_1_start, part_1_end = (tuple(float(p) for p in s.split(',')) for s in (part_1_start, part_1_end))
+        self.part_2_head_tail, self.part_2_mid = part_2_head_tail, part_2_mid
         if self.part_2_head_tail is not None:
             self.part_2_head_tail = tuple(
                 tuple(float(p) for p in s.split(',')) for s in self.part_2_head_tail.split('|')     # noqa
@@ -250,38 +666,92 @@ class TrailPointsV2:
         self.part_1_length = abs(self.part_1_length)
         self.part_2_length = None
         self.part_3_start = None
+        # part 2 points are compiled into contiguous arrays: point coordinates and deltas to the next point,
+        # so that car position is interpolated as point + delta * fraction
+        self.part_1_start_array = array(self.part_1_start)
+        self.part_2_head_tail_delta = self.part_2_head_tail_array = self.part_2_head_tail_delta_array = None
+        self.part_2_mid_delta = self.part_2_mid_array = self.part_2_mid_delta_array = None
+        self.part_3_start_array = None
         if self.part_2_head_tail is not None:
             self.part_2_length = self.part_1_length + len(self.part_2_head_tail) - 1
             self.part_3_start = self.part_2_head_tail[-1]
+            self.part_2_head_tail_array = array(self.part_2_head_tail)
+            self.part_2_head_tail_delta_array = diff(self.part_2_head_tail_array, axis=0)
+            self.part_2_mid_array = array(self.part_2_mid)
+            self.part_2_mid_delta_array = diff(self.part_2_mid_array, axis=0)
+            # single car lookups are faster with plain tuples than with NumPy scalars
+            self.part_2_head_tail_delta = tuple(tuple(d) for d in self.part_2_head_tail_delta_array.tolist())
+            self.part_2_mid_delta = tuple(tuple(d) for d in self.part_2_mid_delta_array.tolist())
+            self.part_3_start_array = array(self.part_3_start)
+
+        for a in (
+                self.part_1_start_array, self.part_2_head_tail_array, self.part_2_head_tail_delta_array,
+                self.part_2_mid_array, self.part_2_mid_delta_array, self.part_3_start_array
+        ):
+            if a is not None:
+                a.setflags(write=False)
 
     def get_head_tail_car_position(self, index):
-        if index < self.part_1_length:
+        # train route without part 2 is a straight line: part 1 goes on beyond its end, see get_conversion_index()
+        if self.part_2_length is None or index < self.part_1_length:
             return self.part_1_start[0] + self.multiplier * index, *self.part_1_start[1:]
         elif index < self.part_2_length:
             index -= self.part_1_length
-            return tuple(
-                self.part_2_head_tail[int(index)][i]
-                + (self.part_2_head_tail[int(index) + 1][i] - self.part_2_head_tail[int(index)][i])
-                * (index % 1) for i in range(3)
-            )
+            point, delta, fraction = \
+                self.part_2_head_tail[int(index)], self.part_2_head_tail_delta[int(index)], index % 1
+            return point[0] + delta[0] * fraction, point[1] + delta[1] * fraction, point[2] + delta[2] * fraction
         else:
             index -= self.part_2_length
             return self.part_3_start[0] + self.multiplier * index, *self.part_3_start[1:]
 
     def get_mid_car_position(self, index):
-        if index < self.part_1_length:
+        if self.part_2_length is None or index < self.part_1_length:
             return self.part_1_start[0] + self.multiplier * index, *self.part_1_start[1:]
         elif index < self.part_2_length:
             index -= self.part_1_length
-            return tuple(
-                self.part_2_mid[int(index)][i]
-                + (self.part_2_mid[int(index) + 1][i] - self.part_2_mid[int(index)][i])
-                * (index % 1) for i in range(3)
-            )
+            point, delta, fraction = \
+                self.part_2_mid[int(index)], self.part_2_mid_delta[int(index)], index % 1
+            return point[0] + delta[0] * fraction, point[1] + delta[1] * fraction, point[2] + delta[2] * fraction
         else:
             index -= self.part_2_length
             return self.part_3_start[0] + self.multiplier * index, *self.part_3_start[1:]
 
+    def get_head_tail_car_positions(self, indices):
+        return self._get_car_positions(
+            asarray(indices, dtype=float), self.part_2_head_tail_array, self.part_2_head_tail_delta_array
+        )
+
+    def get_mid_car_positions(self, indices):
+        return self._get_car_positions(
+            asarray(indices, dtype=float), self.part_2_mid_array, self.part_2_mid_delta_array
+        )
+
+    def get_train_car_positions(self, cars_position):
+        # returns (N, 3) array of x, y and rotation for all train cars: head and tail cars use
+        # head/tail trail points, all cars between them use mid trail points
+        cars_position = asarray(cars_position, dtype=float)
+        car_positions = self.get_mid_car_positions(cars_position)
+        car_positions[[0, -1]] = self.get_head_tail_car_positions(cars_position[[0, -1]])
+        return car_positions
+
+    def _get_car_positions(self, indices, part_2_points, part_2_deltas):
+        car_positions = empty((len(indices), 3))
+        # every row is written by one of the parts below; without part 2 all cars are on part 1
+        part_1 = indices < self.part_1_length if self.part_2_length is not None else ones(len(indices), dtype=bool)
+        car_positions[part_1] = self.part_1_start_array
+        car_positions[part_1, 0] += self.multiplier * indices[part_1]
+        if self.part_2_length is not None:
+            part_2 = ~part_1 & (indices < self.part_2_length)
+            part_2_indices = indices[part_2] - self.part_1_length
+            points = part_2_indices.astype(int)
+            car_positions[part_2] = part_2_points[points] \
+                + part_2_deltas[points] * (part_2_indices % 1)[:, newaxis]
+            part_3 = indices >= self.part_2_length
+            car_positions[part_3] = self.part_3_start_array
+            car_positions[part_3, 0] += self.multiplier * (indices[part_3] - self.part_2_length)
+
+        return car_positions
+
     def get_conversion_index(self, car_position):
         if self.part_2_length is not None:
             car_position -= self.part_2_length
@@ -291,3 +761,97 @@ class TrailPointsV2:
 
     def get_reconversion_index(self, car_position_abs):
         return float(abs(car_position_abs[0] - self.part_1_start[0]))
+
+
+@final
+class TrailPointsV2Table:
+    # trail points of all train routes on the map compiled into arrays indexed by TrailPointsV2.route_index,
+    # so that cars of all moving trains are positioned in one call; arithmetic is done in the same order
+    # as in TrailPointsV2, results are exactly the same
+    def __init__(self, trail_points):
+        # without part 2 all cars are on part 1, so its length is infinite
+        self.part_1_length = array(
+            [t.part_1_length if t.part_2_length is not None else inf for t in trail_points], dtype=float
+        )
+        self.part_2_length = array([t.part_2_length if t.part_2_length is not None else inf for t in trail_points])
+        self.multiplier = array([t.multiplier for t in trail_points], dtype=float)
+        self.part_1_start = array([t.part_1_start for t in trail_points], dtype=float).reshape(-1, 3)
+        self.part_3_start = array(
+            [t.part_3_start if t.part_3_start is not None else (0.0, 0.0, 0.0) for t in trail_points], dtype=float
+        ).reshape(-1, 3)
+        # part 2 points of all routes, head/tail ones first, then mid ones; every route has one extra zero delta
+        # at the end, so that points and deltas share the same offsets
+        part_2 = [
+            (t.part_2_head_tail_array, t.part_2_head_tail_delta_array) for t in trail_points
+        ] + [
+            (t.part_2_mid_array, t.part_2_mid_delta_array) for t in trail_points
+        ]
+        self.part_2_points = concatenate(
+            [zeros((0, 3))] + [points for points, deltas in part_2 if points is not None]
+        )
+        self.part_2_deltas = concatenate(
+            [zeros((0, 3))] + [
+                concatenate((deltas, zeros((1, 3)))) for points, deltas in part_2 if points is not None
+            ]
+        )
+        part_2_offset = cumsum([0] + [len(points) if points is not None else 0 for points, deltas in part_2])
+        self.part_2_head_tail_offset = part_2_offset[:len(trail_points)]
+        self.part_2_mid_offset = part_2_offset[len(trail_points):-1]
+        for a in (
+                self.part_1_length, self.part_2_length, self.multiplier, self.part_1_start, self.part_3_start,
+                self.part_2_points, self.part_2_deltas, self.part_2_head_tail_offset, self.part_2_mid_offset
+        ):
+            a.setflags(write=False)
+
+    def get_car_positions(self, route_indices, indices, is_head_tail):
+        # returns (N, 3) array of x, y and rotation for cars of any train routes: route_indices, indices
+        # and is_head_tail are arrays of the same length; head and tail cars use head/tail trail points
+        car_positions = empty((len(indices), 3))
+        part_1_length, part_2_length = self.part_1_length[route_indices], self.part_2_length[route_indices]
+        part_1 = indices < part_1_length
+        car_positions[part_1] = self.part_1_start[route_indices[part_1]]
+        car_positions[part_1, 0] += self.multiplier[route_indices[part_1]] * indices[part_1]
+        part_2 = ~part_1 & (indices < part_2_length)
+        part_2_indices = indices[part_2] - part_1_length[part_2]
+        points = where(
+            is_head_tail[part_2], self.part_2_head_tail_offset[route_indices[part_2]],
+            self.part_2_mid_offset[route_indices[part_2]]
+        ) + part_2_indices.astype(int)
+        car_positions[part_2] = self.part_2_points[points] \
+            + self.part_2_deltas[points] * (part_2_indices % 1)[:, newaxis]
+        part_3 = indices >= part_2_length
+        car_positions[part_3] = self.part_3_start[route_indices[part_3]]
+        car_positions[part_3, 0] += self.multiplier[route_indices[part_3]] * (indices[part_3] - part_2_length[part_3])
+        return car_positions
+
+
+_trail_points_v2_cache = [{}, {}]
+_trail_points_v2_table = [None, None]
+
+
+def get_trail_points_v2(map_id, track, train_route):
+    # trail points for all train routes on the map are loaded in one query on first request
+    if len(_trail_points_v2_cache[map_id]) == 0:
+        on_load_trail_points_v2(map_id)
+
+    return _trail_points_v2_cache[map_id][(track, train_route)]
+
+
+def on_load_trail_points_v2(map_id):
+    CONFIG_DB_CURSOR.execute(
+        '''SELECT track, train_route, trail_points_v2_part_1_start, trail_points_v2_part_1_end, 
+        trail_points_v2_part_2_head_tail, trail_points_v2_part_2_mid FROM train_route_config WHERE map_id = ?''',
+        (map_id, )
+    )
+    _trail_points_v2_cache[map_id] = {
+        (track, train_route): TrailPointsV2(route_index, *trail_points)
+        for route_index, (track, train_route, *trail_points) in enumerate(CONFIG_DB_CURSOR.fetchall())
+    }
+    _trail_points_v2_table[map_id] = TrailPointsV2Table(list(_trail_points_v2_cache[map_id].values()))
+
+
+def get_trail_points_v2_table(map_id):
+    if _trail_points_v2_table[map_id] is None:
+        on_load_trail_points_v2(map_id)
+
+    return _trail_points_v2_table[map_id]
@@ -0,0 +1,43 @@
+from time import perf_counter
+from typing import Final, final
+
+# --------------------- CONSTANTS ---------------------
+SIMULATION_STEP: Final = 1 / 15                     # game seconds, passenger train moves 5.6 px at maximum speed
+MAXIMUM_SIMULATION_STEPS_PER_FRAME: Final = 8       # enough for maximum time speed at 30 FPS
+SIMULATION_CPU_BUDGET: Final = 0.008                # seconds of simulation per frame
+# ------------------- END CONSTANTS -------------------
+
+
+@final
+class SimulationScheduler:
+    # Game is simulated in fixed steps of SIMULATION_STEP game seconds regardless of frame time and time speed:
+    # frame time multiplied by time speed is accumulated and as many steps as fit are run. Step is short enough
+    # for the fastest train to move less than the braking correction threshold, so high time speeds cost
+    # more steps instead of larger and less stable ones. Steps per frame are limited by count and CPU budget,
+    # if the limit is hit, the rest of the frame time is dropped and game runs slower instead of freezing the app.
+    # Views interpolate moving objects between the last two steps using alpha.
+    def __init__(self, cpu_budget=SIMULATION_CPU_BUDGET):
+        self.cpu_budget = cpu_budget
+        self.accumulator = 0.0
+        self.step = 0
+        self.alpha = 1.0
+
+    def on_update(self, game, dt):
+        dt_multiplier = game.model.dt_multiplier
+        self.accumulator += dt * dt_multiplier
+        start_time = perf_counter()
+        steps = 0
+        while self.accumulator >= SIMULATION_STEP:
+            self.step += 1
+            game.on_update_time(SIMULATION_STEP / dt_multiplier)
+            self.accumulator -= SIMULATION_STEP
+            steps += 1
+            if steps >= MAXIMUM_SIMULATION_STEPS_PER_FRAME \
+                    or self.cpu_budget is not None and perf_counter() - start_time >= self.cpu_budget:
+                self.accumulator %= SIMULATION_STEP
+                break
+
+        self.alpha = self.accumulator / SIMULATION_STEP
+
+
+SIMULATION_SCHEDULER: Final = SimulationScheduler()
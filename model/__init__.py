@@ -1,9 +1,7 @@
 from abc import ABC, abstractmethod
-from math import log
+from math import log, sqrt
 from typing import Final, final
 
-import numpy
-
 from database import USER_DB_CURSOR, SECONDS_IN_ONE_MINUTE, TRUE, FALSE
 
 
@@ -218,7 +216,13 @@ ENTRY_TRACK_ID: Final = (
 )
 TRAIN_MAXIMUM_SPEED: Final = (84, 24)
 TRAIN_VELOCITY_BASE: Final = 1.03
-TRAIN_VELOCITY_INTEGRATION_STEPS: Final = 5000
+TRAIN_VELOCITY_BASE_LOG: Final = log(TRAIN_VELOCITY_BASE)  # natural logarithm used in closed-form train kinematics
+# speed state time at which train reaches maximum speed (for each map)
+TRAIN_MAXIMUM_SPEED_STATE_TIME: Final = tuple(log(s + 1, TRAIN_VELOCITY_BASE) for s in TRAIN_MAXIMUM_SPEED)
+TRAIN_SPEED_STATE_TIME_TABLE_SIZE: Final = 256  # number of intervals in speed state time lookup table
+# update all moving trains on the map in one vectorized step; disabled by default: engine moves trains
+# after all other map elements, not in their own update order, see MapController.on_update_time()
+TRAIN_STATE_ENGINE_ENABLED: Final = False
 MONEY_LIMIT: Final = 9999999999.0  # max amount of money the player can have
 MAXIMUM_TRACK_NUMBER: Final = (32, 16)  # player can have maximum of 32 tracks on map 0 and 16 tracks on map 1
 MAXIMUM_ENVIRONMENT_TIER: Final = (6, 3)  # environment tier 6 is final for map 0, for map 1 we have 3 tiers
@@ -238,32 +242,29 @@ ALLOWED_BONUS_CODE_INPUT: Final = 100
 # ------------------- END CONSTANTS -------------------
 
 
-def integrate(v, t1, t2, n=TRAIN_VELOCITY_INTEGRATION_STEPS):
-    t = numpy.linspace(t1 + (t2 - t1) / (2 * n), t2 - (t2 - t1) / (2 * n), n)
-    return numpy.sum(v(t)) * (t2 - t1) / n
-
-
 def train_speed_formula(t):
     return pow(TRAIN_VELOCITY_BASE, t) - 1
 
 
+# train speed formula has an analytic antiderivative: (base^t) / ln(base) - t,
+# so all distances are calculated in constant time without numeric integration
 def get_braking_distance(t):
-    return integrate(train_speed_formula, 0, t)
+    return (pow(TRAIN_VELOCITY_BASE, t) - 1) / TRAIN_VELOCITY_BASE_LOG - t
 
 
 def get_distance(t1, t2):
-    return integrate(train_speed_formula, t1, t2)
+    return (pow(TRAIN_VELOCITY_BASE, t2) - pow(TRAIN_VELOCITY_BASE, t1)) / TRAIN_VELOCITY_BASE_LOG - (t2 - t1)
 
 
-def get_speed_state_time(s, map_id):
-    if s > get_braking_distance(log(TRAIN_MAXIMUM_SPEED[map_id] + 1, TRAIN_VELOCITY_BASE)) - 0.000001:
-        return log(TRAIN_MAXIMUM_SPEED[map_id] + 1, TRAIN_VELOCITY_BASE)
+def _get_speed_state_time_by_bisection(s, map_id):
+    if s > get_braking_distance(TRAIN_MAXIMUM_SPEED_STATE_TIME[map_id]) - 0.000001:
+        return TRAIN_MAXIMUM_SPEED_STATE_TIME[map_id]
 
     t1 = 0
-    t2 = log(TRAIN_MAXIMUM_SPEED[map_id] + 1, TRAIN_VELOCITY_BASE)
+    t2 = TRAIN_MAXIMUM_SPEED_STATE_TIME[map_id]
     current_t = (t1 + t2) / 2
-    while abs(get_braking_distance(current_t) - s) > 0.000001:
-        if get_braking_distance(current_t) > s:
+    while abs((current_s := get_braking_distance(current_t)) - s) > 0.000001:
+        if current_s > s:
             t2 = current_t
         else:
             t1 = current_t
@@ -273,6 +274,40 @@ def get_speed_state_time(s, map_id):
     return current_t
 
 
+def _create_speed_state_time_table(map_id):
+    # table points are distributed evenly by square root of braking distance:
+    # near zero speed state time grows as sqrt(s), so linear interpolation stays accurate on the whole range
+    sqrt_distance_step = sqrt(get_braking_distance(TRAIN_MAXIMUM_SPEED_STATE_TIME[map_id])) \
+        / TRAIN_SPEED_STATE_TIME_TABLE_SIZE
+    return sqrt_distance_step, (
+        0.0, *(
+            _get_speed_state_time_by_bisection((i * sqrt_distance_step) ** 2, map_id)
+            for i in range(1, TRAIN_SPEED_STATE_TIME_TABLE_SIZE + 1)
+        )
+    )
+
+
+SPEED_STATE_TIME_TABLE: Final = tuple(_create_speed_state_time_table(m) for m in range(len(TRAIN_MAXIMUM_SPEED)))
+
+
+def get_speed_state_time(s, map_id):
+    if s > get_braking_distance(TRAIN_MAXIMUM_SPEED_STATE_TIME[map_id]) - 0.000001:
+        return TRAIN_MAXIMUM_SPEED_STATE_TIME[map_id]
+
+    if s <= 0:
+        return 0.0
+
+    # table lookup + one Newton step gives braking distance error below 1e-6 (same as bisection tolerance),
+    # see benchmark/kinematics_benchmark.py for exact numbers
+    sqrt_distance_step, speed_state_time_table = SPEED_STATE_TIME_TABLE[map_id]
+    index, fraction = divmod(sqrt(s) / sqrt_distance_step, 1)
+    index = int(index)
+    t = speed_state_time_table[index] \
+        + (speed_state_time_table[index + 1] - speed_state_time_table[index]) * fraction
+    # speed formula is the derivative of braking distance
+    return t - (get_braking_distance(t) - s) / train_speed_formula(t)
+
+
 class AppBaseModel(ABC):
     def __init__(self, controller, view, logger):
         self.logger = logger
@@ -346,6 +381,17 @@ class GameBaseModel(AppBaseModel, ABC):
         self.construction_speed_bonus_multiplier = value
         self.view.on_activate_construction_speed_bonus_code(value)
 
+    @final
+    def on_update_game_state(self, game_model):
+        # game time, level, money and bonuses are taken from in-memory game model, database may be outdated
+        self.game_time, self.game_time_fraction, self.dt_multiplier \
+            = game_model.game_time, game_model.game_time_fraction, game_model.dt_multiplier
+        self.level, self.money = game_model.level, game_model.money
+        self.exp_bonus_multiplier, self.money_bonus_multiplier, self.construction_speed_bonus_multiplier \
+            = game_model.exp_bonus_multiplier, game_model.money_bonus_multiplier, \
+            game_model.construction_speed_bonus_multiplier
+        self.view.on_update_game_state(game_model)
+
 
 class MapBaseModel(GameBaseModel, ABC):
     def __init__(self, controller, view, map_id, logger):
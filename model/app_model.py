@@ -2,7 +2,7 @@ from ctypes import windll
 from logging import getLogger
 from typing import final
 
-from database import USER_DB_CURSOR, CONFIG_DB_CURSOR, on_commit, TRUE, FALSE
+from database import USER_DB_CURSOR, CONFIG_DB_CURSOR, COMMIT_QUEUE, SAVE_STATE_WORKER, TRUE, FALSE
 from model import AppBaseModel, fullscreen_mode_available
 
 
@@ -22,7 +22,7 @@ class AppModel(AppBaseModel):
             self.fullscreen_mode_available = False
 
     def on_save_state(self):
-        USER_DB_CURSOR.execute('UPDATE graphics SET fullscreen = ?', (self.fullscreen_mode, ))
+        return [('UPDATE graphics SET fullscreen = ?', (self.fullscreen_mode, ))]
 
     @fullscreen_mode_available
     def on_fullscreen_mode_turned_on(self):
@@ -35,15 +35,12 @@ class AppModel(AppBaseModel):
 
     @staticmethod
     def on_save_and_commit_locale(new_locale):
-        USER_DB_CURSOR.execute('UPDATE i18n SET current_locale = ?', (new_locale, ))
-        on_commit()
+        COMMIT_QUEUE.on_add_row('UPDATE i18n SET current_locale = ?', (new_locale, ))
 
     @staticmethod
     def on_save_and_commit_clock_state(clock_24h_enabled):
-        USER_DB_CURSOR.execute('UPDATE i18n SET clock_24h = ?', (clock_24h_enabled, ))
-        on_commit()
+        COMMIT_QUEUE.on_add_row('UPDATE i18n SET clock_24h = ?', (clock_24h_enabled, ))
 
     @staticmethod
     def on_save_and_commit_bonus_code_abuse():
-        USER_DB_CURSOR.execute('UPDATE game_progress SET bonus_codes_locked = 1')
-        on_commit()
+        SAVE_STATE_WORKER.on_save_state([('UPDATE game_progress SET bonus_codes_locked = 1', ())])
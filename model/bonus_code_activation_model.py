@@ -1,7 +1,7 @@
 from logging import getLogger
 from typing import final
 
-from database import on_commit, USER_DB_CURSOR
+from database import USER_DB_CURSOR, SAVE_STATE_WORKER
 from model import AppBaseModel, ALLOWED_BONUS_CODE_INPUT
 
 
@@ -13,9 +13,9 @@ class BonusCodeActivationModel(AppBaseModel):
         self.bonus_code_abuse_counter = USER_DB_CURSOR.fetchone()[0]
 
     def on_save_state(self):
-        USER_DB_CURSOR.execute(
+        return [(
             '''UPDATE game_progress SET bonus_codes_abuse_counter = ?''', (self.bonus_code_abuse_counter, )
-        )
+        )]
 
     def on_increment_bonus_code_abuse_counter(self, value):
         self.bonus_code_abuse_counter += value
@@ -29,7 +29,6 @@ class BonusCodeActivationModel(AppBaseModel):
         self.on_save_and_commit_bonus_code_abuse_counter()
 
     def on_save_and_commit_bonus_code_abuse_counter(self):
-        USER_DB_CURSOR.execute(
-            '''UPDATE game_progress SET bonus_codes_abuse_counter = ?''', (self.bonus_code_abuse_counter, )
-        )
-        on_commit()
+        SAVE_STATE_WORKER.on_save_state([
+            ('''UPDATE game_progress SET bonus_codes_abuse_counter = ?''', (self.bonus_code_abuse_counter, ))
+        ])
@@ -1,7 +1,7 @@
 from logging import getLogger
 from typing import final
 
-from database import BONUS_CODE_MATRIX, USER_DB_CURSOR, ACTIVATION_AVAILABLE, ACTIVATIONS_LEFT, IS_ACTIVATED, \
+from database import BONUS_CODE_MATRIX, ACTIVATION_AVAILABLE, ACTIVATIONS_LEFT, IS_ACTIVATED, \
     BONUS_TIME, CODE_TYPE, MAXIMUM_BONUS_TIME, TRUE, FALSE, CONSTRUCTION_SPEED_BONUS_CODE, MONEY_BONUS_CODE, \
     EXP_BONUS_CODE
 from model import GameBaseModel
@@ -13,15 +13,18 @@ class BonusCodeManagerModel(GameBaseModel):
         super().__init__(controller, view, logger=getLogger('root.app.game.bonus_code_manager.model'))
 
     def on_save_state(self):
+        save_state_rows = []
         for code in BONUS_CODE_MATRIX:
-            USER_DB_CURSOR.execute(
+            save_state_rows.append((
                 '''UPDATE bonus_codes SET activation_available = ?, activations_left = ?, is_activated = ?, 
                 bonus_time = ? WHERE sha512_hash = ?''',
                 (
                     BONUS_CODE_MATRIX[code][ACTIVATION_AVAILABLE], BONUS_CODE_MATRIX[code][ACTIVATIONS_LEFT],
                     BONUS_CODE_MATRIX[code][IS_ACTIVATED], BONUS_CODE_MATRIX[code][BONUS_TIME], code
                 )
-            )
+            ))
+
+        return save_state_rows
 
     def on_update_time(self, dt):
         for code in BONUS_CODE_MATRIX:
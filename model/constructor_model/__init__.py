@@ -21,27 +21,28 @@ class ConstructorModel(MapBaseModel, ABC):
 
     @final
     def on_save_state(self):
-        USER_DB_CURSOR.execute(
+        save_state_rows = []
+        save_state_rows.append((
             '''UPDATE constructor SET money_target_activated = ?, money_target_cell_position = ? WHERE map_id = ?''',
             (
                 self.money_target_activated,
                 ','.join(str(p) for p in self.money_target_cell_position), self.map_id
             )
-        )
+        ))
         # if some tracks were unlocked since last time the game progress was saved,
         # they are not listed in track state matrix anymore, so their state is updated separately
         for track in self.cached_unlocked_tracks:
-            USER_DB_CURSOR.execute(
+            save_state_rows.append((
                 '''UPDATE tracks SET locked = 0, under_construction = 0, construction_time = 0, 
                 unlock_condition_from_level = 0, unlock_condition_from_previous_track = 0, 
                 unlock_condition_from_environment = 0, unlock_available = 0 WHERE track_number = ? AND map_id = ?''',
                 (track, self.map_id)
-            )
+            ))
 
         self.cached_unlocked_tracks = []
         # locked tracks state is saved from track_state_matrix the same way it was read
         for track in CONSTRUCTION_STATE_MATRIX[self.map_id][TRACKS]:
-            USER_DB_CURSOR.execute(
+            save_state_rows.append((
                 '''UPDATE tracks SET locked = ?, under_construction = ?, construction_time = ?, 
                 unlock_condition_from_level = ?, unlock_condition_from_previous_track = ?, 
                 unlock_condition_from_environment = ?, unlock_available = ? WHERE track_number = ? AND map_id = ?''',
@@ -54,19 +55,19 @@ class ConstructorModel(MapBaseModel, ABC):
                     CONSTRUCTION_STATE_MATRIX[self.map_id][TRACKS][track][UNLOCK_CONDITION_FROM_ENVIRONMENT],
                     CONSTRUCTION_STATE_MATRIX[self.map_id][TRACKS][track][UNLOCK_AVAILABLE], track, self.map_id
                 )
-            )
+            ))
 
         # same for environment
         for tier in self.cached_unlocked_tiers:
-            USER_DB_CURSOR.execute(
+            save_state_rows.append((
                 '''UPDATE environment SET locked = 0, under_construction = 0, construction_time = 0, 
                 unlock_condition_from_level = 0, unlock_condition_from_previous_environment = 0, unlock_available = 0 
                 WHERE tier = ? AND map_id = ?''', (tier, self.map_id)
-            )
+            ))
 
         self.cached_unlocked_tiers = []
         for tier in CONSTRUCTION_STATE_MATRIX[self.map_id][ENVIRONMENT]:
-            USER_DB_CURSOR.execute(
+            save_state_rows.append((
                 '''UPDATE environment SET locked = ?, under_construction = ?, construction_time = ?, 
                 unlock_condition_from_level = ?, unlock_condition_from_previous_environment = ?, unlock_available = ? 
                 WHERE tier = ? AND map_id = ?''',
@@ -80,7 +81,9 @@ class ConstructorModel(MapBaseModel, ABC):
                     ],
                     CONSTRUCTION_STATE_MATRIX[self.map_id][ENVIRONMENT][tier][UNLOCK_AVAILABLE], tier, self.map_id
                 )
-            )
+            ))
+
+        return save_state_rows
 
     @final
     def on_update_time(self, dt):
@@ -1,15 +1,22 @@
 from abc import ABC, abstractmethod
 from logging import getLogger
 from typing import final
+from itertools import count
 
 from database import USER_DB_CURSOR, CONFIG_DB_CURSOR, TRUE, FALSE, ARRIVAL_ANNOUNCEMENT, PASS_THROUGH_ANNOUNCEMENT
 from model import MapBaseModel, ENTRY_TRAIN_ROUTE
+from profiler import profiled
 
 
 class DispatcherModel(MapBaseModel, ABC):
     def __init__(self, controller, view, map_id):
         super().__init__(controller, view, map_id, logger=getLogger(f'root.app.game.map.{map_id}.dispatcher.model'))
-        self.trains = []
+        # trains waiting for track assignment in order they were added to dispatcher, and index
+        # of waiting trains by track; assignment is recalculated only for trains affected by recent events
+        self.trains = {}
+        self.train_sequence = count()
+        self.waiting_trains_by_track = {}
+        self.trains_to_dispatch = set()
         USER_DB_CURSOR.execute('''SELECT unlocked_tracks FROM map_progress WHERE map_id = ?''', (self.map_id, ))
         self.unlocked_tracks = USER_DB_CURSOR.fetchone()[0]
         USER_DB_CURSOR.execute('SELECT busy FROM tracks WHERE map_id = ?', (self.map_id, ))
@@ -21,16 +28,23 @@ class DispatcherModel(MapBaseModel, ABC):
 
     @final
     def on_save_state(self):
-        for i in range(1, len(self.track_busy_status)):
-            USER_DB_CURSOR.execute(
+        return [
+            (
                 'UPDATE tracks SET busy = ? WHERE track_number = ? AND map_id = ?',
                 (self.track_busy_status[i], i, self.map_id)
-            )
+            ) for i in range(1, len(self.track_busy_status))
+        ]
 
     @final
+    @profiled('dispatcher')
     def on_update_time(self, dt):
         super().on_update_time(dt)
-        for t in self.trains:
+        if len(self.trains_to_dispatch) == 0:
+            return
+
+        # when nothing changed since last update, waiting trains still have no free track, so
+        # only trains affected by events are checked, and they are checked in the order they were added
+        for t in sorted(self.trains_to_dispatch, key=self.trains.get):
             for track in self.get_track_priority_list(t):
                 if track <= self.unlocked_tracks and not self.track_busy_status[track] \
                         and t.model.cars in range(self.supported_cars_by_track[track][0],
@@ -47,6 +61,9 @@ class DispatcherModel(MapBaseModel, ABC):
                             train_id=None, track_number=track
                         )
 
+                    for waiting_track in self.get_track_priority_list(t):
+                        self.waiting_trains_by_track[waiting_track].remove(t)
+
                     t.model.state = 'pending_boarding'
                     self.controller.parent_controller.on_close_train_route(t.model.track, t.model.train_route)
                     t.model.track = track
@@ -54,20 +71,30 @@ class DispatcherModel(MapBaseModel, ABC):
                     self.controller.parent_controller.on_open_train_route(
                         track, ENTRY_TRAIN_ROUTE[self.map_id][t.model.direction], t.train_id, t.model.cars
                     )
-                    self.trains.remove(t)
+                    self.trains.pop(t)
                     break
 
+        self.trains_to_dispatch.clear()
+
     @final
     def on_unlock_track(self, track):
+        for unlocked_track in range(self.unlocked_tracks + 1, track + 1):
+            self.trains_to_dispatch.update(self.waiting_trains_by_track.get(unlocked_track, ()))
+
         self.unlocked_tracks = track
 
     @final
     def on_add_train(self, train_controller):
-        self.trains.append(train_controller)
+        self.trains[train_controller] = next(self.train_sequence)
+        for track in self.get_track_priority_list(train_controller):
+            self.waiting_trains_by_track.setdefault(track, []).append(train_controller)
+
+        self.trains_to_dispatch.add(train_controller)
 
     @final
     def on_leave_track(self, track):
         self.track_busy_status[track] = FALSE
+        self.trains_to_dispatch.update(self.waiting_trains_by_track.get(track, ()))
 
     @abstractmethod
     def get_track_priority_list(self, train):
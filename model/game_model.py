@@ -18,18 +18,21 @@ class GameModel(GameBaseModel):
         self.player_progress = CONFIG_DB_CURSOR.fetchone()[0]
 
     def on_save_state(self):
-        USER_DB_CURSOR.execute(
+        save_state_rows = []
+        save_state_rows.append((
             '''UPDATE epoch_timestamp SET game_time = ?, game_time_fraction = ?''',
             (self.game_time, self.game_time_fraction)
-        )
-        USER_DB_CURSOR.execute(
+        ))
+        save_state_rows.append((
             '''UPDATE game_progress SET level = ?, exp = ?, money = ?, money_target = ?, exp_multiplier = ?, 
             exp_bonus_multiplier = ?, money_bonus_multiplier = ?, construction_speed_bonus_multiplier = ?''',
             (
                 self.level, self.exp, self.money, self.money_target, self.exp_multiplier, self.exp_bonus_multiplier,
                 self.money_bonus_multiplier, self.construction_speed_bonus_multiplier
             )
-        )
+        ))
+
+        return save_state_rows
 
     def on_level_up(self):
         super().on_level_up()
@@ -45,7 +48,7 @@ class GameModel(GameBaseModel):
 
     def on_add_money(self, money):
         if self.money_target > 0 and self.money < self.money_target <= self.money + money * self.money_bonus_multiplier:
-            for m in self.controller.maps:
+            for m in [m for m in self.controller.maps if m is not None]:
                 if m.constructor.model.money_target_activated:
                     if m.constructor.model.money_target_cell_position[0] == TRACKS:
                         self.view.on_send_enough_money_track_notification()
@@ -10,4 +10,4 @@ class LicenseModel(AppBaseModel):
         super().__init__(controller, view, logger=getLogger('root.app.license.model'))
 
     def on_save_state(self):
-        pass
+        return []
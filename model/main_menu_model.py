@@ -10,4 +10,4 @@ class MainMenuModel(AppBaseModel):
         super().__init__(controller, view, logger=getLogger('root.app.main_menu.model'))
 
     def on_save_state(self):
-        pass
+        return []
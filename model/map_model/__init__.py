@@ -1,11 +1,12 @@
 from abc import ABC
-from random import choice, seed
+from random import choice
 from logging import getLogger
 from typing import final
 
-from model import MapBaseModel, CAR_COLLECTION_UNLOCK_TRACK_LIST
-from ui import MAXIMUM_CAR_COLLECTIONS
-from database import USER_DB_CURSOR, CONFIG_DB_CURSOR, on_commit
+from model import MapBaseModel, CAR_COLLECTION_UNLOCK_TRACK_LIST, TRAIN_STATE_ENGINE_ENABLED
+from model.train_model.train_state_engine import TrainStateEngine
+from database import USER_DB_CURSOR, CONFIG_DB_CURSOR, COMMIT_QUEUE, MAXIMUM_CAR_COLLECTIONS
+from profiler import profiled
 
 
 class MapModel(MapBaseModel, ABC):
@@ -33,17 +34,18 @@ class MapModel(MapBaseModel, ABC):
             '''SELECT unlocked_tracks_by_default FROM map_progress_config WHERE map_id = ?''', (self.map_id, )
         )
         self.unlocked_tracks_by_default = CONFIG_DB_CURSOR.fetchone()[0]
+        self.train_state_engine = TrainStateEngine(self.map_id) if TRAIN_STATE_ENGINE_ENABLED else None
 
     @final
     def on_save_state(self):
-        USER_DB_CURSOR.execute(
+        return [(
             '''UPDATE map_progress SET locked = ?, unlocked_tracks = ?, unlocked_environment = ?, 
             unlocked_car_collections = ? WHERE map_id = ?''',
             (
                 self.locked, self.unlocked_tracks, self.unlocked_environment,
                 ','.join(str(c) for c in self.unlocked_car_collections), self.map_id
             )
-        )
+        )]
 
     @final
     def on_unlock_track(self, track):
@@ -63,24 +65,22 @@ class MapModel(MapBaseModel, ABC):
     @final
     def on_save_and_commit_last_known_base_offset(self):
         self.last_known_base_offset = self.view.base_offset
-        USER_DB_CURSOR.execute(
+        COMMIT_QUEUE.on_add_row(
             '''UPDATE map_position_settings SET last_known_base_offset = ? WHERE map_id = ?''',
             (','.join(str(p) for p in self.last_known_base_offset), self.map_id)
         )
-        on_commit()
 
     @final
     def on_save_and_commit_last_known_zoom(self):
         self.last_known_zoom = self.view.zoom
-        USER_DB_CURSOR.execute(
+        COMMIT_QUEUE.on_add_row(
             '''UPDATE map_position_settings SET last_known_zoom = ? WHERE map_id = ?''',
             (self.last_known_zoom, self.map_id)
         )
-        on_commit()
 
     @final
     def on_clear_trains_info(self):
-        USER_DB_CURSOR.execute('''DELETE FROM trains WHERE map_id = ?''', (self.map_id, ))
+        return [('''DELETE FROM trains WHERE map_id = ?''', (self.map_id, ))]
 
     def on_create_train(
             self, train_id, cars, track, train_route, state, direction, new_direction,
@@ -88,13 +88,29 @@ class MapModel(MapBaseModel, ABC):
     ):
         pass
 
+    @final
+    def on_add_train(self, train_model):
+        if self.train_state_engine is not None:
+            self.train_state_engine.on_add_train(train_model)
+
+    @final
+    def on_remove_train(self, train_model):
+        if self.train_state_engine is not None:
+            self.train_state_engine.on_remove_train(train_model)
+
+    @final
+    @profiled('trains')
+    def on_update_train_state_engine(self, dt):
+        # all moving trains are updated at once after every other map element
+        if self.train_state_engine is not None:
+            self.train_state_engine.on_update_time(dt, self.dt_multiplier)
+
     @final
     def on_add_new_car_collection(self):
         available_car_collections = [
             c for c in range(MAXIMUM_CAR_COLLECTIONS[self.map_id]) if c not in self.unlocked_car_collections
         ]
         if len(available_car_collections) > 0:
-            seed()
             selected_collection = choice(available_car_collections)
             self.unlocked_car_collections.append(selected_collection)
 
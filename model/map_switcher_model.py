@@ -13,7 +13,7 @@ class MapSwitcherModel(GameBaseModel):
         self.currently_selected_map = USER_DB_CURSOR.fetchone()[0]
 
     def on_save_state(self):
-        USER_DB_CURSOR.execute('''UPDATE graphics SET last_known_map_id = ?''', (self.currently_selected_map, ))
+        return [('''UPDATE graphics SET last_known_map_id = ?''', (self.currently_selected_map, ))]
 
     def on_switch_map(self, new_map_id):
         self.currently_selected_map = new_map_id
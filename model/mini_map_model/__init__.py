@@ -9,4 +9,4 @@ class MiniMapModel(MapBaseModel, ABC):
         super().__init__(controller, view, map_id, logger=getLogger(f'root.app.game.map.{map_id}.mini_map.model'))
 
     def on_save_state(self):
-        pass
+        return []
@@ -1,11 +1,11 @@
 from abc import ABC
 from logging import getLogger
-from operator import itemgetter
 from typing import final
 
-from database import USER_DB_CURSOR, NARRATOR_QUEUE, ANNOUNCEMENT_TIME, ANNOUNCEMENT_LOCKED, ANNOUNCEMENT_TYPE, \
-    get_announcement_types_diff, get_announcement_types_enabled
+from database import NARRATOR_QUEUE, ANNOUNCEMENT_TIME, ANNOUNCEMENT_LOCKED, get_announcement_types_diff, \
+    get_announcement_types_enabled
 from model import MapBaseModel
+from profiler import profiled
 
 
 class NarratorModel(MapBaseModel, ABC):
@@ -14,42 +14,39 @@ class NarratorModel(MapBaseModel, ABC):
 
     @final
     def on_save_state(self):
-        USER_DB_CURSOR.execute('''DELETE FROM narrator WHERE map_id = ?''', (self.map_id, ))
-        for announcement in NARRATOR_QUEUE[self.map_id]:
-            USER_DB_CURSOR.execute('''INSERT INTO narrator VALUES (?, ?, ?, ?, ?, ?)''', (self.map_id, *announcement))
+        return [
+            ('''DELETE FROM narrator WHERE map_id = ?''', (self.map_id, )),
+            *(
+                ('''INSERT INTO narrator VALUES (?, ?, ?, ?, ?, ?)''', (self.map_id, *announcement))
+                for announcement in NARRATOR_QUEUE[self.map_id]
+            )
+        ]
 
     @final
+    @profiled('narrator')
     def on_update_time(self, dt):
-        NARRATOR_QUEUE[self.map_id] = sorted(NARRATOR_QUEUE[self.map_id], key=itemgetter(ANNOUNCEMENT_TIME))
         # self.logger.debug(f'{self.game_time + int(self.game_time_fraction + dt * self.dt_multiplier)=}')
         # self.logger.debug(f'{NARRATOR_QUEUE[self.map_id]=}')
         while len(NARRATOR_QUEUE[self.map_id]) > 0 \
                 and self.game_time + int(self.game_time_fraction + dt * self.dt_multiplier) \
-                >= NARRATOR_QUEUE[self.map_id][0][ANNOUNCEMENT_TIME] \
-                and NARRATOR_QUEUE[self.map_id][0][ANNOUNCEMENT_LOCKED]:
-            NARRATOR_QUEUE[self.map_id].pop(0)
+                >= NARRATOR_QUEUE[self.map_id].get_first_announcement()[ANNOUNCEMENT_TIME] \
+                and NARRATOR_QUEUE[self.map_id].get_first_announcement()[ANNOUNCEMENT_LOCKED]:
+            NARRATOR_QUEUE[self.map_id].on_pop_first_announcement()
 
         super().on_update_time(dt)
 
     @final
     def on_dt_multiplier_update(self, dt_multiplier):
-        # print(f'{self.dt_multiplier=}, {dt_multiplier=}')
-        # print([announcement for announcement in NARRATOR_QUEUE[self.map_id]
-        #        if announcement[ANNOUNCEMENT_TYPE] in get_announcement_types_diff(self.dt_multiplier, dt_multiplier)])
-        for announcement in [
-            announcement for announcement in NARRATOR_QUEUE[self.map_id]
-            if announcement[ANNOUNCEMENT_TYPE] in get_announcement_types_diff(self.dt_multiplier, dt_multiplier)
-        ]:
-            announcement[ANNOUNCEMENT_LOCKED] = int(self.dt_multiplier < dt_multiplier)
-
-        # print([announcement for announcement in NARRATOR_QUEUE[self.map_id]
-        #        if announcement[ANNOUNCEMENT_TYPE] in get_announcement_types_diff(self.dt_multiplier, dt_multiplier)])
-
+        # announcement types which are disabled at higher time speed are locked when time speed increases
+        # and unlocked when it decreases
+        NARRATOR_QUEUE[self.map_id].on_update_lock_state(
+            get_announcement_types_diff(self.dt_multiplier, dt_multiplier), int(self.dt_multiplier < dt_multiplier)
+        )
         super().on_dt_multiplier_update(dt_multiplier)
 
     @final
     def on_announcement_add(self, announcement_time, announcement_type, train_id, track_number):
-        NARRATOR_QUEUE[self.map_id].append(
+        NARRATOR_QUEUE[self.map_id].on_add_announcement(
             [
                 announcement_time, int(
                     not(
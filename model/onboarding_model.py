@@ -1,7 +1,7 @@
 from logging import getLogger
 from typing import final
 
-from database import USER_DB_CURSOR, on_commit
+from database import SAVE_STATE_WORKER
 from model import AppBaseModel
 
 
@@ -11,9 +11,8 @@ class OnboardingModel(AppBaseModel):
         super().__init__(controller, view, logger=getLogger('root.app.onboarding.model'))
 
     def on_save_state(self):
-        pass
+        return []
 
     @staticmethod
     def on_save_and_commit_onboarding_state():
-        USER_DB_CURSOR.execute('UPDATE game_progress SET onboarding_required = 0')
-        on_commit()
+        SAVE_STATE_WORKER.on_save_state([('UPDATE game_progress SET onboarding_required = 0', ())])
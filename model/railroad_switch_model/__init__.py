@@ -2,7 +2,7 @@ from abc import ABC
 from logging import getLogger
 from typing import final
 
-from database import USER_DB_CURSOR, CONFIG_DB_CURSOR, TRUE, FALSE
+from database import USER_DB_INDEX, CONFIG_DB_INDEX, TRUE, FALSE
 from model import MapBaseModel
 
 
@@ -16,41 +16,27 @@ class RailroadSwitchModel(MapBaseModel, ABC):
         self.track_param_1 = track_param_1
         self.track_param_2 = track_param_2
         self.switch_type = switch_type
-        USER_DB_CURSOR.execute(
-            '''SELECT busy, force_busy FROM switches 
-            WHERE track_param_1 = ? AND track_param_2 = ? AND switch_type = ? AND map_id = ?''',
-            (self.track_param_1, self.track_param_2, self.switch_type, self.map_id)
-        )
-        self.busy, self.force_busy = USER_DB_CURSOR.fetchone()
-        USER_DB_CURSOR.execute(
-            '''SELECT last_entered_by, current_position FROM switches 
-            WHERE track_param_1 = ? AND track_param_2 = ? AND switch_type = ? AND map_id = ?''',
-            (self.track_param_1, self.track_param_2, self.switch_type, self.map_id)
+        self.busy, self.force_busy, self.last_entered_by, self.current_position, self.locked = USER_DB_INDEX.get_row(
+            'switches', ('busy', 'force_busy', 'last_entered_by', 'current_position', 'locked'),
+            track_param_1=self.track_param_1, track_param_2=self.track_param_2, switch_type=self.switch_type,
+            map_id=self.map_id
         )
-        self.last_entered_by, self.current_position = USER_DB_CURSOR.fetchone()
-        CONFIG_DB_CURSOR.execute(
-            '''SELECT track, train_route, section_number FROM train_route_sections
-            WHERE track_param_1 = ? AND track_param_2 = ? AND section_type = ? AND map_id = ?''',
-            (self.track_param_1, self.track_param_2, self.switch_type, self.map_id)
+        self.state_change_listeners = CONFIG_DB_INDEX.get_rows(
+            'train_route_sections', ('track', 'train_route', 'section_number'),
+            track_param_1=self.track_param_1, track_param_2=self.track_param_2, section_type=self.switch_type,
+            map_id=self.map_id
         )
-        self.state_change_listeners = CONFIG_DB_CURSOR.fetchall()
-        USER_DB_CURSOR.execute(
-            '''SELECT locked FROM switches 
-            WHERE track_param_1 = ? AND track_param_2 = ? AND switch_type = ? AND map_id = ?''',
-            (self.track_param_1, self.track_param_2, self.switch_type, self.map_id)
-        )
-        self.locked = USER_DB_CURSOR.fetchone()[0]
 
     @final
     def on_save_state(self):
-        USER_DB_CURSOR.execute(
+        return [(
             '''UPDATE switches SET busy = ?, force_busy = ?, last_entered_by = ?, current_position = ?, locked = ? 
             WHERE track_param_1 = ? AND track_param_2 = ? AND switch_type = ? AND map_id = ?''',
             (
                 self.busy, self.force_busy, self.last_entered_by, self.current_position, self.locked,
                 self.track_param_1, self.track_param_2, self.switch_type, self.map_id
             )
-        )
+        )]
 
     @final
     def on_force_busy_on(self, positions, train_id):
@@ -1,14 +1,14 @@
 from abc import ABC, abstractmethod
 from random import choice
-from operator import itemgetter
 from logging import getLogger
 from typing import final
 
 from database import USER_DB_CURSOR, CONFIG_DB_CURSOR, BASE_SCHEDULE, TRAIN_ID_POOL, DIRECTION, NEW_DIRECTION, \
-    CARS_MIN, CARS_MAX, ARRIVAL_TIME_MIN, ARRIVAL_TIME_MAX, SWITCH_DIRECTION_FLAG, SECONDS_IN_ONE_DAY, ARRIVAL_TIME, \
+    CARS_MIN, CARS_MAX, ARRIVAL_TIME_MIN, ARRIVAL_TIME_MAX, SWITCH_DIRECTION_FLAG, SECONDS_IN_ONE_DAY, \
     TRUE, FALSE, CARS, TRAIN_ID, STOP_TIME, EXP, MONEY, SWITCH_DIRECTION_REQUIRED
 from model import MapBaseModel, JOINT_ENTRIES, MAP_ENTRY_UNLOCK_CONDITIONS, ENTRY_TRACK_ID, APPROACHING_TRAIN_ROUTE, \
     DEFAULT_PRIORITY, PASS_THROUGH_BOARDING_TIME
+from profiler import profiled
 
 
 class SchedulerModel(MapBaseModel, ABC):
@@ -55,11 +55,12 @@ class SchedulerModel(MapBaseModel, ABC):
 
     @final
     def on_save_state(self):
-        USER_DB_CURSOR.execute(
+        save_state_rows = []
+        save_state_rows.append((
             '''UPDATE scheduler SET next_cycle_start_time = ?, entry_busy_state = ? WHERE map_id = ?''',
             (self.next_cycle_start_time, ','.join(str(t) for t in self.entry_busy_state), self.map_id)
-        )
-        USER_DB_CURSOR.execute(
+        ))
+        save_state_rows.append((
             '''UPDATE map_progress SET entry_locked_state = ?, min_supported_cars_by_direction = ? WHERE map_id = ?''',
             (
                 ','.join(str(t) for t in self.entry_locked_state),
@@ -69,20 +70,23 @@ class SchedulerModel(MapBaseModel, ABC):
                 ]),
                 self.map_id
             )
-        )
-        USER_DB_CURSOR.execute('''DELETE FROM base_schedule WHERE map_id = ?''', (self.map_id, ))
+        ))
+        save_state_rows.append(('''DELETE FROM base_schedule WHERE map_id = ?''', (self.map_id, )))
         for train in BASE_SCHEDULE[self.map_id]:
-            USER_DB_CURSOR.execute(
+            save_state_rows.append((
                 'INSERT INTO base_schedule VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', (self.map_id, *train)
-            )
+            ))
 
         for train_id, expiration_time in TRAIN_ID_POOL[self.map_id].items():
-            USER_DB_CURSOR.execute(
+            save_state_rows.append((
                 '''UPDATE train_numbers SET expiration_time = ? WHERE train_id = ? AND map_id = ?''',
                 (expiration_time, train_id, self.map_id)
-            )
+            ))
+
+        return save_state_rows
 
     @final
+    @profiled('scheduler')
     def on_update_time(self, dt):
         super().on_update_time(dt)
         # new schedule cycle is created if current schedule end is less than schedule cycle length ahead
@@ -92,9 +96,8 @@ class SchedulerModel(MapBaseModel, ABC):
             for i in self.schedule_options:
                 if not self.entry_locked_state[i[DIRECTION]] and not self.exit_locked_state[i[NEW_DIRECTION]]:
                     cars = choice(list(range(i[CARS_MIN], i[CARS_MAX] + 1)))
-                    train_id = choice(
-                        [train_id for train_id, expiration_time in TRAIN_ID_POOL[self.map_id].items()
-                         if expiration_time <= self.game_time]
+                    train_id = TRAIN_ID_POOL[self.map_id].get_train_id(
+                        self.game_time, self.game_time + SECONDS_IN_ONE_DAY
                     )
                     train_options = (
                         train_id,
@@ -103,45 +106,34 @@ class SchedulerModel(MapBaseModel, ABC):
                         i[DIRECTION], i[NEW_DIRECTION], cars, self.seconds_per_car * cars,
                         self.exp_per_car * cars, self.money_per_car * cars, i[SWITCH_DIRECTION_FLAG]
                     )
-                    BASE_SCHEDULE[self.map_id].append(train_options)
-                    TRAIN_ID_POOL[self.map_id][train_id] = self.game_time + SECONDS_IN_ONE_DAY
+                    BASE_SCHEDULE[self.map_id].on_add_train(train_options)
 
             self.next_cycle_start_time += self.schedule_cycle_length
-            BASE_SCHEDULE[self.map_id].sort(key=itemgetter(ARRIVAL_TIME))
-            # self.view.base_schedule = self.base_schedule
 
         # notify Map controller about new train available if arrival time is less or equal than current time
         # and corresponding entry is not busy; only one train at a time is created
-        for i in BASE_SCHEDULE[self.map_id]:
-            if self.game_time >= i[ARRIVAL_TIME]:
-                if not self.entry_busy_state[i[DIRECTION]]:
-                    self.entry_busy_state[i[DIRECTION]] = TRUE
-                    for e in JOINT_ENTRIES[self.map_id][i[DIRECTION]]:
-                        self.entry_busy_state[e] = TRUE
-
-                    if i[CARS] < self.min_supported_cars_by_direction[i[DIRECTION]][i[NEW_DIRECTION]]:
-                        self.controller.parent_controller.on_create_train(
-                            i[TRAIN_ID], i[CARS], ENTRY_TRACK_ID[self.map_id][i[DIRECTION]],
-                            APPROACHING_TRAIN_ROUTE[self.map_id][i[DIRECTION]], 'approaching_pass_through',
-                            i[DIRECTION], i[DIRECTION], i[DIRECTION], DEFAULT_PRIORITY, PASS_THROUGH_BOARDING_TIME,
-                            0.0, 0.0, FALSE
-                        )
-                    else:
-                        self.controller.parent_controller.on_create_train(
-                            i[TRAIN_ID], i[CARS], ENTRY_TRACK_ID[self.map_id][i[DIRECTION]],
-                            APPROACHING_TRAIN_ROUTE[self.map_id][i[DIRECTION]], 'approaching',
-                            i[DIRECTION], i[NEW_DIRECTION], i[DIRECTION], DEFAULT_PRIORITY, i[STOP_TIME],
-                            i[EXP], i[MONEY], i[SWITCH_DIRECTION_REQUIRED]
-                        )
-
-                    index = BASE_SCHEDULE[self.map_id].index(i)
-                    self.view.on_release_train(index)
-                    BASE_SCHEDULE[self.map_id].remove(i)
-                    break
+        if (i := BASE_SCHEDULE[self.map_id].get_next_train(self.game_time, self.entry_busy_state)) is not None:
+            self.entry_busy_state[i[DIRECTION]] = TRUE
+            for e in JOINT_ENTRIES[self.map_id][i[DIRECTION]]:
+                self.entry_busy_state[e] = TRUE
+
+            if i[CARS] < self.min_supported_cars_by_direction[i[DIRECTION]][i[NEW_DIRECTION]]:
+                self.controller.parent_controller.on_create_train(
+                    i[TRAIN_ID], i[CARS], ENTRY_TRACK_ID[self.map_id][i[DIRECTION]],
+                    APPROACHING_TRAIN_ROUTE[self.map_id][i[DIRECTION]], 'approaching_pass_through',
+                    i[DIRECTION], i[DIRECTION], i[DIRECTION], DEFAULT_PRIORITY, PASS_THROUGH_BOARDING_TIME,
+                    0.0, 0.0, FALSE
+                )
             else:
-                # no more trains can be created because schedule is sorted by arrival time,
-                # and arrival time for all following trans will be greater than current time
-                break
+                self.controller.parent_controller.on_create_train(
+                    i[TRAIN_ID], i[CARS], ENTRY_TRACK_ID[self.map_id][i[DIRECTION]],
+                    APPROACHING_TRAIN_ROUTE[self.map_id][i[DIRECTION]], 'approaching',
+                    i[DIRECTION], i[NEW_DIRECTION], i[DIRECTION], DEFAULT_PRIORITY, i[STOP_TIME],
+                    i[EXP], i[MONEY], i[SWITCH_DIRECTION_REQUIRED]
+                )
+
+            self.view.on_release_train(i)
+            BASE_SCHEDULE[self.map_id].on_release_train(i)
 
     @final
     def on_level_up(self):
@@ -1,7 +1,7 @@
 from logging import getLogger
 from typing import final
 
-from database import USER_DB_CURSOR, on_commit
+from database import USER_DB_CURSOR, SAVE_STATE_WORKER
 from model import AppBaseModel
 
 
@@ -24,14 +24,15 @@ class SettingsModel(AppBaseModel):
         self.master_volume, self.announcements_enabled = USER_DB_CURSOR.fetchone()
 
     def on_save_state(self):
-        pass
+        return []
 
     def on_save_and_commit_state(self):
-        USER_DB_CURSOR.execute(
+        save_state_rows = []
+        save_state_rows.append((
             '''UPDATE graphics SET app_width = ?, app_height = ?, display_fps = ?, fade_animations_enabled = ?''',
             (*self.windowed_resolution, self.display_fps, self.fade_animations_enabled)
-        )
-        USER_DB_CURSOR.execute(
+        ))
+        save_state_rows.append((
             '''UPDATE notification_settings SET level_up_notification_enabled = ?, 
             feature_unlocked_notification_enabled = ?, construction_completed_notification_enabled = ?, 
             enough_money_notification_enabled = ?, bonus_expired_notification_enabled = ?,
@@ -42,13 +43,13 @@ class SettingsModel(AppBaseModel):
                 self.bonus_expired_notification_enabled, self.shop_storage_notification_enabled,
                 self.voice_not_found_notification_enabled
             )
-        )
-        USER_DB_CURSOR.execute('UPDATE i18n SET clock_24h = ?', (self.clock_24h_enabled, ))
-        USER_DB_CURSOR.execute(
+        ))
+        save_state_rows.append(('UPDATE i18n SET clock_24h = ?', (self.clock_24h_enabled, )))
+        save_state_rows.append((
             '''UPDATE sound SET master_volume = ?, announcements_enabled = ?''',
             (self.master_volume, self.announcements_enabled)
-        )
-        on_commit()
+        ))
+        SAVE_STATE_WORKER.on_save_state(save_state_rows)
 
     def on_accept_changes(
             self, windowed_resolution, display_fps, fade_animations_enabled, clock_24h_enabled,
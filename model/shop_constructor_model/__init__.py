@@ -40,13 +40,14 @@ class ShopConstructorModel(MapBaseModel, ABC):
 
     @final
     def on_save_state(self):
-        USER_DB_CURSOR.execute(
+        save_state_rows = []
+        save_state_rows.append((
             '''UPDATE shops SET current_stage = ?, shop_storage_money = ?, internal_shop_time = ? 
             WHERE map_id = ? AND shop_id = ?''',
             (self.current_stage, self.shop_storage_money, self.internal_shop_time, self.map_id, self.shop_id)
-        )
+        ))
         for stage_number in self.shop_stages_state_matrix:
-            USER_DB_CURSOR.execute(
+            save_state_rows.append((
                 '''UPDATE shop_stages SET locked = ?, under_construction = ?, construction_time = ?, 
                 unlock_condition_from_level = ?, unlock_condition_from_previous_stage = ?, unlock_available = ?
                 WHERE map_id = ? AND shop_id = ? AND stage_number = ?''',
@@ -59,7 +60,9 @@ class ShopConstructorModel(MapBaseModel, ABC):
                     self.shop_stages_state_matrix[stage_number][UNLOCK_AVAILABLE],
                     self.map_id, self.shop_id, stage_number
                 )
-            )
+            ))
+
+        return save_state_rows
 
     @final
     def on_update_time(self, dt):
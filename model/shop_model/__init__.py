@@ -15,4 +15,4 @@ class ShopModel(MapBaseModel, ABC):
         self.level_required = CONFIG_DB_CURSOR.fetchone()[0]
 
     def on_save_state(self):
-        pass
+        return []
@@ -12,4 +12,4 @@ class ShopPlaceholderModel(MapBaseModel, ABC):
         self.shop_id = shop_id
 
     def on_save_state(self):
-        pass
+        return []
@@ -2,9 +2,8 @@ from abc import ABC
 from logging import getLogger
 from typing import final
 
-from database import USER_DB_CURSOR
+from database import USER_DB_INDEX, GREEN_SIGNAL, RED_SIGNAL
 from model import MapBaseModel
-from ui import GREEN_SIGNAL, RED_SIGNAL
 
 
 class SignalModel(MapBaseModel, ABC):
@@ -14,18 +13,16 @@ class SignalModel(MapBaseModel, ABC):
         )
         self.track = track
         self.base_route = base_route
-        USER_DB_CURSOR.execute(
-            '''SELECT state, locked FROM signals WHERE track = ? AND base_route = ? AND map_id = ?''',
-            (self.track, self.base_route, self.map_id)
+        self.state, self.locked = USER_DB_INDEX.get_row(
+            'signals', ('state', 'locked'), track=self.track, base_route=self.base_route, map_id=self.map_id
         )
-        self.state, self.locked = USER_DB_CURSOR.fetchone()
 
     @final
     def on_save_state(self):
-        USER_DB_CURSOR.execute(
+        return [(
             '''UPDATE signals SET state = ?, locked = ? WHERE track = ? AND base_route = ? AND map_id = ?''',
             (self.state, self.locked, self.track, self.base_route, self.map_id)
-        )
+        )]
 
     @final
     def on_switch_to_green(self):
@@ -1,12 +1,12 @@
 from abc import ABC, abstractmethod
 from logging import getLogger
-from math import log
 from typing import final
 
 from database import USER_DB_CURSOR, FALSE, SECONDS_IN_ONE_MINUTE, DEPARTURE_ANNOUNCEMENT, \
     ARRIVAL_FINISHED_ANNOUNCEMENT, FIVE_MINUTES_LEFT_ANNOUNCEMENT
-from model import MapBaseModel, TRAIN_MAXIMUM_SPEED, TRAIN_VELOCITY_BASE, get_braking_distance, get_speed_state_time, \
-    get_distance, EXIT_TRAIN_ROUTE
+from model import MapBaseModel, TRAIN_MAXIMUM_SPEED, TRAIN_MAXIMUM_SPEED_STATE_TIME, get_braking_distance, \
+    get_speed_state_time, get_distance, EXIT_TRAIN_ROUTE
+from profiler import profiled
 
 
 class TrainModel(MapBaseModel, ABC):
@@ -35,6 +35,7 @@ class TrainModel(MapBaseModel, ABC):
         self.trail_points_v2 = None
         self.car_image_collection = 0
         self.switch_direction_required = FALSE
+        self.train_state_engine = None
 
     @final
     def on_train_setup(self):
@@ -51,12 +52,7 @@ class TrainModel(MapBaseModel, ABC):
             = USER_DB_CURSOR.fetchone()
         if cars_position_parsed is not None:
             self.cars_position = [float(p) for p in cars_position_parsed.split(',')]
-            self.view.car_position = []
-            self.view.car_position.append(self.trail_points_v2.get_head_tail_car_position(self.cars_position[0]))
-            for i in range(1, len(self.cars_position) - 1):
-                self.view.car_position.append(self.trail_points_v2.get_mid_car_position(self.cars_position[i]))
-
-            self.view.car_position.append(self.trail_points_v2.get_head_tail_car_position(self.cars_position[-1]))
+            self.view.car_position = self.trail_points_v2.get_train_car_positions(self.cars_position)
 
         if cars_position_abs_parsed is not None:
             self.cars_position_abs = [[float(p) for p in s.split(',')] for s in cars_position_abs_parsed.split('|')]
@@ -81,7 +77,7 @@ class TrainModel(MapBaseModel, ABC):
             priority, boarding_time, exp, money, car_image_collection, switch_direction_required, \
             exp_bonus_multiplier, money_bonus_multiplier, game_time, game_time_fraction, dt_multiplier
         self.speed_state = 'move'
-        self.speed_state_time = log(TRAIN_MAXIMUM_SPEED[self.map_id] + 1, TRAIN_VELOCITY_BASE)
+        self.speed_state_time = TRAIN_MAXIMUM_SPEED_STATE_TIME[self.map_id]
         self.view.on_train_init(
             self.cars, self.state, self.direction, self.car_image_collection,
             self.game_time, self.game_time_fraction, self.dt_multiplier
@@ -89,6 +85,9 @@ class TrainModel(MapBaseModel, ABC):
 
     @final
     def on_save_state(self):
+        if self.train_state_engine is not None:
+            self.train_state_engine.on_sync_train_state(self)
+
         cars_position_string = None
         if len(self.cars_position) > 0:
             cars_position_string = ','.join(str(p) for p in self.cars_position)
@@ -101,7 +100,7 @@ class TrainModel(MapBaseModel, ABC):
 
             cars_position_abs_string = '|'.join(cars_position_abs_strings_list)
 
-        USER_DB_CURSOR.execute(
+        return [(
             '''INSERT INTO trains VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
             (
                 self.map_id, self.train_id, self.cars, self.track, self.train_route, self.state, self.direction,
@@ -109,9 +108,10 @@ class TrainModel(MapBaseModel, ABC):
                 self.boarding_time, self.exp, self.money, cars_position_string, cars_position_abs_string,
                 self.stop_point, self.destination_point, self.car_image_collection, self.switch_direction_required
             )
-        )
+        )]
 
     @final
+    @profiled('trains')
     def on_update_time(self, dt):
         super().on_update_time(dt)
         # shorter trains gain more priority because they arrive more frequently
@@ -130,88 +130,9 @@ class TrainModel(MapBaseModel, ABC):
         self.controller.parent_controller.on_update_train_route_priority(self.track, self.train_route, self.priority)
 
         if self.state not in ('boarding_in_progress', 'boarding_in_progress_pass_through'):
-            # update speed and speed state
-            # when train reaches stop point, update state to 'stop', speed and speed_factor_position to 0
-            if self.cars_position[0] >= self.stop_point:
-                self.on_train_move(self.stop_point - self.cars_position[0])
-                self.speed_state = 'stop'
-                self.speed_state_time = 0.0
-            # when train needs to stop at stop point and distance is less than braking distance,
-            # update state to 'decelerate'
-            elif (k := get_braking_distance(self.speed_state_time) - (self.stop_point - self.cars_position[0])) >= 0:
-                self.speed_state = 'decelerate'
-                if k > TRAIN_MAXIMUM_SPEED[self.map_id] // 10:
-                    self.speed_state_time = get_speed_state_time(
-                        self.stop_point - self.cars_position[0] + 0.2, self.map_id
-                    )
-            # when train needs to stop at stop point and distance is more than braking distance,
-            # update state to 'accelerate' if train is not at maximum speed already
-            elif self.speed_state != 'move':
-                self.speed_state = 'accelerate'
-
-            # when train reaches destination point, current train route is complete,
-            # update state according to previous state
-            if self.cars_position[0] >= self.destination_point:
-                self.on_train_move(self.destination_point - self.cars_position[0])
-                # approaching routes are closed by dispatcher, other routes can be closed here
-                if self.state not in ('approaching', 'approaching_pass_through'):
-                    self.controller.parent_controller.on_close_train_route(self.track, self.train_route)
-
-                # 'pending_boarding' state means train arrives for boarding, start boarding
-                if self.state == 'pending_boarding':
-                    self.priority = 0
-                    if self.track in (1, 2):
-                        self.state = 'boarding_in_progress_pass_through'
-                    else:
-                        self.state = 'boarding_in_progress'
-                        self.controller.parent_controller.on_announcement_add(
-                            announcement_time=int(self.game_time + self.boarding_time),
-                            announcement_type=DEPARTURE_ANNOUNCEMENT,
-                            train_id=self.train_id, track_number=self.track
-                        )
-                        if self.boarding_time >= SECONDS_IN_ONE_MINUTE * 5:
-                            self.controller.parent_controller.on_announcement_add(
-                                announcement_time=self.game_time,
-                                announcement_type=ARRIVAL_FINISHED_ANNOUNCEMENT,
-                                train_id=self.train_id, track_number=self.track
-                            )
-                            
-                        if self.boarding_time >= SECONDS_IN_ONE_MINUTE * 10:
-                            self.controller.parent_controller.on_announcement_add(
-                                announcement_time=int(self.game_time + self.boarding_time - SECONDS_IN_ONE_MINUTE * 5),
-                                announcement_type=FIVE_MINUTES_LEFT_ANNOUNCEMENT,
-                                train_id=self.train_id, track_number=self.track
-                            )
-
-                    self.view.state = self.state
-                    # when boarding is started, convert trail points to 2D Cartesian
-                    self.on_convert_trail_points()
-                    self.trail_points_v2 = None
-                # 'boarding_complete' state means train has finished entire process,
-                # call on_train_lifecycle_ended() method for map controller to delete this train later
-                elif self.state == 'boarding_complete':
-                    self.controller.parent_controller.on_train_lifecycle_ended(self.controller)
-
-            # update speed depending on speed state
-            if self.speed_state == 'accelerate':
-                if self.speed_state_time >= log(TRAIN_MAXIMUM_SPEED[self.map_id] + 1, TRAIN_VELOCITY_BASE):
-                    # if train has finished acceleration, update state to 'move' (moving at maximum speed)
-                    self.speed_state_time = log(TRAIN_MAXIMUM_SPEED[self.map_id] + 1, TRAIN_VELOCITY_BASE)
-                    self.speed_state = 'move'
-                else:
-                    self.on_train_move(
-                        get_distance(self.speed_state_time, self.speed_state_time + dt * self.dt_multiplier)
-                    )
-                    self.speed_state_time += dt * self.dt_multiplier
-
-            elif self.speed_state == 'move':
-                self.on_train_move(TRAIN_MAXIMUM_SPEED[self.map_id] * dt * self.dt_multiplier)
-            # if train decelerates, continue deceleration
-            elif self.speed_state == 'decelerate':
-                self.on_train_move(
-                    get_distance(self.speed_state_time - dt * self.dt_multiplier, self.speed_state_time)
-                )
-                self.speed_state_time -= dt * self.dt_multiplier
+            # when train state engine is enabled, it updates all moving trains on the map at once
+            if self.train_state_engine is None:
+                self.on_update_speed_state(dt)
 
         else:
             # after half a minute left, assign exit rain route depending on new direction
@@ -231,25 +152,127 @@ class TrainModel(MapBaseModel, ABC):
             # after boarding time is over, update train state and add exp/money
             if self.boarding_time <= 0:
                 self.state = 'boarding_complete'
-                self.view.state = self.state
+                self.view.on_update_state(self.state)
                 self.controller.parent_controller.parent_controller.on_add_exp(self.exp)
                 self.controller.parent_controller.parent_controller.on_add_money(self.money)
+                if self.train_state_engine is not None:
+                    self.train_state_engine.on_activate_train(self)
 
-    @abstractmethod
+    @final
+    def on_update_speed_state(self, dt):
+        # when train reaches stop point, update state to 'stop', speed and speed_factor_position to 0
+        if self.cars_position[0] >= self.stop_point:
+            self.on_train_move(self.stop_point - self.cars_position[0])
+            self.speed_state = 'stop'
+            self.speed_state_time = 0.0
+        # when train needs to stop at stop point and distance is less than braking distance,
+        # update state to 'decelerate'
+        elif (k := get_braking_distance(self.speed_state_time) - (self.stop_point - self.cars_position[0])) >= 0:
+            self.speed_state = 'decelerate'
+            if k > TRAIN_MAXIMUM_SPEED[self.map_id] // 10:
+                self.speed_state_time = get_speed_state_time(
+                    self.stop_point - self.cars_position[0] + 0.2, self.map_id
+                )
+        # when train needs to stop at stop point and distance is more than braking distance,
+        # update state to 'accelerate' if train is not at maximum speed already
+        elif self.speed_state != 'move':
+            self.speed_state = 'accelerate'
+
+        # when train reaches destination point, current train route is complete,
+        # update state according to previous state
+        if self.cars_position[0] >= self.destination_point:
+            self.on_train_move(self.destination_point - self.cars_position[0])
+            self.on_reach_destination_point()
+
+        # update speed depending on speed state
+        if self.speed_state == 'accelerate':
+            if self.speed_state_time >= TRAIN_MAXIMUM_SPEED_STATE_TIME[self.map_id]:
+                # if train has finished acceleration, update state to 'move' (moving at maximum speed)
+                self.speed_state_time = TRAIN_MAXIMUM_SPEED_STATE_TIME[self.map_id]
+                self.speed_state = 'move'
+            else:
+                self.on_train_move(
+                    get_distance(self.speed_state_time, self.speed_state_time + dt * self.dt_multiplier)
+                )
+                self.speed_state_time += dt * self.dt_multiplier
+
+        elif self.speed_state == 'move':
+            self.on_train_move(TRAIN_MAXIMUM_SPEED[self.map_id] * dt * self.dt_multiplier)
+        # if train decelerates, continue deceleration
+        elif self.speed_state == 'decelerate':
+            self.on_train_move(
+                get_distance(self.speed_state_time - dt * self.dt_multiplier, self.speed_state_time)
+            )
+            self.speed_state_time -= dt * self.dt_multiplier
+
+    @final
+    def on_reach_destination_point(self):
+        # approaching routes are closed by dispatcher, other routes can be closed here
+        if self.state not in ('approaching', 'approaching_pass_through'):
+            self.controller.parent_controller.on_close_train_route(self.track, self.train_route)
+
+        # 'pending_boarding' state means train arrives for boarding, start boarding
+        if self.state == 'pending_boarding':
+            self.priority = 0
+            if self.track in (1, 2):
+                self.state = 'boarding_in_progress_pass_through'
+            else:
+                self.state = 'boarding_in_progress'
+                self.controller.parent_controller.on_announcement_add(
+                    announcement_time=int(self.game_time + self.boarding_time),
+                    announcement_type=DEPARTURE_ANNOUNCEMENT,
+                    train_id=self.train_id, track_number=self.track
+                )
+                if self.boarding_time >= SECONDS_IN_ONE_MINUTE * 5:
+                    self.controller.parent_controller.on_announcement_add(
+                        announcement_time=self.game_time,
+                        announcement_type=ARRIVAL_FINISHED_ANNOUNCEMENT,
+                        train_id=self.train_id, track_number=self.track
+                    )
+                    
+                if self.boarding_time >= SECONDS_IN_ONE_MINUTE * 10:
+                    self.controller.parent_controller.on_announcement_add(
+                        announcement_time=int(self.game_time + self.boarding_time - SECONDS_IN_ONE_MINUTE * 5),
+                        announcement_type=FIVE_MINUTES_LEFT_ANNOUNCEMENT,
+                        train_id=self.train_id, track_number=self.track
+                    )
+
+            self.view.on_update_state(self.state)
+            # when boarding is started, convert trail points to 2D Cartesian
+            self.on_convert_trail_points()
+            self.trail_points_v2 = None
+        # 'boarding_complete' state means train has finished entire process,
+        # call on_train_lifecycle_ended() method for map controller to delete this train later
+        elif self.state == 'boarding_complete':
+            self.controller.parent_controller.on_train_lifecycle_ended(self.controller)
+
+    @final
     def on_set_train_start_point(self, first_car_start_point):
+        self.cars_position = self.get_cars_start_position(first_car_start_point)
+        if self.train_state_engine is not None:
+            self.train_state_engine.on_load_cars_position(self)
+
+    @abstractmethod
+    def get_cars_start_position(self, first_car_start_point):
         pass
 
     @final
     def on_set_train_stop_point(self, first_car_stop_point):
         self.stop_point = first_car_stop_point
+        if self.train_state_engine is not None:
+            self.train_state_engine.on_update_stop_point(self, first_car_stop_point)
 
     @final
     def on_set_train_destination_point(self, first_car_destination_point):
         self.destination_point = first_car_destination_point
+        if self.train_state_engine is not None:
+            self.train_state_engine.on_update_destination_point(self, first_car_destination_point)
 
     @final
     def on_set_trail_points(self, trail_points_v2):
         self.trail_points_v2 = trail_points_v2
+        if self.train_state_engine is not None:
+            self.train_state_engine.on_update_trail_points(self)
 
     @final
     def on_convert_trail_points(self):
@@ -277,15 +300,19 @@ class TrainModel(MapBaseModel, ABC):
 
     @final
     def on_train_move(self, ds):
-        self.view.car_position = []
         self.cars_position[0] += ds
-        self.view.car_position.append(self.trail_points_v2.get_head_tail_car_position(self.cars_position[0]))
         for i in range(1, len(self.cars_position) - 1):
             self.cars_position[i] += ds
-            self.view.car_position.append(self.trail_points_v2.get_mid_car_position(self.cars_position[i]))
 
         self.cars_position[-1] += ds
-        self.view.car_position.append(self.trail_points_v2.get_head_tail_car_position(self.cars_position[-1]))
+        self.on_update_car_positions(
+            self.trail_points_v2.get_train_car_positions(self.cars_position), self.cars_position[-1]
+        )
+
+    @final
+    def on_update_car_positions(self, car_positions, last_car_position):
+        # train state engine calculates car positions for all moving trains at once and passes them here
+        self.view.on_update_car_position(car_positions)
         self.controller.parent_controller.on_update_train_route_sections(
-            self.track, self.train_route, self.cars_position[-1]
+            self.track, self.train_route, last_car_position
         )
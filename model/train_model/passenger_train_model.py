@@ -10,7 +10,5 @@ class PassengerTrainModel(TrainModel):
     def __init__(self, controller, view, train_id):
         super().__init__(controller, view, map_id=PASSENGER_MAP, train_id=train_id)
 
-    def on_set_train_start_point(self, first_car_start_point):
-        self.cars_position = []
-        for i in range(self.cars):
-            self.cars_position.append(float(first_car_start_point - i * PASSENGER_CAR_LENGTH))
+    def get_cars_start_position(self, first_car_start_point):
+        return [float(first_car_start_point - i * PASSENGER_CAR_LENGTH) for i in range(self.cars)]
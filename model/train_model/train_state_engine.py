@@ -0,0 +1,225 @@
+from logging import getLogger
+from typing import Final, final
+
+import numpy
+
+from database import get_trail_points_v2_table
+from model import TRAIN_MAXIMUM_SPEED, TRAIN_MAXIMUM_SPEED_STATE_TIME, get_braking_distance, get_distance, \
+    get_speed_state_time
+
+# --------------------- CONSTANTS ---------------------
+SPEED_STATES: Final = ('stop', 'accelerate', 'move', 'decelerate')  # speed state is stored as index in this tuple
+STOP: Final = 0
+ACCELERATE: Final = 1
+MOVE: Final = 2
+DECELERATE: Final = 3
+BOARDING_STATES: Final = ('boarding_in_progress', 'boarding_in_progress_pass_through')
+INITIAL_TRAIN_CAPACITY: Final = 32  # number of train slots allocated on engine creation
+INITIAL_CARS_CAPACITY: Final = 24   # number of car slots allocated for each train on engine creation
+# ------------------- END CONSTANTS -------------------
+
+
+# TrainModel formulas are used for every train which is not at maximum speed, so that results are exactly the same;
+# trains at maximum speed share the same braking distance, they are the most of moving trains
+def _get_braking_distances(t, map_id):
+    at_maximum_speed = t == TRAIN_MAXIMUM_SPEED_STATE_TIME[map_id]
+    braking_distances = numpy.full(len(t), get_braking_distance(TRAIN_MAXIMUM_SPEED_STATE_TIME[map_id]))
+    braking_distances[~at_maximum_speed] = [get_braking_distance(x) for x in t[~at_maximum_speed].tolist()]
+    return braking_distances
+
+
+def _get_distances(t1, t2):
+    return numpy.fromiter(
+        (get_distance(x1, x2) for x1, x2 in zip(t1.tolist(), t2.tolist())), dtype=float, count=len(t1)
+    )
+
+
+@final
+class TrainStateEngine:
+    # Struct-of-arrays storage for all trains on the map: every moving train is advanced in one vectorized step
+    # per frame instead of per-train and per-car Python calls. The engine owns speed state and car positions
+    # while train is moving; during boarding train model owns them again. Train models are synced
+    # with the engine on state transitions and before saving, see TrainModel.
+    def __init__(self, map_id):
+        self.logger = getLogger(f'root.app.game.map.{map_id}.train_state_engine')
+        self.map_id = map_id
+        self.trains = [None] * INITIAL_TRAIN_CAPACITY
+        self.slots = {}
+        self.pending_trains = []
+        self.cars = numpy.zeros(INITIAL_TRAIN_CAPACITY, dtype=int)
+        self.cars_position = numpy.zeros((INITIAL_TRAIN_CAPACITY, INITIAL_CARS_CAPACITY))
+        # row of current train route in the map trail points table, see TrailPointsV2Table
+        self.route_index = numpy.zeros(INITIAL_TRAIN_CAPACITY, dtype=int)
+        self.speed_state = numpy.zeros(INITIAL_TRAIN_CAPACITY, dtype=numpy.int8)
+        self.speed_state_time = numpy.zeros(INITIAL_TRAIN_CAPACITY)
+        self.stop_point = numpy.zeros(INITIAL_TRAIN_CAPACITY)
+        self.destination_point = numpy.zeros(INITIAL_TRAIN_CAPACITY)
+        self.is_moving = numpy.zeros(INITIAL_TRAIN_CAPACITY, dtype=bool)
+
+    def on_add_train(self, train):
+        if None not in self.trains:
+            self.on_extend_train_capacity()
+
+        slot = self.trains.index(None)
+        self.trains[slot] = train
+        self.slots[train.train_id] = slot
+        train.train_state_engine = self
+        self.on_load_train_state(train)
+
+    def on_remove_train(self, train):
+        slot = self.slots.pop(train.train_id)
+        self.trains[slot] = None
+        self.is_moving[slot] = False
+        train.train_state_engine = None
+        if train in self.pending_trains:
+            self.pending_trains.remove(train)
+
+    def on_activate_train(self, train):
+        # train starts moving on the next frame, so its state is loaded after current step
+        self.pending_trains.append(train)
+
+    def on_load_train_state(self, train):
+        slot = self.slots[train.train_id]
+        self.on_load_cars_position(train)
+        self.on_update_trail_points(train)
+        self.speed_state[slot] = SPEED_STATES.index(train.speed_state) if train.speed_state in SPEED_STATES else STOP
+        self.speed_state_time[slot] = train.speed_state_time
+        self.stop_point[slot] = train.stop_point
+        self.destination_point[slot] = train.destination_point
+        self.is_moving[slot] = train.state not in BOARDING_STATES
+
+    def on_sync_train_state(self, train):
+        # engine data is copied back to the train model only when the model needs it
+        slot = self.slots[train.train_id]
+        if self.is_moving[slot]:
+            train.cars_position = self.cars_position[slot, :self.cars[slot]].tolist()
+            train.speed_state = SPEED_STATES[self.speed_state[slot]]
+            train.speed_state_time = float(self.speed_state_time[slot])
+
+    def on_update_stop_point(self, train, first_car_stop_point):
+        self.stop_point[self.slots[train.train_id]] = first_car_stop_point
+
+    def on_update_destination_point(self, train, first_car_destination_point):
+        self.destination_point[self.slots[train.train_id]] = first_car_destination_point
+
+    def on_update_trail_points(self, train):
+        # train has no trail points during boarding, it is not moved by engine then
+        if train.trail_points_v2 is not None:
+            self.route_index[self.slots[train.train_id]] = train.trail_points_v2.route_index
+
+    def on_load_cars_position(self, train):
+        slot = self.slots[train.train_id]
+        if len(train.cars_position) > self.cars_position.shape[1]:
+            self.cars_position = numpy.pad(
+                self.cars_position, ((0, 0), (0, len(train.cars_position) - self.cars_position.shape[1]))
+            )
+
+        self.cars[slot] = len(train.cars_position)
+        self.cars_position[slot, :self.cars[slot]] = train.cars_position
+
+    def on_update_time(self, dt, dt_multiplier):
+        # this is vectorized version of TrainModel.on_update_speed_state() for all moving trains at once;
+        # every step is applied in the same order to get exactly the same results
+        slots = numpy.flatnonzero(self.is_moving)
+        if len(slots) > 0:
+            # when train reaches stop point, update state to 'stop', speed and speed_factor_position to 0
+            first_car_position = self.cars_position[slots, 0]
+            distance_to_stop_point = self.stop_point[slots] - first_car_position
+            stop_point_reached = first_car_position >= self.stop_point[slots]
+            self.on_train_move(slots[stop_point_reached], distance_to_stop_point[stop_point_reached])
+            self.speed_state[slots[stop_point_reached]] = STOP
+            self.speed_state_time[slots[stop_point_reached]] = 0.0
+            # when train needs to stop at stop point and distance is less than braking distance,
+            # update state to 'decelerate'
+            k = _get_braking_distances(self.speed_state_time[slots], self.map_id) - distance_to_stop_point
+            braking_required = ~stop_point_reached & (k >= 0)
+            self.speed_state[slots[braking_required]] = DECELERATE
+            for slot, distance in zip(
+                    slots[braking_required & (k > TRAIN_MAXIMUM_SPEED[self.map_id] // 10)].tolist(),
+                    distance_to_stop_point[braking_required & (k > TRAIN_MAXIMUM_SPEED[self.map_id] // 10)].tolist()
+            ):
+                self.speed_state_time[slot] = get_speed_state_time(distance + 0.2, self.map_id)
+
+            # when train needs to stop at stop point and distance is more than braking distance,
+            # update state to 'accelerate' if train is not at maximum speed already
+            acceleration_required = ~stop_point_reached & ~braking_required & (self.speed_state[slots] != MOVE)
+            self.speed_state[slots[acceleration_required]] = ACCELERATE
+            # when train reaches destination point, current train route is complete
+            first_car_position = self.cars_position[slots, 0]
+            destination_point_reached = first_car_position >= self.destination_point[slots]
+            self.on_train_move(
+                slots[destination_point_reached],
+                self.destination_point[slots[destination_point_reached]]
+                - first_car_position[destination_point_reached]
+            )
+            for slot in slots[destination_point_reached].tolist():
+                train = self.trains[slot]
+                self.on_sync_train_state(train)
+                train.on_reach_destination_point()
+                # when boarding is started, train model takes care of its state
+                if train.state in BOARDING_STATES:
+                    self.is_moving[slot] = False
+
+            # update speed depending on speed state
+            slots = slots[self.is_moving[slots]]
+            speed_state = self.speed_state[slots]
+            speed_state_time = self.speed_state_time[slots]
+            # if train has finished acceleration, update state to 'move' (moving at maximum speed)
+            acceleration_finished = (speed_state == ACCELERATE) \
+                & (speed_state_time >= TRAIN_MAXIMUM_SPEED_STATE_TIME[self.map_id])
+            self.speed_state[slots[acceleration_finished]] = MOVE
+            self.speed_state_time[slots[acceleration_finished]] = TRAIN_MAXIMUM_SPEED_STATE_TIME[self.map_id]
+            acceleration = (speed_state == ACCELERATE) & ~acceleration_finished
+            deceleration = speed_state == DECELERATE
+            ds = numpy.zeros(len(slots))
+            ds[acceleration] = _get_distances(
+                speed_state_time[acceleration], speed_state_time[acceleration] + dt * dt_multiplier
+            )
+            ds[speed_state == MOVE] = TRAIN_MAXIMUM_SPEED[self.map_id] * dt * dt_multiplier
+            ds[deceleration] = _get_distances(
+                speed_state_time[deceleration] - dt * dt_multiplier, speed_state_time[deceleration]
+            )
+            self.speed_state_time[slots[acceleration]] += dt * dt_multiplier
+            self.speed_state_time[slots[deceleration]] -= dt * dt_multiplier
+            train_moves = acceleration | deceleration | (speed_state == MOVE)
+            self.on_train_move(slots[train_moves], ds[train_moves])
+
+        for train in self.pending_trains:
+            self.on_load_train_state(train)
+
+        self.pending_trains.clear()
+
+    def on_train_move(self, slots, ds):
+        # padding car slots are moved as well, they are never read
+        self.cars_position[slots] += ds[:, numpy.newaxis]
+        if len(slots) == 0:
+            return
+
+        # cars of all moved trains are positioned in one call, then every train gets its own rows
+        cars = self.cars[slots]
+        cars_position = self.cars_position[slots][
+            numpy.arange(self.cars_position.shape[1]) < cars[:, numpy.newaxis]
+        ]
+        last_car = numpy.cumsum(cars) - 1
+        is_head_tail = numpy.zeros(len(cars_position), dtype=bool)
+        is_head_tail[last_car] = True
+        is_head_tail[last_car - cars + 1] = True
+        car_positions = get_trail_points_v2_table(self.map_id).get_car_positions(
+            numpy.repeat(self.route_index[slots], cars), cars_position, is_head_tail
+        )
+        for slot, train_car_positions, last_car_position in zip(
+                slots.tolist(), numpy.split(car_positions, last_car[:-1] + 1), cars_position[last_car].tolist()
+        ):
+            self.trains[slot].on_update_car_positions(train_car_positions, last_car_position)
+
+    def on_extend_train_capacity(self):
+        capacity = len(self.trains)
+        self.trains.extend([None] * capacity)
+        self.cars = numpy.concatenate((self.cars, numpy.zeros(capacity, dtype=int)))
+        self.cars_position = numpy.concatenate((self.cars_position, numpy.zeros(self.cars_position.shape)))
+        self.route_index = numpy.concatenate((self.route_index, numpy.zeros(capacity, dtype=int)))
+        self.speed_state = numpy.concatenate((self.speed_state, numpy.zeros(capacity, dtype=numpy.int8)))
+        self.speed_state_time = numpy.concatenate((self.speed_state_time, numpy.zeros(capacity)))
+        self.stop_point = numpy.concatenate((self.stop_point, numpy.zeros(capacity)))
+        self.destination_point = numpy.concatenate((self.destination_point, numpy.zeros(capacity)))
+        self.is_moving = numpy.concatenate((self.is_moving, numpy.zeros(capacity, dtype=bool)))
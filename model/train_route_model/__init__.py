@@ -2,8 +2,9 @@ from abc import ABC
 from logging import getLogger
 from typing import final
 
-from database import USER_DB_CURSOR, CONFIG_DB_CURSOR, TrailPointsV2, TRUE, FALSE
+from database import USER_DB_INDEX, CONFIG_DB_INDEX, get_trail_points_v2, TRUE, FALSE
 from model import MapBaseModel, train_has_passed_train_route_section, ENTRY_BASE_ROUTE
+from profiler import profiled
 
 
 class TrainRouteModel(MapBaseModel, ABC):
@@ -14,44 +15,40 @@ class TrainRouteModel(MapBaseModel, ABC):
         )
         self.track = track
         self.train_route = train_route
-        USER_DB_CURSOR.execute(
-            '''SELECT opened, last_opened_by, current_checkpoint, priority, cars FROM train_routes 
-            WHERE track = ? AND train_route = ? AND map_id = ?''', (self.track, self.train_route, self.map_id)
-        )
-        self.opened, self.last_opened_by, self.current_checkpoint, self.priority, self.cars = USER_DB_CURSOR.fetchone()
-        USER_DB_CURSOR.execute(
-            '''SELECT train_route_section_busy_state FROM train_routes 
-            WHERE track = ? AND train_route = ? AND map_id = ?''', (self.track, self.train_route, self.map_id)
-        )
-        self.train_route_section_busy_state = [int(s) for s in USER_DB_CURSOR.fetchone()[0].split(',')]
-        CONFIG_DB_CURSOR.execute(
-            '''SELECT start_point_v2, stop_point_v2, destination_point_v2, checkpoints_v2 FROM train_route_config 
-            WHERE track = ? AND train_route = ? AND map_id = ?''', (self.track, self.train_route, self.map_id)
-        )
-        for i in range(len(fetched_data := list(CONFIG_DB_CURSOR.fetchone()))):
+        self.opened, self.last_opened_by, self.current_checkpoint, self.priority, self.cars, \
+            train_route_section_busy_state = USER_DB_INDEX.get_row(
+                'train_routes', (
+                    'opened', 'last_opened_by', 'current_checkpoint', 'priority', 'cars',
+                    'train_route_section_busy_state'
+                ), track=self.track, train_route=self.train_route, map_id=self.map_id
+            )
+        self.train_route_section_busy_state = [int(s) for s in train_route_section_busy_state.split(',')]
+        fetched_data = list(CONFIG_DB_INDEX.get_row(
+            'train_route_config', ('start_point_v2', 'stop_point_v2', 'destination_point_v2', 'checkpoints_v2'),
+            track=self.track, train_route=self.train_route, map_id=self.map_id
+        ))
+        for i in range(len(fetched_data)):
             if fetched_data[i] is not None:
                 fetched_data[i] = tuple(int(p) for p in fetched_data[i].split(','))
 
         self.start_point_v2, self.stop_point_v2, self.destination_point_v2, self.checkpoints_v2 = fetched_data
-        self.trail_points_v2 = TrailPointsV2(self.map_id, self.track, self.train_route)
-        CONFIG_DB_CURSOR.execute(
-            '''SELECT section_type, track_param_1, track_param_2 FROM train_route_sections 
-            WHERE track = ? and train_route = ? AND map_id = ?''', (self.track, self.train_route, self.map_id)
+        self.trail_points_v2 = get_trail_points_v2(self.map_id, self.track, self.train_route)
+        self.train_route_sections = CONFIG_DB_INDEX.get_rows(
+            'train_route_sections', ('section_type', 'track_param_1', 'track_param_2'),
+            track=self.track, train_route=self.train_route, map_id=self.map_id
         )
-        self.train_route_sections = CONFIG_DB_CURSOR.fetchall()
         self.signal_base_route, self.signal_track = None, None
         if len(self.train_route_sections) > 1:
             self.signal_base_route, self.signal_track = self.train_route_sections[0][:2]
 
-        CONFIG_DB_CURSOR.execute(
-            '''SELECT position_1, position_2 FROM train_route_sections 
-            WHERE track = ? and train_route = ? AND map_id = ?''', (self.track, self.train_route, self.map_id)
+        self.train_route_section_positions = CONFIG_DB_INDEX.get_rows(
+            'train_route_sections', ('position_1', 'position_2'),
+            track=self.track, train_route=self.train_route, map_id=self.map_id
         )
-        self.train_route_section_positions = CONFIG_DB_CURSOR.fetchall()
 
     @final
     def on_save_state(self):
-        USER_DB_CURSOR.execute(
+        return [(
             '''UPDATE train_routes SET opened = ?, last_opened_by = ?, current_checkpoint = ?, priority = ?, cars = ?, 
             train_route_section_busy_state = ? WHERE track = ? AND train_route = ? AND map_id = ?''',
             (
@@ -59,9 +56,10 @@ class TrainRouteModel(MapBaseModel, ABC):
                 ','.join(str(t) for t in self.train_route_section_busy_state),
                 self.track, self.train_route, self.map_id
             )
-        )
+        )]
 
     @final
+    @profiled('train_routes')
     def on_update_time(self, dt):
         super().on_update_time(dt)
         if self.opened and len(self.train_route_sections) > 1:
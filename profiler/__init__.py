@@ -0,0 +1,117 @@
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from functools import wraps
+from json import dump
+from operator import itemgetter
+from os import getpid
+from threading import get_ident, Lock
+from time import perf_counter
+from typing import Final, final
+
+
+def profiled(scope):
+    def _profiled(fn):
+        @wraps(fn)
+        def _measure_time_if_profiler_is_enabled(*args, **kwargs):
+            if not FRAME_PROFILER.is_enabled:
+                return fn(*args, **kwargs)
+
+            start_time = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                FRAME_PROFILER.on_add_scope_time(scope, start_time, perf_counter())
+
+        return _measure_time_if_profiler_is_enabled
+
+    return _profiled
+
+
+# --------------------- CONSTANTS ---------------------
+ROLLING_WINDOW_FRAMES: Final = 60       # number of last frames used to calculate average time for every scope
+MAXIMUM_OVERLAY_SCOPES: Final = 12      # number of the most expensive scopes shown next to FPS label
+MAXIMUM_TRACE_EVENTS: Final = 500000    # number of last scope events kept for trace export
+MICROSECONDS_IN_ONE_SECOND: Final = 1000000
+MILLISECONDS_IN_ONE_SECOND: Final = 1000
+# ------------------- END CONSTANTS -------------------
+
+
+@final
+class FrameProfiler:
+    # Collects time spent in named scopes: app update phases, draw phases, simulation subsystems
+    # and save state writes. Scope time is summed up per frame, rolling average is shown by FPS display,
+    # every scope call is also kept as trace event which can be opened in chrome://tracing or Perfetto.
+    # Profiler is enabled only when FPS display is shown, so it costs one attribute check otherwise.
+    # Scopes are also recorded by save state worker thread, so frame data is changed only under the lock.
+    def __init__(self):
+        self.is_enabled = False
+        self.lock = Lock()
+        self.origin = perf_counter()
+        self.frame_scope_time = defaultdict(float)
+        self.rolling_scope_time = deque(maxlen=ROLLING_WINDOW_FRAMES)
+        self.trace_events = deque(maxlen=MAXIMUM_TRACE_EVENTS)
+
+    def on_activate(self):
+        self.is_enabled = True
+
+    def on_deactivate(self):
+        self.is_enabled = False
+        with self.lock:
+            self.frame_scope_time.clear()
+            self.rolling_scope_time.clear()
+
+    @contextmanager
+    def scope(self, name):
+        start_time = perf_counter()
+        try:
+            yield
+        finally:
+            if self.is_enabled:
+                self.on_add_scope_time(name, start_time, perf_counter())
+
+    def on_add_scope_time(self, scope, start_time, end_time):
+        with self.lock:
+            self.frame_scope_time[scope] += end_time - start_time
+            self.trace_events.append((scope, start_time, end_time, get_ident()))
+
+    def on_frame_end(self):
+        if self.is_enabled:
+            with self.lock:
+                self.rolling_scope_time.append(self.frame_scope_time)
+                self.frame_scope_time = defaultdict(float)
+
+    def get_breakdown(self):
+        # returns list of (scope, average time per frame in milliseconds) for the most expensive scopes
+        total_scope_time = defaultdict(float)
+        for frame_scope_time in self.rolling_scope_time:
+            for scope, scope_time in frame_scope_time.items():
+                total_scope_time[scope] += scope_time
+
+        frames = max(len(self.rolling_scope_time), 1)
+        return sorted(
+            [(scope, t / frames * MILLISECONDS_IN_ONE_SECOND) for scope, t in total_scope_time.items()],
+            key=itemgetter(1), reverse=True
+        )[:MAXIMUM_OVERLAY_SCOPES]
+
+    def on_export_trace(self, file_name):
+        # Chrome trace event format: complete events with timestamps and durations in microseconds
+        pid = getpid()
+        with self.lock:
+            trace_events = list(self.trace_events)
+
+        with open(file_name, 'w') as f:
+            dump(
+                {
+                    'traceEvents': [
+                        {
+                            'name': scope, 'ph': 'X', 'pid': pid, 'tid': tid,
+                            'ts': (start_time - self.origin) * MICROSECONDS_IN_ONE_SECOND,
+                            'dur': (end_time - start_time) * MICROSECONDS_IN_ONE_SECOND
+                        } for scope, start_time, end_time, tid in trace_events
+                    ],
+                    'displayTimeUnit': 'ms'
+                }, f
+            )
+
+
+FRAME_PROFILER = FrameProfiler()
@@ -10,12 +10,16 @@ import pyglet
 from keyring import get_password
 from pyglet import gl
 
-from database import USER_DB_LOCATION, USER_DB_CURSOR, on_commit
+from database import USER_DB_LOCATION, USER_DB_CONNECTION, USER_DB_CURSOR, USER_DB_DIGEST, COMMIT_QUEUE, \
+    SAVE_STATE_WORKER, on_commit
 from exceptions import VideoAdapterNotSupportedError, MonitorNotSupportedError, HackingDetectedError, \
     UpdateIncompatibleError
-from ui import MIN_RESOLUTION_WIDTH, MIN_RESOLUTION_HEIGHT, WINDOW, BATCHES, MAP_CAMERA, MIDI_PLAYER
+from ui import MIN_RESOLUTION_WIDTH, MIN_RESOLUTION_HEIGHT, WINDOW, BATCHES, MAP_CAMERA, MIDI_PLAYER, MOUSE_ROUTER, \
+    UPDATE_SCHEDULER
 from controller.app_controller import AppController
 from rssim import CURRENT_VERSION
+from profiler import FRAME_PROFILER
+from game_loop import SIMULATION_SCHEDULER
 
 
 def video_adapter_is_supported(fn):
@@ -57,14 +61,20 @@ def game_config_was_not_modified(fn):
 
 def player_progress_was_not_modified(fn):
     def _launch_game_if_player_progress_was_not_modified(*args, **kwargs):
-        with open(path.join(USER_DB_LOCATION, 'user.db'), 'rb') as f:
-            data = f.read()[::-1]
-            if sha512(data[::3] + data[1::3] + data[2::3]).hexdigest() \
-                    != get_password(sha512('user_db'.encode('utf-8')).hexdigest(),
-                                    sha512('user_db'.encode('utf-8')).hexdigest()):
-                raise HackingDetectedError
+        user_db_sha512 = get_password(
+            sha512('user_db'.encode('utf-8')).hexdigest(), sha512('user_db'.encode('utf-8')).hexdigest()
+        )
+        if USER_DB_DIGEST.get_hexdigest(USER_DB_CONNECTION) != user_db_sha512:
+            # progress saved by previous game versions is protected with digest of the whole file,
+            # if it matches, the digest is replaced with the new one right away
+            with open(path.join(USER_DB_LOCATION, 'user.db'), 'rb') as f:
+                data = f.read()[::-1]
+                if sha512(data[::3] + data[1::3] + data[2::3]).hexdigest() != user_db_sha512:
+                    raise HackingDetectedError
 
-            fn(*args, **kwargs)
+            on_commit()
+
+        fn(*args, **kwargs)
 
     return _launch_game_if_player_progress_was_not_modified
 
@@ -94,10 +104,21 @@ class Launcher:
     @player_progress_was_not_modified
     def __init__(self):
         def on_app_update(dt):
-            self.app.game.on_update_time(dt)
-            self.app.on_fade_animation_update(dt)
-            self.app.on_update_view()
-            MIDI_PLAYER.play()
+            with FRAME_PROFILER.scope('game.on_update_time'):
+                SIMULATION_SCHEDULER.on_update(self.app.game, dt)
+
+            with FRAME_PROFILER.scope('on_fade_animation_update'):
+                self.app.on_fade_animation_update(dt)
+                UPDATE_SCHEDULER.on_fade_animation_update(dt)
+
+            with FRAME_PROFILER.scope('on_update_view'):
+                UPDATE_SCHEDULER.on_update_view()
+
+            with FRAME_PROFILER.scope('MIDI_PLAYER.play'):
+                MIDI_PLAYER.play()
+
+            with FRAME_PROFILER.scope('COMMIT_QUEUE.on_flush'):
+                COMMIT_QUEUE.on_flush()
 
         self.on_check_for_updates()
         self.logger = getLogger('root')
@@ -108,6 +129,11 @@ class Launcher:
                 current_datetime.time().second, current_datetime.time().microsecond
             ), encoding='utf8'
         )
+        # frame profiler trace is saved next to logs, it can be opened in chrome://tracing or Perfetto
+        self.trace_file_name = 'logs/logs_{0}_{1:0>2}-{2:0>2}-{3:0>2}-{4:0>6}.trace.json'.format(
+            str(current_datetime.date()), current_datetime.time().hour, current_datetime.time().minute,
+            current_datetime.time().second, current_datetime.time().microsecond
+        )
         logs_handler.setFormatter(Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
         self.logger.addHandler(logs_handler)
         self.logger.setLevel(LOG_LEVEL_DEBUG)
@@ -130,19 +156,23 @@ class Launcher:
         def on_draw():
             # clear surface
             WINDOW.clear()
-            for batch in BATCHES:
-                BATCHES[batch].invalidate()
-
             # draw main batch: environment, main map, signals, trains
-            with MAP_CAMERA:
+            with FRAME_PROFILER.scope('main batch'), MAP_CAMERA:
                 BATCHES['main_batch'].draw()
 
             # draw mini map batch: mini map
-            BATCHES['mini_map_batch'].draw()
+            with FRAME_PROFILER.scope('mini map batch'):
+                BATCHES['mini_map_batch'].draw()
+
             # draw all vertices with shaders
-            self.app.on_apply_shaders_and_draw_vertices()
+            with FRAME_PROFILER.scope('shaders'):
+                self.app.on_apply_shaders_and_draw_vertices()
+
             # draw ui batch: text labels, buttons
-            BATCHES['ui_batch'].draw()
+            with FRAME_PROFILER.scope('ui batch'):
+                BATCHES['ui_batch'].draw()
+
+            FRAME_PROFILER.on_frame_end()
             self.on_mouse_motion_event_counter = 0
             self.on_mouse_drag_event_counter = 0
             self.on_mouse_scroll_event_counter = 0
@@ -169,11 +199,13 @@ class Launcher:
 
         @WINDOW.event
         def on_mouse_press(x, y, button, modifiers):
+            MOUSE_ROUTER.on_mouse_press(x, y, button, modifiers)
             for h in self.app.on_mouse_press_handlers:
                 h(x, y, button, modifiers)
 
         @WINDOW.event
         def on_mouse_release(x, y, button, modifiers):
+            MOUSE_ROUTER.on_mouse_release(x, y, button, modifiers)
             for h in self.app.on_mouse_release_handlers:
                 h(x, y, button, modifiers)
 
@@ -184,6 +216,7 @@ class Launcher:
                 dx += self.on_mouse_motion_cached_movement[0]
                 dy += self.on_mouse_motion_cached_movement[1]
                 self.on_mouse_motion_cached_movement = [0, 0]
+                MOUSE_ROUTER.on_mouse_motion(x, y, dx, dy)
                 for h in self.app.on_mouse_motion_handlers:
                     h(x, y, dx, dy)
 
@@ -207,6 +240,7 @@ class Launcher:
 
         @WINDOW.event
         def on_mouse_leave(x, y):
+            MOUSE_ROUTER.on_mouse_leave(x, y)
             for h in self.app.on_mouse_leave_handlers:
                 h(x, y)
 
@@ -243,7 +277,10 @@ class Launcher:
         def on_close():
             self.app.fade_out_animation.on_activate()
             self.app.on_save_state()
+            SAVE_STATE_WORKER.on_wait()
             self.app.on_clear_all_notifications()
+            if len(FRAME_PROFILER.trace_events) > 0:
+                FRAME_PROFILER.on_export_trace(self.trace_file_name)
 
     @staticmethod
     def run():
@@ -0,0 +1,10 @@
+#version 330 core
+in vec2 tex_coords;
+in float opacity;
+uniform sampler2D atlas;
+out vec4 color_frag;
+
+void main() {
+    color_frag = texture(atlas, tex_coords);
+    color_frag.a *= opacity;
+}
\ No newline at end of file
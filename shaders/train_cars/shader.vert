@@ -0,0 +1,29 @@
+#version 330 core
+in vec2 corner;
+in vec4 car;
+in float car_opacity;
+uniform sampler2D atlas;
+uniform vec4 region_tex_coords[128];
+uniform vec2 camera_offset;
+uniform float camera_zoom;
+uniform vec2 screen_resolution;
+out vec2 tex_coords;
+out float opacity;
+
+
+void main() {
+    // car: x, y, rotation in degrees and texture region index, the same as for car sprite
+    vec4 region = region_tex_coords[int(car.w)];
+    vec2 size = round((region.zw - region.xy) * vec2(textureSize(atlas, 0)));
+    // anchor is set to the carriage middle point
+    vec2 anchor = floor(size / 2.0);
+    vec2 position = corner * size - anchor;
+    float r = -radians(car.z);
+    vec2 map_position = vec2(
+        position.x * cos(r) - position.y * sin(r), position.x * sin(r) + position.y * cos(r)
+    ) + car.xy;
+    vec2 screen_position = map_position * camera_zoom - camera_offset;
+    gl_Position = vec4(screen_position / screen_resolution * 2.0 - 1.0, 0.0, 1.0);
+    tex_coords = mix(region.xy, region.zw, corner);
+    opacity = car_opacity / 255.0;
+}
\ No newline at end of file
@@ -0,0 +1,135 @@
+import sys
+from argparse import ArgumentParser
+from os import environ
+from importlib.abc import MetaPathFinder, Loader
+from importlib.machinery import ModuleSpec
+from logging import getLogger
+from random import seed
+from time import perf_counter
+from typing import Final, final
+
+
+@final
+class NullView:
+    # Null adapter for views, sprites, UI objects and fade animations: every attribute is a null object,
+    # every call does nothing, so controllers and models work without a window, audio, speech or notifications
+    is_activated = False
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+
+        return self
+
+    def __call__(self, *args, **kwargs):
+        return self
+
+    def __getitem__(self, item):
+        return self
+
+    def __iter__(self):
+        return iter(())
+
+    def __bool__(self):
+        return False
+
+
+@final
+class NullViewFinder(MetaPathFinder, Loader):
+    # view and ui packages are replaced by modules where every imported name is NullView
+    def find_spec(self, fullname, path, target=None):
+        if fullname.split('.')[0] in NULL_VIEW_PACKAGES:
+            return ModuleSpec(fullname, self, is_package=True)
+
+        return None
+
+    def create_module(self, spec):
+        return None
+
+    def exec_module(self, module):
+        module.__path__ = []
+        module.__getattr__ = _get_null_view_attribute
+
+
+def _get_null_view_attribute(name):
+    if name.startswith('__'):
+        raise AttributeError(name)
+
+    return NullView
+
+
+# --------------------- CONSTANTS ---------------------
+NULL_VIEW_PACKAGES: Final = ('view', 'ui')
+SIMULATION_DT: Final = 1 / 60                   # fixed frame time in seconds, the same as 60 FPS in the game
+SIMULATION_SAVE_FILE: Final = 'db/default.db'   # save file used when RSSIM_HEADLESS_USER_DB is not set
+# ------------------- END CONSTANTS -------------------
+
+if any(name.split('.')[0] in (*NULL_VIEW_PACKAGES, 'database') for name in sys.modules):
+    raise ImportError('simulation package must be imported before database, view and ui packages')
+
+environ.setdefault('RSSIM_HEADLESS_USER_DB', SIMULATION_SAVE_FILE)
+sys.meta_path.insert(0, NullViewFinder())
+
+from database import PASSENGER_MAP, MAP_SWITCHER_STATE_MATRIX, MAP_LOCKED, SECONDS_IN_ONE_HOUR  # noqa: E402
+from database import SAVE_STATE_WORKER, COMMIT_QUEUE  # noqa: E402
+from game_loop import SimulationScheduler  # noqa: E402
+from controller.game_controller import GameController  # noqa: E402
+
+
+@final
+class Simulation:
+    # Headless entry point: the same game controller tree as in the app drives game model, maps, schedulers,
+    # dispatchers, train routes and trains, but views are null adapters. Time is advanced with fixed dt
+    # in the same fixed simulation steps as in the app, but without CPU budget; random generator is seeded,
+    # so runs with the same arguments are deterministic.
+    def __init__(self, random_seed=0, dt=SIMULATION_DT, dt_multiplier=None):
+        self.logger = getLogger('root.simulation')
+        seed(random_seed)
+        self.dt = dt
+        self.scheduler = SimulationScheduler(cpu_budget=None)
+        self.game = GameController(self)
+        # the same is done when player completes onboarding
+        if MAP_SWITCHER_STATE_MATRIX[PASSENGER_MAP][MAP_LOCKED]:
+            self.game.on_unlock_map(PASSENGER_MAP)
+
+        if dt_multiplier is not None:
+            self.game.on_dt_multiplier_update(dt_multiplier)
+
+        self.game.on_resume_game()
+        self.ticks = 0
+
+    def on_update_time(self):
+        self.scheduler.on_update(self.game, self.dt)
+        self.ticks += 1
+
+    def run(self, hours):
+        # returns number of ticks it took to simulate given number of game hours
+        ticks = self.ticks
+        end_time = self.game.model.game_time + hours * SECONDS_IN_ONE_HOUR
+        while self.game.model.game_time < end_time:
+            self.on_update_time()
+
+        return self.ticks - ticks
+
+    def on_apply_settings(self, controller):
+        # settings affect only views, which are null adapters here
+        pass
+
+    def on_save_state(self):
+        SAVE_STATE_WORKER.on_save_state([*COMMIT_QUEUE.on_pop_rows(), *self.game.on_save_state()])
+
+
+def main():
+    parser = ArgumentParser(description='Run headless simulation with fixed dt.')
+    parser.add_argument('--hours', type=int, default=24, help='number of game hours to simulate')
+    parser.add_argument('--dt-multiplier', type=float, default=None, help='game time speed')
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    args = parser.parse_args()
+    simulation = Simulation(random_seed=args.seed, dt_multiplier=args.dt_multiplier)
+    start_time = perf_counter()
+    ticks = simulation.run(args.hours)
+    run_time = perf_counter() - start_time
+    print(f'{args.hours} game hours: {ticks} ticks in {run_time:.3f} s, {ticks / run_time:.1f} ticks per second')
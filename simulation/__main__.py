@@ -0,0 +1,3 @@
+from simulation import main
+
+main()
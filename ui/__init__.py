@@ -1,6 +1,7 @@
 from abc import ABC
 from ctypes import windll
 from inspect import getfullargspec
+from itertools import count
 from typing import Final, final
 
 from pyglet import resource
@@ -56,10 +57,7 @@ def _create_button(cls, parent_object):
     parent_object.ui_objects.append(button_object)
     parent_object.buttons.append(button_object)
     parent_object.fade_out_animation.child_animations.append(button_object.fade_out_animation)
-    parent_object.on_mouse_press_handlers.extend(button_object.on_mouse_press_handlers)
-    parent_object.on_mouse_release_handlers.extend(button_object.on_mouse_release_handlers)
-    parent_object.on_mouse_motion_handlers.extend(button_object.on_mouse_motion_handlers)
-    parent_object.on_mouse_leave_handlers.extend(button_object.on_mouse_leave_handlers)
+    # mouse events are routed to buttons by MOUSE_ROUTER
     parent_object.on_window_resize_handlers.extend(button_object.on_window_resize_handlers)
     return button_object
 
@@ -302,7 +300,9 @@ SCHEDULE_ARRIVAL_TIME_THRESHOLD: Final = [SECONDS_IN_ONE_HOUR, SECONDS_IN_ONE_HO
 
 WINDOW: Final = _create_window()
 WINDOW.flip()
-# large portions of sprites which can be drawn together
+# large portions of sprites which can be drawn together; batch updates its draw list by itself when new group
+# is added, but groups which became empty are removed from it only after batch.invalidate() call,
+# that's why batch is invalidated when vertex lists are deleted and when views fade out, not on every frame
 BATCHES: Final = {
     'main_batch': Batch(),
     'mini_map_batch': Batch(),
@@ -332,9 +332,12 @@ DEFAULT_CURSOR: Final = WINDOW.get_system_mouse_cursor(WINDOW.CURSOR_DEFAULT)
 HOVER: Final = 'hover'
 PRESSED: Final = 'pressed'
 NORMAL: Final = 'normal'
+# hit test spaces: UI buttons are placed in screen coordinates, map buttons are placed in map coordinates
+UI_SPACE: Final = 0
+MAP_SPACE: Final = 1
+HIT_TEST_CELL_SIZE: Final = 64                         # hit test grid cell size in pixels
 
 _car_collections_implemented = [20, 10]
-MAXIMUM_CAR_COLLECTIONS: Final = [20, 10]
 resource.path = ['font', 'img', 'img/textures.zip']
 resource.reindex()
 _atlas = resource.texture('atlas.dds')
@@ -433,9 +436,6 @@ for i in range(len(FREIGHT_BOARDING_LIGHT_IMAGE)):
     FREIGHT_BOARDING_LIGHT_IMAGE[i].anchor_y = FREIGHT_BOARDING_LIGHT_IMAGE[i].height // 2
 
 # signal images
-GREEN_SIGNAL: Final = 'green_signal'
-RED_SIGNAL: Final = 'red_signal'
-WHITE_SIGNAL: Final = 'white_signal'
 GREEN_SIGNAL_IMAGE: Final = _atlas.get_region(3, 4084, 7, 9)
 RED_SIGNAL_IMAGE: Final = _atlas.get_region(16, 4084, 7, 9)
 WHITE_SIGNAL_IMAGE: Final = _atlas.get_region(29, 4084, 7, 9)
@@ -540,13 +540,6 @@ class UIObject(ABC):
     def on_window_resize(self, width, height):
         self.screen_resolution = width, height
 
-    @final
-    def on_fade_animation_update(self, dt):
-        self.fade_in_animation.on_update(dt)
-        self.fade_out_animation.on_update(dt)
-        for o in self.ui_objects:
-            o.on_fade_animation_update(dt)
-
     @final
     def on_update_fade_animation_state(self, new_state):
         self.fade_in_animation.on_update_fade_animation_state(new_state)
@@ -582,3 +575,132 @@ class Viewport:
     @property
     def rectangle(self):
         return self.x1, self.y1, self.x2, self.y1, self.x2, self.y2, self.x1, self.y2
+
+
+@final
+class MouseRouter:
+    # Mouse events are sent only to buttons under the cursor and to buttons which are hovered or pressed,
+    # instead of every button checking the cursor position itself. Active buttons are registered in uniform grids:
+    # UI buttons in screen space, map buttons in map space, so moving the map does not require grid rebuild.
+    # Grids are rebuilt lazily after button is activated, deactivated, resized or moved.
+    def __init__(self):
+        self.buttons = {}
+        self.engaged_buttons = set()
+        self.registration_counter = count()
+        self.grids = ({}, {})
+        self.grids_are_outdated = False
+
+    def on_add_button(self, button):
+        # registration number keeps the order in which buttons received mouse events before
+        self.buttons[button] = next(self.registration_counter)
+        self.grids_are_outdated = True
+
+    def on_remove_button(self, button):
+        self.buttons.pop(button, None)
+        self.engaged_buttons.discard(button)
+        self.grids_are_outdated = True
+
+    def on_invalidate(self):
+        self.grids_are_outdated = True
+
+    def on_rebuild_grids(self):
+        for grid in self.grids:
+            grid.clear()
+
+        for button in self.buttons:
+            space, x1, y1, x2, y2 = button.get_hit_test_rectangle()
+            for cell_x in range(int(x1) // HIT_TEST_CELL_SIZE, int(x2) // HIT_TEST_CELL_SIZE + 1):
+                for cell_y in range(int(y1) // HIT_TEST_CELL_SIZE, int(y2) // HIT_TEST_CELL_SIZE + 1):
+                    self.grids[space].setdefault((cell_x, cell_y), []).append(button)
+
+        self.grids_are_outdated = False
+
+    def get_buttons(self, x, y, include_engaged_buttons=False):
+        # returns buttons which can be under the cursor in registration order, exact check is done by buttons
+        if self.grids_are_outdated:
+            self.on_rebuild_grids()
+
+        map_x, map_y = (x + MAP_CAMERA.offset_x) / MAP_CAMERA.zoom, (y + MAP_CAMERA.offset_y) / MAP_CAMERA.zoom
+        buttons = {
+            *self.grids[UI_SPACE].get((x // HIT_TEST_CELL_SIZE, y // HIT_TEST_CELL_SIZE), ()),
+            *self.grids[MAP_SPACE].get((int(map_x // HIT_TEST_CELL_SIZE), int(map_y // HIT_TEST_CELL_SIZE)), ())
+        }
+        if include_engaged_buttons:
+            buttons.update(self.engaged_buttons)
+
+        return sorted(buttons, key=lambda b: self.buttons.get(b, -1))
+
+    def on_update_engaged_state(self, button):
+        if button.state != NORMAL and button in self.buttons:
+            self.engaged_buttons.add(button)
+        else:
+            self.engaged_buttons.discard(button)
+
+    def on_mouse_motion(self, x, y, dx, dy):
+        for button in self.get_buttons(x, y, include_engaged_buttons=True):
+            button.on_mouse_motion(x, y, dx, dy)
+            self.on_update_engaged_state(button)
+
+    def on_mouse_press(self, x, y, button, modifiers):
+        for b in self.get_buttons(x, y):
+            b.on_mouse_press(x, y, button, modifiers)
+            self.on_update_engaged_state(b)
+
+    def on_mouse_release(self, x, y, button, modifiers):
+        for b in self.get_buttons(x, y, include_engaged_buttons=True):
+            b.on_mouse_release(x, y, button, modifiers)
+            self.on_update_engaged_state(b)
+
+    def on_mouse_leave(self, x, y):
+        for button in sorted(self.engaged_buttons, key=lambda b: self.buttons[b]):
+            button.on_mouse_leave(x, y)
+            self.on_update_engaged_state(button)
+
+
+MOUSE_ROUTER: Final = MouseRouter()
+
+
+@final
+class UpdateScheduler:
+    # Per-frame update pass visits only objects which have something to update: fade animations are registered
+    # while they are active, views are scheduled when their state, position or map camera changes. View which keeps
+    # changing (moving train, speaking narrator, open constructor or schedule) schedules itself again from on_update().
+    # Signals, switches, crossovers and trains are map views: they are scheduled together when map camera moves.
+    def __init__(self):
+        # dictionaries keep the order in which objects were registered
+        self.fade_animations = {}
+        self.views = {}
+        self.map_views = {}
+
+    def on_activate_fade_animation(self, animation):
+        self.fade_animations[animation] = None
+
+    def on_deactivate_fade_animation(self, animation):
+        self.fade_animations.pop(animation, None)
+
+    def on_add_map_view(self, map_id, view):
+        self.map_views.setdefault(map_id, {})[view] = None
+
+    def on_remove_map_view(self, map_id, view):
+        self.map_views.get(map_id, {}).pop(view, None)
+        self.views.pop(view, None)
+
+    def on_schedule_view_update(self, view):
+        self.views[view] = None
+
+    def on_update_map_camera(self, map_id):
+        self.views.update(self.map_views.get(map_id, {}))
+
+    def on_fade_animation_update(self, dt):
+        # animations activated during the pass are updated starting from the next frame
+        for animation in list(self.fade_animations):
+            animation.on_update(dt)
+
+    def on_update_view(self):
+        # views scheduled during the pass are updated on the next frame
+        views, self.views = self.views, {}
+        for view in views:
+            view.on_update()
+
+
+UPDATE_SCHEDULER: Final = UpdateScheduler()
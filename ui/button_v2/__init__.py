@@ -5,7 +5,7 @@ from pyglet.text import Label
 from pyglet.window import mouse
 
 from ui import GROUPS, WHITE_RGB, GREY_RGB, WINDOW, HAND_CURSOR, DEFAULT_CURSOR, window_size_has_changed, BATCHES, \
-    MAP_CAMERA, PRESSED, NORMAL, HOVER, UIObject, is_not_active, is_active
+    MAP_CAMERA, PRESSED, NORMAL, HOVER, UIObject, is_not_active, is_active, MOUSE_ROUTER, UI_SPACE, MAP_SPACE
 
 
 def is_active_or_disabled(f):
@@ -66,10 +66,7 @@ class ButtonV2(UIObject, ABC):
     def __init__(self, logger, parent_viewport):
         super().__init__(logger, parent_viewport)
         self.state = NORMAL
-        self.on_mouse_press_handlers = [self.on_mouse_press]
-        self.on_mouse_release_handlers = [self.on_mouse_release]
-        self.on_mouse_motion_handlers = [self.on_mouse_motion]
-        self.on_mouse_leave_handlers = [self.on_mouse_leave]
+        # mouse events are not added to handler lists, active buttons receive them from MOUSE_ROUTER
         self.x = 0
         self.y = 0
         self.width = 0
@@ -99,6 +96,19 @@ class ButtonV2(UIObject, ABC):
     def on_mouse_motion(self, x, y, dx, dy):
         pass
 
+    def get_hit_test_rectangle(self):
+        return UI_SPACE, self.x, self.y, self.x + self.width, self.y + self.height
+
+    @is_not_active
+    def on_activate(self):
+        super().on_activate()
+        MOUSE_ROUTER.on_add_button(self)
+
+    @is_active
+    def on_deactivate(self):
+        super().on_deactivate()
+        MOUSE_ROUTER.on_remove_button(self)
+
     @final
     @is_active
     @cursor_is_over_the_button
@@ -214,6 +224,7 @@ class UIButtonV2(ButtonV2, ABC):
         if self.opacity <= 0:
             if self.text_label:
                 self.text_label.delete()
+                BATCHES['ui_batch'].invalidate()
                 self.text_label = None
 
         else:
@@ -228,6 +239,7 @@ class UIButtonV2(ButtonV2, ABC):
         self.height = self.get_height()
         self.x = self.get_x()
         self.y = self.get_y()
+        MOUSE_ROUTER.on_invalidate()
         if self.text_label:
             self.text_label.begin_update()
             self.text_label.x = self.x + self.width // 2
@@ -240,6 +252,7 @@ class UIButtonV2(ButtonV2, ABC):
     def on_position_changed(self):
         self.x = self.get_x()
         self.y = self.get_y()
+        MOUSE_ROUTER.on_invalidate()
         if self.text_label:
             self.text_label.begin_update()
             self.text_label.x = self.x + self.width // 2
@@ -274,7 +287,13 @@ class MapButtonV2(ButtonV2, ABC):
                 WINDOW.set_mouse_cursor(DEFAULT_CURSOR)
                 self.on_leave()
 
+    @final
+    def get_hit_test_rectangle(self):
+        # x and y are map coordinates, width and height are scaled with zoom
+        return MAP_SPACE, self.x, self.y, self.x + self.width / MAP_CAMERA.zoom, self.y + self.height / MAP_CAMERA.zoom
+
     @final
     def on_change_scale(self):
         self.width = self.get_width()
         self.height = self.get_height()
+        MOUSE_ROUTER.on_invalidate()
@@ -31,10 +31,6 @@ def shop_buttons(f):
             b.__setattr__('on_hover', on_hover)
             b.__setattr__('on_leave', on_leave)
             args[0].fade_out_animation.child_animations.append(b.fade_out_animation)
-            args[0].on_mouse_press_handlers.extend(b.on_mouse_press_handlers)
-            args[0].on_mouse_release_handlers.extend(b.on_mouse_release_handlers)
-            args[0].on_mouse_motion_handlers.extend(b.on_mouse_motion_handlers)
-            args[0].on_mouse_leave_handlers.extend(b.on_mouse_leave_handlers)
             args[0].on_window_resize_handlers.extend(b.on_window_resize_handlers)
 
     return _shop_buttons
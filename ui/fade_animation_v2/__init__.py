@@ -2,7 +2,7 @@ from abc import ABC, abstractmethod
 from typing import final, Final
 
 from database import USER_DB_CURSOR
-from ui import is_active
+from ui import is_active, UPDATE_SCHEDULER
 
 
 def fade_animation_needed(f):
@@ -29,12 +29,14 @@ class FadeAnimationV2(ABC):
 
     def on_activate(self):
         self.is_activated = True
+        UPDATE_SCHEDULER.on_activate_fade_animation(self)
         for a in self.child_animations:
             a.on_activate()
 
     def on_deactivate(self):
         self.is_activated = False
         self.current_fade_animation_time = 0.0
+        UPDATE_SCHEDULER.on_deactivate_fade_animation(self)
 
     @abstractmethod
     def on_calculate_new_opacity(self):
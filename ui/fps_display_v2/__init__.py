@@ -4,6 +4,8 @@ from pyglet.window import FPSDisplay
 
 from ui import WINDOW, window_size_has_changed, UIObject
 from ui.label_v2.fps_label_v2 import FPSLabelV2
+from ui.label_v2.frame_profiler_label_v2 import FrameProfilerLabelV2
+from profiler import FRAME_PROFILER
 
 
 @final
@@ -12,12 +14,31 @@ class FPSDisplayV2(FPSDisplay, UIObject):
         super(FPSDisplay, self).__init__(WINDOW)
         super(UIObject, self).__init__(logger, parent_viewport)
         self.label = FPSLabelV2(self.logger.getChild('fps_label_v2'), self.viewport)
-        self.on_window_resize_handlers.extend(self.label.on_window_resize_handlers)
-        self.fade_in_animation.child_animations.append(self.label.fade_in_animation)
-        self.fade_out_animation.child_animations.append(self.label.fade_out_animation)
+        # rolling per-scope frame time breakdown is shown under FPS label while FPS display is active
+        self.frame_profiler_label = FrameProfilerLabelV2(self.logger.getChild('frame_profiler_label_v2'), self.viewport)
+        self.on_window_resize_handlers.extend(
+            [*self.label.on_window_resize_handlers, *self.frame_profiler_label.on_window_resize_handlers]
+        )
+        self.fade_in_animation.child_animations.extend(
+            [self.label.fade_in_animation, self.frame_profiler_label.fade_in_animation]
+        )
+        self.fade_out_animation.child_animations.extend(
+            [self.label.fade_out_animation, self.frame_profiler_label.fade_out_animation]
+        )
+
+    def on_activate(self):
+        super().on_activate()
+        FRAME_PROFILER.on_activate()
+
+    def on_deactivate(self):
+        super().on_deactivate()
+        FRAME_PROFILER.on_deactivate()
 
     def set_fps(self, fps):
         self.label.on_fps_update(int(fps))                                                                      # noqa
+        self.frame_profiler_label.on_breakdown_update(                                                          # noqa
+            '\n'.join(f'{scope:<26}{scope_time:>8.3f} ms' for scope, scope_time in FRAME_PROFILER.get_breakdown())
+        )
 
     @window_size_has_changed
     def on_window_resize(self, width, height):
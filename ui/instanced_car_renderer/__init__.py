@@ -0,0 +1,187 @@
+from ctypes import byref, sizeof
+from itertools import chain
+from logging import getLogger
+from typing import Final, final
+
+from numpy import concatenate, zeros, float32
+from pyglet.gl import gl_info, GLuint, GLfloat, GL_ARRAY_BUFFER, GL_STATIC_DRAW, GL_STREAM_DRAW, GL_FLOAT, \
+    GL_TRIANGLES, GL_TRIANGLE_STRIP, GL_TEXTURE0, glGenVertexArrays, glBindVertexArray, glGenBuffers, glBindBuffer, \
+    glBufferData, glVertexAttribDivisor, glDrawArraysInstanced, glActiveTexture, glBindTexture
+from pyglet.gl.lib import GLException, MissingFunctionException
+from pyglet.graphics import OrderedGroup
+from pyshaders import from_files_names, ShaderCompilationError
+
+from database import PASSENGER_MAP, FREIGHT_MAP
+from ui import WINDOW, MAP_CAMERA, BATCHES, GROUPS, PASSENGER_CAR_HEAD_IMAGE, PASSENGER_CAR_MID_IMAGE, \
+    PASSENGER_CAR_TAIL_IMAGE, PASSENGER_BOARDING_LIGHT_IMAGE, FREIGHT_CAR_HEAD_IMAGE, FREIGHT_CAR_MID_IMAGE, \
+    FREIGHT_CAR_TAIL_IMAGE, FREIGHT_BOARDING_LIGHT_IMAGE
+
+# --------------------- CONSTANTS ---------------------
+MAXIMUM_TEXTURE_REGIONS: Final = 128    # size of region table in train cars vertex shader
+CAR_INSTANCE_SIZE: Final = 5            # x, y, rotation, texture region index and opacity of every car
+# ------------------- END CONSTANTS -------------------
+
+
+@final
+class InstancedCarRenderer:
+    # Draws all train cars of one map with one instanced draw call: every visible car is an instance of the same
+    # quad. Trains put x, y, rotation, texture region index and opacity of their visible cars here, and the buffer
+    # is uploaded once per frame if any train has changed. Texture regions of all car images of the map are
+    # uploaded to the shader only once. If OpenGL 3.3 is not available or shader cannot be compiled,
+    # trains draw their cars with pooled sprites instead.
+    def __init__(self, map_id, textures):
+        self.logger = getLogger(f'root.app.game.map.{map_id}.instanced_car_renderer')
+        self.textures = textures
+        self.regions = {}
+        # OpenGL context is required to check if instancing is supported, so it is checked on the first train
+        self.supported = None
+        self.shader = None
+        self.vertex_array = GLuint()
+        self.corner_buffer = GLuint()
+        self.instance_buffer = GLuint()
+        self.instances = 0
+        self.trains = {}
+        self.buffer_is_outdated = False
+        self.group = InstancedCarGroup(order=GROUPS['train'].order, renderer=self)
+        self.vertex_list = None
+
+    def is_supported(self):
+        if self.supported is None:
+            self.supported = self.on_create()
+
+        return self.supported
+
+    def on_create(self):
+        # returns True if train cars can be drawn with instancing
+        if not gl_info.have_version(3, 3):
+            self.logger.info('OpenGL 3.3 is not available, train cars are drawn with sprites')
+            return False
+
+        # all car images are regions of the same atlas with anchor set to the carriage middle point,
+        # shader calculates region size and anchor from texture coordinates
+        if len({t.id for t in self.textures}) > 1 \
+                or any(t.anchor_x != t.width // 2 or t.anchor_y != t.height // 2 for t in self.textures):
+            self.logger.warning('car images cannot be drawn with instancing, train cars are drawn with sprites')
+            return False
+
+        # the same region can be used by more than one car image collection
+        region_tex_coords = {}
+        for texture in self.textures:
+            self.regions[texture] = region_tex_coords.setdefault(
+                (*texture.tex_coords[0:2], *texture.tex_coords[6:8]), len(region_tex_coords)
+            )
+
+        if len(region_tex_coords) > MAXIMUM_TEXTURE_REGIONS:
+            self.logger.warning('too many car images, train cars are drawn with sprites')
+            return False
+
+        try:
+            self.shader = from_files_names('shaders/train_cars/shader.vert', 'shaders/train_cars/shader.frag')
+            self.shader.use()
+            # atlas is bound to texture unit 0 which is the sampler default
+            self.shader.uniforms.region_tex_coords = list(region_tex_coords)
+            glGenVertexArrays(1, byref(self.vertex_array))
+            glBindVertexArray(self.vertex_array)
+            # every car is a triangle strip drawn over the same unit square
+            corners = (GLfloat * 8)(0.0, 0.0, 1.0, 0.0, 0.0, 1.0, 1.0, 1.0)
+            glGenBuffers(1, byref(self.corner_buffer))
+            glBindBuffer(GL_ARRAY_BUFFER, self.corner_buffer)
+            glBufferData(GL_ARRAY_BUFFER, sizeof(corners), corners, GL_STATIC_DRAW)
+            self.shader.attributes.corner.enable()
+            self.shader.attributes.corner.point_to(0, GL_FLOAT, 2)
+            # car attributes advance once per instance instead of once per vertex
+            glGenBuffers(1, byref(self.instance_buffer))
+            glBindBuffer(GL_ARRAY_BUFFER, self.instance_buffer)
+            self.shader.attributes.car.enable()
+            self.shader.attributes.car.point_to(0, GL_FLOAT, 4, stride=CAR_INSTANCE_SIZE * sizeof(GLfloat))
+            glVertexAttribDivisor(self.shader.attributes.car.loc, 1)
+            self.shader.attributes.car_opacity.enable()
+            self.shader.attributes.car_opacity.point_to(
+                4 * sizeof(GLfloat), GL_FLOAT, 1, stride=CAR_INSTANCE_SIZE * sizeof(GLfloat)
+            )
+            glVertexAttribDivisor(self.shader.attributes.car_opacity.loc, 1)
+            glBindVertexArray(0)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+            self.shader.clear()
+        except (ShaderCompilationError, MissingFunctionException, GLException) as e:
+            self.logger.warning(f'instanced rendering is not supported, train cars are drawn with sprites: {e}')
+            return False
+
+        return True
+
+    def on_update_train(self, train, car_instances):
+        # car_instances: (N, 5) float32 array of visible cars, renderer keeps it until the next train update
+        self.trains[train] = car_instances
+        self.buffer_is_outdated = True
+        # batch draws the group only if it has at least one vertex list
+        if not self.vertex_list:
+            self.vertex_list = BATCHES['main_batch'].add(3, GL_TRIANGLES, self.group, ('v2f/static', (0.0, ) * 6))
+
+    def on_remove_train(self, train):
+        if self.trains.pop(train, None) is not None:
+            self.buffer_is_outdated = True
+
+        if len(self.trains) == 0 and self.vertex_list:
+            self.vertex_list.delete()
+            BATCHES['main_batch'].invalidate()
+            self.vertex_list = None
+
+    def on_draw(self):
+        if self.buffer_is_outdated:
+            if len(self.trains) > 0:
+                car_instances = concatenate(list(self.trains.values()))
+            else:
+                car_instances = zeros((0, CAR_INSTANCE_SIZE), dtype=float32)
+
+            self.instances = len(car_instances)
+            glBindBuffer(GL_ARRAY_BUFFER, self.instance_buffer)
+            glBufferData(GL_ARRAY_BUFFER, car_instances.nbytes, car_instances.ctypes.data, GL_STREAM_DRAW)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+            self.buffer_is_outdated = False
+
+        if self.instances == 0:
+            return
+
+        self.shader.use()
+        self.shader.uniforms.camera_offset = (MAP_CAMERA.offset_x, MAP_CAMERA.offset_y)
+        self.shader.uniforms.camera_zoom = MAP_CAMERA.zoom
+        self.shader.uniforms.screen_resolution = (WINDOW.width, WINDOW.height)
+        glActiveTexture(GL_TEXTURE0)
+        glBindTexture(self.textures[0].target, self.textures[0].id)
+        glBindVertexArray(self.vertex_array)
+        glDrawArraysInstanced(GL_TRIANGLE_STRIP, 0, 4, self.instances)
+        glBindVertexArray(0)
+        self.shader.clear()
+
+
+@final
+class InstancedCarGroup(OrderedGroup):
+    # cars are drawn when main batch reaches train layer, placeholder vertex list is a degenerate triangle
+    def __init__(self, order, renderer):
+        super().__init__(order)
+        self.renderer = renderer
+
+    def __eq__(self, other):
+        return self.__class__ is other.__class__ and self.order == other.order and self.renderer == other.renderer
+
+    def __hash__(self):
+        return hash((self.order, id(self.renderer)))
+
+    def set_state(self):
+        self.renderer.on_draw()
+
+
+INSTANCED_CAR_RENDERERS: Final = {
+    PASSENGER_MAP: InstancedCarRenderer(
+        PASSENGER_MAP, [
+            *chain(*PASSENGER_CAR_HEAD_IMAGE), *PASSENGER_CAR_MID_IMAGE, *chain(*PASSENGER_CAR_TAIL_IMAGE),
+            *PASSENGER_BOARDING_LIGHT_IMAGE
+        ]
+    ),
+    FREIGHT_MAP: InstancedCarRenderer(
+        FREIGHT_MAP, [
+            *chain(*FREIGHT_CAR_HEAD_IMAGE), *FREIGHT_CAR_MID_IMAGE, *chain(*FREIGHT_CAR_TAIL_IMAGE),
+            *FREIGHT_BOARDING_LIGHT_IMAGE
+        ]
+    )
+}
@@ -107,6 +107,7 @@ class KnobV2(UIObject, ABC):
                 self.circle.colors = self.circle_colors
             else:
                 self.circle.delete()
+                BATCHES['ui_batch'].invalidate()
                 self.circle = None
 
     @final
@@ -169,6 +169,7 @@ class LabelV2(UIObject, ABC):
                 self.text_label.color = (*self.base_color, self.opacity)
             else:
                 self.text_label.delete()
+                self.batch.invalidate()
                 self.text_label = None
 
     @final
@@ -263,6 +264,7 @@ class InteractiveLabelV2(UIObject, ABC):
                 self.text_label.color = (*self.base_color, self.opacity)
             else:
                 self.text_label.delete()
+                self.batch.invalidate()
                 self.text_label = None
 
         if self.placeholder_label:
@@ -270,6 +272,7 @@ class InteractiveLabelV2(UIObject, ABC):
                 self.placeholder_label.color = (*self.placeholder_color, self.opacity)
             else:
                 self.placeholder_label.delete()
+                self.batch.invalidate()
                 self.placeholder_label = None
 
     @final
@@ -294,6 +297,7 @@ class InteractiveLabelV2(UIObject, ABC):
     def on_text(self, text):
         if not self.text_label:
             self.placeholder_label.delete()
+            self.batch.invalidate()
             self.placeholder_label = None
             self.text_label = PygletLabel(
                 text[:self.text_length_limit], font_name=self.font_name, bold=self.bold, font_size=self.get_font_size(),
@@ -311,6 +315,7 @@ class InteractiveLabelV2(UIObject, ABC):
                 self.text_label.text = self.text_label.text[:-1]
             else:
                 self.text_label.delete()
+                self.batch.invalidate()
                 self.text_label = None
                 self.placeholder_label = PygletLabel(
                     self.get_formatted_text(), font_name=self.font_name, bold=self.bold, font_size=self.get_font_size(),
@@ -0,0 +1,33 @@
+from typing import final
+
+from ui import WHITE_RGB, get_top_bar_height
+from ui.label_v2 import LabelV2, argument
+
+
+@final
+class FrameProfilerLabelV2(LabelV2):
+    @argument('breakdown')
+    def __init__(self, logger, parent_viewport):
+        super().__init__(logger, parent_viewport)
+        self.font_name = 'Courier New'
+        self.base_color = WHITE_RGB
+        self.anchor_x = 'right'
+        self.anchor_y = 'top'
+        self.align = 'right'
+        self.multiline = True
+
+    def get_x(self):
+        return self.parent_viewport.x2 - get_top_bar_height(self.screen_resolution) * 3 \
+               - get_top_bar_height(self.screen_resolution) // 4
+
+    def get_y(self):
+        return self.parent_viewport.y2 - get_top_bar_height(self.screen_resolution)
+
+    def get_font_size(self):
+        return int(12 / 40 * get_top_bar_height(self.screen_resolution))
+
+    def get_width(self):
+        return get_top_bar_height(self.screen_resolution) * 8
+
+    def get_formatted_text(self):
+        return '{0}'.format(*self.arguments)
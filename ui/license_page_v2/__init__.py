@@ -75,6 +75,7 @@ class LicensePageV2(UIObject, ABC):
         super().on_update_opacity(new_opacity)
         if self.opacity <= 0:
             self.license_layout.delete()
+            BATCHES['ui_batch'].invalidate()
             self.license_layout = None
         elif self.document:
             self.document.set_style(
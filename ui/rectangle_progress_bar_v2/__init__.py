@@ -76,10 +76,12 @@ class RectangleProgressBarV2(UIObject, ABC):
         if self.opacity <= 0:
             if self.inactive_sprite:
                 self.inactive_sprite.delete()
+                BATCHES['ui_batch'].invalidate()
                 self.inactive_sprite = None
 
             if self.active_sprite:
                 self.active_sprite.delete()
+                BATCHES['ui_batch'].invalidate()
                 self.active_sprite = None
         else:
             if self.inactive_sprite:
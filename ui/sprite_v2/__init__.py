@@ -35,6 +35,7 @@ class SpriteV2(UIObject, ABC):
                 self.sprite.opacity = self.opacity
             else:
                 self.sprite.delete()
+                self.batch.invalidate()
                 self.sprite = None
 
     @final
@@ -64,6 +65,7 @@ class MapSpriteV2(SpriteV2, ABC):
             self.sprite.rotation = self.rotation
         elif self.is_located_outside_viewport() and self.sprite:
             self.sprite.delete()
+            self.batch.invalidate()
             self.sprite = None
 
     @final
@@ -131,3 +133,53 @@ class UISpriteV2(SpriteV2, ABC):
     @is_active
     def on_position_update(self):
         self.sprite.update(x=self.get_x(), y=self.get_y())
+
+
+@final
+class MapSpritePool:
+    # Pyglet sprites for train cars and boarding lights are not deleted when car leaves the screen or train departs:
+    # sprite is hidden and kept in its batch, next car which appears on the screen takes it with its vertex list.
+    # All car textures are atlas regions, so texture change does not move vertex list to another group.
+    # Visible map rectangle is calculated only when map camera moves, cars are checked against it all at once.
+    def __init__(self):
+        self.free_sprites = {}
+        self.camera_rectangle = (0.0, 0.0, 0.0, 0.0)
+
+    def on_update_camera_rectangle(self, viewport):
+        # sprite is considered visible if it is close enough to the viewport edge, the same as in MapSpriteV2
+        self.camera_rectangle = (
+            (MAP_CAMERA.offset_x + viewport.x1) / MAP_CAMERA.zoom - SPRITE_VIEWPORT_EDGE_OFFSET_LIMIT_X,
+            (MAP_CAMERA.offset_y + viewport.y1) / MAP_CAMERA.zoom - SPRITE_VIEWPORT_EDGE_OFFSET_LIMIT_Y,
+            (MAP_CAMERA.offset_x + viewport.x2) / MAP_CAMERA.zoom + SPRITE_VIEWPORT_EDGE_OFFSET_LIMIT_X,
+            (MAP_CAMERA.offset_y + viewport.y2) / MAP_CAMERA.zoom + SPRITE_VIEWPORT_EDGE_OFFSET_LIMIT_Y
+        )
+
+    def get_visibility_mask(self, positions, extents):
+        # positions: (N, 3) array of x, y and rotation, extents: (N, 4) array of texture width and height
+        # to the left, to the bottom, to the right and to the top of texture anchor
+        x1, y1, x2, y2 = self.camera_rectangle
+        return (positions[:, 0] - extents[:, 0] <= x2) & (positions[:, 0] + extents[:, 2] >= x1) \
+            & (positions[:, 1] - extents[:, 1] <= y2) & (positions[:, 1] + extents[:, 3] >= y1)
+
+    def on_acquire(self, texture, batch, group, x, y, rotation, opacity):
+        free_sprites = self.free_sprites.get((batch, group))
+        if not free_sprites:
+            sprite = PygletSprite(texture, x=x, y=y, batch=batch, group=group, usage='stream', subpixel=True)
+            sprite.rotation = rotation
+            sprite.opacity = opacity
+            return sprite
+
+        sprite = free_sprites.pop()
+        sprite.image = texture
+        # hidden sprite does not calculate its vertices, so they are calculated only once when it is shown
+        sprite.update(x=x, y=y, rotation=rotation)
+        sprite.opacity = opacity
+        sprite.visible = True
+        return sprite
+
+    def on_release(self, sprite):
+        sprite.visible = False
+        self.free_sprites.setdefault((sprite.batch, sprite.group), []).append(sprite)
+
+
+MAP_SPRITE_POOL: Final = MapSpritePool()
@@ -1,7 +1,7 @@
 from typing import final
 
-from database import CONFIG_DB_CURSOR, USER_DB_CURSOR
-from ui import RED_SIGNAL_IMAGE, GREEN_SIGNAL_IMAGE, GREEN_SIGNAL, GROUPS, BATCHES, WHITE_SIGNAL_IMAGE, WHITE_SIGNAL
+from database import CONFIG_DB_INDEX, USER_DB_INDEX, GREEN_SIGNAL, WHITE_SIGNAL
+from ui import RED_SIGNAL_IMAGE, GREEN_SIGNAL_IMAGE, GROUPS, BATCHES, WHITE_SIGNAL_IMAGE
 
 from ui.sprite_v2 import MapSpriteV2
 
@@ -10,19 +10,14 @@ from ui.sprite_v2 import MapSpriteV2
 class SignalSpriteV2(MapSpriteV2):
     def __init__(self, logger, parent_viewport, map_id, track, base_route):
         super().__init__(logger, parent_viewport, map_id)
-        CONFIG_DB_CURSOR.execute(
-            '''SELECT x, y, rotation FROM signal_config WHERE track = ? AND base_route = ? AND map_id = ?''',
-            (track, base_route, self.map_id)
+        self.x, self.y, self.rotation = CONFIG_DB_INDEX.get_row(
+            'signal_config', ('x', 'y', 'rotation'), track=track, base_route=base_route, map_id=self.map_id
         )
-        self.x, self.y, self.rotation = CONFIG_DB_CURSOR.fetchone()
         self.batch = BATCHES['main_batch']
         self.group = GROUPS['signal']
-        USER_DB_CURSOR.execute(
-            '''SELECT state FROM signals WHERE track = ? AND base_route = ? AND map_id = ?''',
-            (track, base_route, self.map_id)
-        )
+        state = USER_DB_INDEX.get_row('signals', ('state', ), track=track, base_route=base_route, map_id=self.map_id)[0]
         self.texture = RED_SIGNAL_IMAGE
-        if (state := USER_DB_CURSOR.fetchone()[0]) == GREEN_SIGNAL:
+        if state == GREEN_SIGNAL:
             self.texture = GREEN_SIGNAL_IMAGE
         elif state == WHITE_SIGNAL:
             self.texture = WHITE_SIGNAL_IMAGE
@@ -4,7 +4,8 @@ from typing import final, Final
 from pyglet.window import mouse
 
 from database import USER_DB_CURSOR
-from ui import WINDOW, get_inner_area_rect, window_size_has_changed, Viewport, get_top_bar_height, get_bottom_bar_height
+from ui import WINDOW, get_inner_area_rect, window_size_has_changed, Viewport, get_top_bar_height, \
+    get_bottom_bar_height, BATCHES
 
 
 def view_is_active(fn):
@@ -275,6 +276,12 @@ class AppBaseView(ABC):
         for b in self.buttons:
             b.on_update_opacity(self.opacity)
 
+        # sprites and labels are deleted when view fades out completely; batch draw list is rebuilt on the next draw,
+        # so it does not matter that subclasses delete their sprites after this call
+        if self.opacity <= 0:
+            for batch in BATCHES.values():
+                batch.invalidate()
+
     def on_window_activate(self):
         self.game_progress_notifications_enabled = False
         self.game_progress_notifications.clear()
@@ -335,14 +342,7 @@ class AppBaseView(ABC):
             on_key_press_handlers=self.on_key_press_handlers,
             on_text_handlers=self.on_text_handlers
         )
-        # appends button handlers
-        for b in self.buttons:
-            self.controller.on_append_view_handlers(
-                on_mouse_motion_handlers=(b.on_mouse_motion,),
-                on_mouse_press_handlers=(b.on_mouse_press,),
-                on_mouse_release_handlers=(b.on_mouse_release,),
-                on_mouse_leave_handlers=(b.on_mouse_leave,)
-            )
+        # button mouse events are routed by MOUSE_ROUTER, not by controller handler lists
 
     @final
     def on_detach_view_handlers(self):
@@ -357,14 +357,6 @@ class AppBaseView(ABC):
             on_key_press_handlers=self.on_key_press_handlers,
             on_text_handlers=self.on_text_handlers
         )
-        # detaches button handlers
-        for b in self.buttons:
-            self.controller.on_detach_view_handlers(
-                on_mouse_motion_handlers=(b.on_mouse_motion,),
-                on_mouse_press_handlers=(b.on_mouse_press,),
-                on_mouse_release_handlers=(b.on_mouse_release,),
-                on_mouse_leave_handlers=(b.on_mouse_leave,)
-            )
 
     @final
     def on_append_window_handlers(self):
@@ -436,6 +428,16 @@ class GameBaseView(AppBaseView, ABC):
     def on_dt_multiplier_update(self, dt_multiplier):
         self.dt_multiplier = dt_multiplier
 
+    @final
+    def on_update_game_state(self, game_model):
+        self.game_time, self.game_time_fraction, self.dt_multiplier \
+            = game_model.game_time, game_model.game_time_fraction, game_model.dt_multiplier
+        self.level = game_model.level
+        self.exp_bonus_multiplier, self.money_bonus_multiplier, self.construction_speed_bonus_multiplier \
+            = game_model.exp_bonus_multiplier, game_model.money_bonus_multiplier, \
+            game_model.construction_speed_bonus_multiplier
+        self.on_update_money(game_model.money)
+
 
 class MapBaseView(GameBaseView, ABC):
     def __init__(self, controller, map_id, logger, child_window=False):
@@ -4,6 +4,7 @@ from typing import final
 
 from database import CONSTRUCTOR_VIEW_ENVIRONMENT_CELLS, ENVIRONMENT, CONSTRUCTION_STATE_MATRIX, \
     CONSTRUCTOR_VIEW_TRACK_CELLS, TRACKS, USER_DB_CURSOR, PRICE, TRUE, FALSE
+from ui import UPDATE_SCHEDULER
 from ui.constructor_placeholder_container.constructor_environment_placeholder_container import \
     ConstructorEnvironmentPlaceholderContainer
 from ui.constructor_placeholder_container.constructor_track_placeholder_container import \
@@ -107,6 +108,8 @@ class ConstructorView(MapBaseView, ABC):
         if len(CONSTRUCTION_STATE_MATRIX[self.map_id][ENVIRONMENT]) < CONSTRUCTOR_VIEW_ENVIRONMENT_CELLS:
             self.constructor_environment_placeholder_container.on_activate()
 
+        UPDATE_SCHEDULER.on_schedule_view_update(self)
+
     @final
     @view_is_active
     def on_deactivate(self):
@@ -122,6 +125,7 @@ class ConstructorView(MapBaseView, ABC):
     @final
     @view_is_active
     def on_update(self):
+        # constructor cells are activated one per frame, view is updated again until all cells are activated
         remaining_tracks = sorted(list(CONSTRUCTION_STATE_MATRIX[self.map_id][TRACKS].keys()))
         for j in range(min(len(remaining_tracks), CONSTRUCTOR_VIEW_TRACK_CELLS)):
             if not self.constructor_cells[TRACKS][j].is_activated:
@@ -134,12 +138,14 @@ class ConstructorView(MapBaseView, ABC):
                 else:
                     self.constructor_cells[TRACKS][j].on_deactivate_money_target()
 
+                UPDATE_SCHEDULER.on_schedule_view_update(self)
                 return
 
         for j in range(len(remaining_tracks), CONSTRUCTOR_VIEW_TRACK_CELLS):
             if not self.constructor_cells[TRACKS][j].is_activated:
                 self.constructor_cells[TRACKS][j].on_activate()
                 self.constructor_cells[TRACKS][j].on_assign_new_data(0, [])
+                UPDATE_SCHEDULER.on_schedule_view_update(self)
                 return
 
         remaining_tiers = sorted(list(CONSTRUCTION_STATE_MATRIX[self.map_id][ENVIRONMENT].keys()))
@@ -154,12 +160,14 @@ class ConstructorView(MapBaseView, ABC):
                 else:
                     self.constructor_cells[ENVIRONMENT][j].on_deactivate_money_target()
 
+                UPDATE_SCHEDULER.on_schedule_view_update(self)
                 return
 
         for j in range(len(remaining_tiers), CONSTRUCTOR_VIEW_ENVIRONMENT_CELLS):
             if not self.constructor_cells[ENVIRONMENT][j].is_activated:
                 self.constructor_cells[ENVIRONMENT][j].on_activate()
                 self.constructor_cells[ENVIRONMENT][j].on_assign_new_data(0, [])
+                UPDATE_SCHEDULER.on_schedule_view_update(self)
                 return
 
     @final
@@ -2,8 +2,8 @@ from abc import ABC
 from logging import getLogger
 from typing import final
 
-from database import USER_DB_CURSOR, CONFIG_DB_CURSOR
-from ui import SWITCHES_STRAIGHT, SWITCHES_DIVERGING
+from database import USER_DB_INDEX, CONFIG_DB_INDEX
+from ui import SWITCHES_STRAIGHT, SWITCHES_DIVERGING, UPDATE_SCHEDULER
 
 from ui.sprite.crossover_sprite import CrossoverSprite
 from view import MapBaseView, view_is_not_active
@@ -17,18 +17,16 @@ class CrossoverView(MapBaseView, ABC):
             )
         )
         self.track_param_1, self.track_param_2, self.crossover_type = track_param_1, track_param_2, crossover_type
-        CONFIG_DB_CURSOR.execute(
-            '''SELECT region_x, region_y, region_w, region_h FROM crossovers_config
-            WHERE track_param_1 = ? AND track_param_2 = ? AND crossover_type = ? AND map_id = ?''',
-            (self.track_param_1, self.track_param_2, self.crossover_type, self.map_id)
+        self.crossover_region = CONFIG_DB_INDEX.get_row(
+            'crossovers_config', ('region_x', 'region_y', 'region_w', 'region_h'),
+            track_param_1=self.track_param_1, track_param_2=self.track_param_2, crossover_type=self.crossover_type,
+            map_id=self.map_id
         )
-        self.crossover_region = CONFIG_DB_CURSOR.fetchone()
-        USER_DB_CURSOR.execute(
-            '''SELECT current_position_1, current_position_2 FROM crossovers 
-            WHERE track_param_1 = ? AND track_param_2 = ? AND crossover_type = ? AND map_id = ?''',
-            (self.track_param_1, self.track_param_2, self.crossover_type, self.map_id)
+        self.current_position_1, self.current_position_2, self.locked = USER_DB_INDEX.get_row(
+            'crossovers', ('current_position_1', 'current_position_2', 'locked'),
+            track_param_1=self.track_param_1, track_param_2=self.track_param_2, crossover_type=self.crossover_type,
+            map_id=self.map_id
         )
-        self.current_position_1, self.current_position_2 = USER_DB_CURSOR.fetchone()
         self.images = {
             self.track_param_1: {
                 self.track_param_1: SWITCHES_STRAIGHT.get_region(*self.crossover_region),
@@ -39,17 +37,13 @@ class CrossoverView(MapBaseView, ABC):
                 self.track_param_2: SWITCHES_STRAIGHT.get_region(*self.crossover_region)
             }
         }
-        USER_DB_CURSOR.execute(
-            '''SELECT locked FROM crossovers 
-            WHERE track_param_1 = ? AND track_param_2 = ? AND crossover_type = ? AND map_id = ?''',
-            (self.track_param_1, self.track_param_2, self.crossover_type, self.map_id)
-        )
-        self.locked = USER_DB_CURSOR.fetchone()[0]
         self.sprite = CrossoverSprite(
             self.map_id, self.track_param_1, self.track_param_2, self.crossover_type, parent_viewport=self.viewport
         )
         self.sprite.on_update_texture(self.images[self.current_position_1][self.current_position_2])
         self.on_append_window_handlers()
+        # sprite is created or deleted when map camera moves
+        UPDATE_SCHEDULER.on_add_map_view(self.map_id, self)
 
     @final
     @view_is_not_active
@@ -2,7 +2,7 @@ from logging import getLogger
 from typing import final
 
 from database import CONFIG_DB_CURSOR, MINUTES_IN_ONE_HOUR, SECONDS_IN_ONE_MINUTE, HOURS_IN_ONE_DAY, \
-    SECONDS_IN_ONE_HOUR, USER_DB_CURSOR, on_commit
+    SECONDS_IN_ONE_HOUR, USER_DB_CURSOR, COMMIT_QUEUE
 from notifications.voice_not_found_notification import VoiceNotFoundNotification
 from ui import SPEAKER, MIDI_PLAYER
 from ui.knob.time_speed_knob import TimeSpeedKnob
@@ -48,8 +48,7 @@ class GameView(GameBaseView):
 
         def on_time_speed_update(dt_multiplier):
             self.controller.on_dt_multiplier_update(dt_multiplier)
-            USER_DB_CURSOR.execute('''UPDATE epoch_timestamp SET dt_multiplier = ?''', (dt_multiplier,))
-            on_commit()
+            COMMIT_QUEUE.on_add_row('''UPDATE epoch_timestamp SET dt_multiplier = ?''', (dt_multiplier,))
 
         super().__init__(controller, logger=getLogger('root.app.game.view'))
         self.game_paused = True
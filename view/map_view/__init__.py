@@ -5,13 +5,14 @@ from typing import final
 
 from database import CONFIG_DB_CURSOR, USER_DB_CURSOR
 from ui import MAP_CAMERA, get_top_bar_height, MAP_HEIGHT, MAP_WIDTH, MAP_ZOOM_STEP, get_bottom_bar_height, \
-    window_size_has_changed
+    window_size_has_changed, UPDATE_SCHEDULER
 from ui.button.open_schedule_button import OpenScheduleButton
 from ui.button.open_constructor_button import OpenConstructorButton
 from ui.button.open_shop_details_button import OpenShopDetailsButton
 from ui.shader_sprite.map_view_shader_sprite import MapViewShaderSprite
 from ui.sprite.main_map_sprite import MainMapSprite
 from ui.sprite.main_environment_sprite import MainEnvironmentSprite
+from ui.sprite_v2 import MAP_SPRITE_POOL
 from view import map_move_mode_available, cursor_is_on_the_map, map_move_mode_enabled, MINI_MAP_FADE_OUT_TIMER, \
     MapBaseView, view_is_not_active, view_is_active, left_mouse_button
 
@@ -109,6 +110,8 @@ class MapView(MapBaseView, ABC):
         self.on_activate_shop_buttons()
         MAP_CAMERA.position = -self.base_offset[0], -self.base_offset[1]
         MAP_CAMERA.zoom = self.zoom
+        MAP_SPRITE_POOL.on_update_camera_rectangle(self.viewport)
+        UPDATE_SCHEDULER.on_update_map_camera(self.map_id)
 
     @final
     def on_update(self):
@@ -117,6 +120,10 @@ class MapView(MapBaseView, ABC):
             self.controller.on_deactivate_mini_map()
             self.is_mini_map_timer_activated = False
 
+        # mini-map timer is checked on every frame until mini-map fades out
+        if self.is_mini_map_timer_activated:
+            UPDATE_SCHEDULER.on_schedule_view_update(self)
+
     @final
     @window_size_has_changed
     def on_window_resize(self, width, height):
@@ -174,6 +181,7 @@ class MapView(MapBaseView, ABC):
         self.mini_map_timer = perf_counter()
         self.is_mini_map_timer_activated = True
         self.controller.on_save_and_commit_last_known_base_offset()
+        UPDATE_SCHEDULER.on_schedule_view_update(self)
 
     @final
     @view_is_active
@@ -197,6 +205,7 @@ class MapView(MapBaseView, ABC):
         self.controller.on_save_and_commit_last_known_zoom()
         self.map_move_mode = False
         self.mini_map_timer = perf_counter()
+        UPDATE_SCHEDULER.on_schedule_view_update(self)
 
     @final
     def check_base_offset_limits(self):
@@ -214,6 +223,8 @@ class MapView(MapBaseView, ABC):
 
         if self.is_activated:
             MAP_CAMERA.position = -self.base_offset[0], -self.base_offset[1]
+            MAP_SPRITE_POOL.on_update_camera_rectangle(self.viewport)
+            UPDATE_SCHEDULER.on_update_map_camera(self.map_id)
 
     @final
     def on_activate_shop_buttons(self):
@@ -4,10 +4,10 @@ from typing import final
 
 from win32com.universal import com_error
 
-from database import NARRATOR_QUEUE, ANNOUNCEMENT_TIME, ANNOUNCEMENT_LOCKED, get_announcement_types_enabled, \
-    ANNOUNCEMENT_TYPE, USER_DB_CURSOR, TRUE, FALSE
+from database import NARRATOR_QUEUE, ANNOUNCEMENT_TIME, ANNOUNCEMENT_TYPES, get_announcement_types_enabled, \
+    USER_DB_CURSOR, TRUE, FALSE
 from music_track.narrator_intro import NarratorIntro
-from ui import SPEAKER, MIDI_PLAYER
+from ui import SPEAKER, MIDI_PLAYER, UPDATE_SCHEDULER
 from view import MapBaseView, view_is_not_active, view_is_active
 
 
@@ -25,16 +25,13 @@ class NarratorView(MapBaseView, ABC):
     @view_is_not_active
     def on_activate(self):
         super().on_activate()
-        for announcement in [a for a in NARRATOR_QUEUE[self.map_id]
-                             if a[ANNOUNCEMENT_TYPE] in get_announcement_types_enabled(self.dt_multiplier)]:
-            announcement[ANNOUNCEMENT_LOCKED] = FALSE
+        NARRATOR_QUEUE[self.map_id].on_update_lock_state(get_announcement_types_enabled(self.dt_multiplier), FALSE)
 
     @final
     @view_is_active
     def on_deactivate(self):
         super().on_deactivate()
-        for announcement in NARRATOR_QUEUE[self.map_id]:
-            announcement[ANNOUNCEMENT_LOCKED] = TRUE
+        NARRATOR_QUEUE[self.map_id].on_update_lock_state(ANNOUNCEMENT_TYPES, TRUE)
 
     @final
     def on_update(self):
@@ -42,6 +39,10 @@ class NarratorView(MapBaseView, ABC):
             self.is_speaking = False
             self.is_playing_announcement = False
 
+        # speaker is polled only while announcement is being played
+        if self.is_speaking:
+            UPDATE_SCHEDULER.on_schedule_view_update(self)
+
     @final
     def on_update_opacity(self, new_opacity):
         super().on_update_opacity(new_opacity)
@@ -57,7 +58,7 @@ class NarratorView(MapBaseView, ABC):
         if len(NARRATOR_QUEUE[self.map_id]) > 0:
             # self.logger.debug(f'{self.game_time=}')
             # self.logger.debug(f'{NARRATOR_QUEUE[self.map_id]=}')
-            if self.game_time >= NARRATOR_QUEUE[self.map_id][0][ANNOUNCEMENT_TIME] \
+            if self.game_time >= NARRATOR_QUEUE[self.map_id].get_first_announcement()[ANNOUNCEMENT_TIME] \
                     and not self.is_playing_announcement and self.announcements_enabled:
                 try:
                     SPEAKER.find_voice(self.current_locale)
@@ -67,19 +68,19 @@ class NarratorView(MapBaseView, ABC):
                         MIDI_PLAYER.add_narrator_intro(NarratorIntro())
 
                 except com_error:
-                    NARRATOR_QUEUE[self.map_id].pop(0)
+                    NARRATOR_QUEUE[self.map_id].on_pop_first_announcement()
                     self.controller.parent_controller.parent_controller.on_send_voice_not_found_notification()
 
             if self.game_time >= self.playback_start_time + self.dt_multiplier * 1.2 and self.is_playing_announcement \
                     and not self.is_speaking:
-                self.on_announcement_play(NARRATOR_QUEUE[self.map_id][0])
-                NARRATOR_QUEUE[self.map_id].pop(0)
+                self.on_announcement_play(NARRATOR_QUEUE[self.map_id].on_pop_first_announcement())
 
     @final
     @view_is_active
     def on_announcement_play(self, announcement):
         SPEAKER.on_announcement_play(announcement, self.current_locale)
         self.is_speaking = True
+        UPDATE_SCHEDULER.on_schedule_view_update(self)
 
     @final
     def on_update_announcements_state(self, new_state):
@@ -2,8 +2,8 @@ from abc import ABC
 from logging import getLogger
 from typing import final
 
-from database import USER_DB_CURSOR, CONFIG_DB_CURSOR
-from ui import SWITCHES_DIVERGING, SWITCHES_STRAIGHT
+from database import USER_DB_INDEX, CONFIG_DB_INDEX
+from ui import SWITCHES_DIVERGING, SWITCHES_STRAIGHT, UPDATE_SCHEDULER
 
 from ui.sprite.railroad_switch_sprite import RailroadSwitchSprite
 from view import MapBaseView, view_is_not_active
@@ -17,33 +17,27 @@ class RailroadSwitchView(MapBaseView, ABC):
             )
         )
         self.track_param_1, self.track_param_2, self.switch_type = track_param_1, track_param_2, switch_type
-        CONFIG_DB_CURSOR.execute(
-            '''SELECT region_x, region_y, region_w, region_h FROM switches_config
-            WHERE track_param_1 = ? AND track_param_2 = ? AND switch_type = ? AND map_id = ?''',
-            (self.track_param_1, self.track_param_2, self.switch_type, self.map_id)
+        self.switch_region = CONFIG_DB_INDEX.get_row(
+            'switches_config', ('region_x', 'region_y', 'region_w', 'region_h'),
+            track_param_1=self.track_param_1, track_param_2=self.track_param_2, switch_type=self.switch_type,
+            map_id=self.map_id
         )
-        self.switch_region = CONFIG_DB_CURSOR.fetchone()
-        USER_DB_CURSOR.execute(
-            '''SELECT current_position FROM switches 
-            WHERE track_param_1 = ? AND track_param_2 = ? AND switch_type = ? AND map_id = ?''',
-            (self.track_param_1, self.track_param_2, self.switch_type, self.map_id)
+        self.current_position, self.locked = USER_DB_INDEX.get_row(
+            'switches', ('current_position', 'locked'),
+            track_param_1=self.track_param_1, track_param_2=self.track_param_2, switch_type=self.switch_type,
+            map_id=self.map_id
         )
-        self.current_position = USER_DB_CURSOR.fetchone()[0]
         self.images = {
             self.track_param_1: SWITCHES_STRAIGHT.get_region(*self.switch_region),
             self.track_param_2: SWITCHES_DIVERGING.get_region(*self.switch_region)
         }
-        USER_DB_CURSOR.execute(
-            '''SELECT locked FROM switches 
-            WHERE track_param_1 = ? AND track_param_2 = ? AND switch_type = ? AND map_id = ?''',
-            (self.track_param_1, self.track_param_2, self.switch_type, self.map_id)
-        )
-        self.locked = USER_DB_CURSOR.fetchone()[0]
         self.sprite = RailroadSwitchSprite(
             self.map_id, self.track_param_1, self.track_param_2, self.switch_type, parent_viewport=self.viewport
         )
         self.sprite.on_update_texture(self.images[self.current_position])
         self.on_append_window_handlers()
+        # sprite is created or deleted when map camera moves
+        UPDATE_SCHEDULER.on_add_map_view(self.map_id, self)
 
     @final
     @view_is_not_active
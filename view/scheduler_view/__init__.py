@@ -3,7 +3,7 @@ from logging import getLogger
 from typing import final
 
 from database import BASE_SCHEDULE, ARRIVAL_TIME
-from ui import SCHEDULE_COLUMNS, SCHEDULE_ROWS, SCHEDULE_ARRIVAL_TIME_THRESHOLD
+from ui import SCHEDULE_COLUMNS, SCHEDULE_ROWS, SCHEDULE_ARRIVAL_TIME_THRESHOLD, UPDATE_SCHEDULER
 
 from ui.schedule_row import ScheduleRow
 from ui.button.close_schedule_button import CloseScheduleButton
@@ -53,6 +53,7 @@ class SchedulerView(MapBaseView, ABC):
         self.shader_sprite.create()
         self.left_schedule_caption_label.create()
         self.right_schedule_caption_label.create()
+        UPDATE_SCHEDULER.on_schedule_view_update(self)
 
     @final
     @view_is_active
@@ -65,6 +66,8 @@ class SchedulerView(MapBaseView, ABC):
     @final
     @view_is_active
     def on_update(self):
+        # schedule rows depend on game time, so view is updated on every frame while schedule is open
+        UPDATE_SCHEDULER.on_schedule_view_update(self)
         for i in range(min(len(BASE_SCHEDULE[self.map_id]), SCHEDULE_ROWS * SCHEDULE_COLUMNS)):
             if not self.schedule_rows[i // SCHEDULE_ROWS][i % SCHEDULE_ROWS].is_activated \
                     and BASE_SCHEDULE[self.map_id][i][ARRIVAL_TIME] <= self.game_time + self.arrival_time_threshold:
@@ -101,7 +104,9 @@ class SchedulerView(MapBaseView, ABC):
 
     @final
     @view_is_active
-    def on_release_train(self, index):
+    def on_release_train(self, train):
+        # position is found only when schedule screen is open
+        index = BASE_SCHEDULE[self.map_id].get_train_index(train)
         for i in range(index, SCHEDULE_ROWS * SCHEDULE_COLUMNS - 1):
             if self.schedule_rows[(i + 1) // SCHEDULE_ROWS][(i + 1) % SCHEDULE_ROWS].is_activated:
                 self.schedule_rows[i // SCHEDULE_ROWS][i % SCHEDULE_ROWS].on_assign_data(
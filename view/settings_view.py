@@ -2,7 +2,7 @@ from ctypes import windll
 from logging import getLogger
 from typing import final
 
-from database import USER_DB_CURSOR, CONFIG_DB_CURSOR, FALSE, TRUE
+from database import CONFIG_DB_CURSOR, FALSE, TRUE
 from ui.settings.checkbox.announcements_enabled_checkbox import AnnouncementsEnabledCheckbox
 from ui.settings.checkbox_group.malfunction_notifications_checkbox_group import MalfunctionNotificationsCheckboxGroup
 from ui.settings.knob.master_volume_settings_knob import MasterVolumeSettingsKnob
@@ -166,28 +166,31 @@ class SettingsView(AppBaseView):
     @view_is_not_active
     def on_activate(self):
         super().on_activate()
-        USER_DB_CURSOR.execute('SELECT app_width, app_height FROM graphics')
-        self.temp_windowed_resolution = USER_DB_CURSOR.fetchone()
+        # accepted settings are saved by save state worker, so current values are taken from settings model
+        settings = self.controller.model
+        self.temp_windowed_resolution = tuple(settings.windowed_resolution)
         self.available_windowed_resolutions_position = self.available_windowed_resolutions.index(
             self.temp_windowed_resolution
         )
         self.screen_resolution_control.on_activate()
         self.screen_resolution_control.on_init_state(self.available_windowed_resolutions_position)
-        USER_DB_CURSOR.execute('SELECT display_fps, fade_animations_enabled FROM graphics')
-        self.temp_display_fps, self.temp_fade_animations_enabled = USER_DB_CURSOR.fetchone()
+        self.temp_display_fps = settings.display_fps
+        self.temp_fade_animations_enabled = settings.fade_animations_enabled
         self.display_fps_checkbox.on_activate()
         self.display_fps_checkbox.on_change_state(self.temp_display_fps)
         self.fade_animations_checkbox.on_activate()
         self.fade_animations_checkbox.on_change_state(self.temp_fade_animations_enabled)
-        USER_DB_CURSOR.execute('SELECT clock_24h FROM i18n')
-        self.temp_clock_24h_enabled = USER_DB_CURSOR.fetchone()[0]
+        self.temp_clock_24h_enabled = settings.clock_24h_enabled
         self.clock_24h_checkbox.on_activate()
         self.clock_24h_checkbox.on_change_state(self.temp_clock_24h_enabled)
-        USER_DB_CURSOR.execute('SELECT * FROM notification_settings')
         self.temp_level_up_notification_enabled, self.temp_feature_unlocked_notification_enabled, \
             self.temp_construction_completed_notification_enabled, self.temp_enough_money_notification_enabled, \
             self.temp_bonus_expired_notification_enabled, self.temp_shop_storage_notification_enabled, \
-            self.temp_voice_not_found_notification_enabled = USER_DB_CURSOR.fetchone()
+            self.temp_voice_not_found_notification_enabled = \
+            settings.level_up_notification_enabled, settings.feature_unlocked_notification_enabled, \
+            settings.construction_completed_notification_enabled, settings.enough_money_notification_enabled, \
+            settings.bonus_expired_notification_enabled, settings.shop_storage_notification_enabled, \
+            settings.voice_not_found_notification_enabled
         self.game_progress_notifications_checkbox_group.on_activate()
         self.game_progress_notifications_checkbox_group.on_change_state(
             [
@@ -205,8 +208,8 @@ class SettingsView(AppBaseView):
                 self.temp_voice_not_found_notification_enabled
             ]
         )
-        USER_DB_CURSOR.execute('''SELECT master_volume, announcements_enabled FROM sound''')
-        self.temp_master_volume, self.temp_announcements_enabled = USER_DB_CURSOR.fetchone()
+        self.temp_master_volume = settings.master_volume
+        self.temp_announcements_enabled = settings.announcements_enabled
         self.master_volume_knob.on_activate()
         self.master_volume_knob.on_init_state(self.temp_master_volume)
         self.announcements_checkbox.on_activate()
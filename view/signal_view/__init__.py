@@ -2,7 +2,8 @@ from abc import ABC
 from logging import getLogger
 from typing import final
 
-from database import USER_DB_CURSOR
+from database import USER_DB_INDEX
+from ui import UPDATE_SCHEDULER
 from ui.sprite.signal_sprite import SignalSprite
 from view import MapBaseView, view_is_not_active
 
@@ -14,12 +15,12 @@ class SignalView(MapBaseView, ABC):
         )
         self.track, self.base_route = track, base_route
         self.signal_sprite = SignalSprite(self.map_id, self.track, self.base_route, parent_viewport=self.viewport)
-        USER_DB_CURSOR.execute(
-            '''SELECT state, locked FROM signals WHERE track = ? AND base_route = ? AND map_id = ?''',
-            (self.track, self.base_route, self.map_id)
+        self.state, self.locked = USER_DB_INDEX.get_row(
+            'signals', ('state', 'locked'), track=self.track, base_route=self.base_route, map_id=self.map_id
         )
-        self.state, self.locked = USER_DB_CURSOR.fetchone()
         self.on_append_window_handlers()
+        # sprite is created or deleted when map camera moves
+        UPDATE_SCHEDULER.on_add_map_view(self.map_id, self)
 
     @final
     @view_is_not_active
@@ -2,9 +2,13 @@ from abc import ABC
 from logging import getLogger
 from typing import final
 
+from numpy import ndarray, array, asarray, zeros, float32
+
 from database import USER_DB_CURSOR
-from ui.sprite.car_sprite import CarSprite
-from ui.sprite.boarding_lights_sprite import BoardingLightsSprite
+from game_loop import SIMULATION_SCHEDULER
+from ui import UPDATE_SCHEDULER, BATCHES, GROUPS
+from ui.instanced_car_renderer import INSTANCED_CAR_RENDERERS
+from ui.sprite_v2 import MAP_SPRITE_POOL
 from view import MapBaseView, view_is_not_active
 
 
@@ -13,17 +17,27 @@ class TrainView(MapBaseView, ABC):
         super().__init__(controller, map_id, logger=getLogger(f'root.app.game.map.{map_id}.train.{train_id}.view'))
         self.train_id = train_id
         self.car_position = []
+        self.previous_car_position = []
+        self.car_position_step = 0
         self.car_head_image = None
         self.car_mid_image = None
         self.car_tail_image = None
         self.boarding_light_image = None
+        self.car_textures = []
+        self.car_extents = None
         self.car_sprites = []
         self.boarding_light_sprites = []
+        self.car_renderer = INSTANCED_CAR_RENDERERS[self.map_id]
+        self.car_regions = None
+        self.boarding_car_regions = None
+        self.car_instances = None
+        self.car_visibility_mask = None
         self.direction = None
         self.car_image_collection = None
         self.state = None
         self.cars = None
         self.on_append_window_handlers()
+        UPDATE_SCHEDULER.on_add_map_view(self.map_id, self)
 
     def on_train_setup(self):
         USER_DB_CURSOR.execute(
@@ -41,52 +55,158 @@ class TrainView(MapBaseView, ABC):
     @view_is_not_active
     def on_activate(self):
         super().on_activate()
-        for i in range(self.cars):
-            self.car_sprites.append(CarSprite(self.map_id, self.train_id, parent_viewport=self.viewport))
-            if i == 0:
-                self.car_sprites[i].on_update_texture(self.car_head_image[self.car_image_collection][self.direction])
-            elif i == self.cars - 1:
-                self.car_sprites[i].on_update_texture(self.car_tail_image[self.car_image_collection][self.direction])
-            else:
-                self.car_sprites[i].on_update_texture(self.car_mid_image[self.car_image_collection])
+        self.car_textures = [self.car_mid_image[self.car_image_collection]] * self.cars
+        self.car_textures[-1] = self.car_tail_image[self.car_image_collection][self.direction]
+        self.car_textures[0] = self.car_head_image[self.car_image_collection][self.direction]
+        self.car_extents = array(
+            [(t.anchor_x, t.anchor_y, t.width - t.anchor_x, t.height - t.anchor_y) for t in self.car_textures],
+            dtype=float
+        )
+        if self.car_renderer.is_supported():
+            # x, y, rotation, texture region index and opacity of every car are drawn by map renderer
+            self.car_instances = zeros((self.cars, 5), dtype=float32)
+            self.car_instances[:, 4] = self.opacity
+            self.on_update_car_regions()
+        else:
+            # sprites are taken from the pool only for cars which are on the screen
+            self.car_sprites = [None] * self.cars
+            self.boarding_light_sprites = [None] * self.cars
 
-            self.boarding_light_sprites.append(
-                BoardingLightsSprite(self.map_id, self.train_id, parent_viewport=self.viewport)
-            )
-            self.boarding_light_sprites[i].on_update_texture(self.boarding_light_image[self.car_image_collection])
+        UPDATE_SCHEDULER.on_schedule_view_update(self)
+
+    @final
+    def on_update_car_position(self, car_position):
+        # train can be moved more than once during one step, previous position is the one from the previous step
+        if self.car_position_step != SIMULATION_SCHEDULER.step:
+            self.previous_car_position = self.car_position
+
+        self.car_position = car_position
+        self.car_position_step = SIMULATION_SCHEDULER.step
+        UPDATE_SCHEDULER.on_schedule_view_update(self)
+
+    @final
+    def on_update_state(self, state):
+        self.state = state
+        UPDATE_SCHEDULER.on_schedule_view_update(self)
+
+    @final
+    def get_interpolated_car_position(self):
+        # train moved during the last simulation step: x and y are interpolated between the last two steps,
+        # rotation is taken from the last step; train which did not move is drawn where it is
+        if self.car_position_step != SIMULATION_SCHEDULER.step \
+                or not isinstance(self.car_position, ndarray) or not isinstance(self.previous_car_position, ndarray) \
+                or self.previous_car_position.shape != self.car_position.shape:
+            return self.car_position
+
+        car_position = self.car_position.copy()
+        car_position[:, :2] = self.previous_car_position[:, :2] \
+            + (self.car_position[:, :2] - self.previous_car_position[:, :2]) * SIMULATION_SCHEDULER.alpha
+        return car_position
 
     @final
     def on_update(self):
-        for i in range(len(self.car_sprites)):
-            self.car_sprites[i].on_update_car_position(self.car_position[i])
-            self.boarding_light_sprites[i].on_update_car_position(self.car_position[i])
-            if self.car_sprites[i].is_located_outside_viewport():
-                self.car_sprites[i].delete()
-                self.boarding_light_sprites[i].delete()
-            else:
-                if i not in (0, len(self.car_position) - 1) and self.state == 'boarding_in_progress':
-                    self.car_sprites[i].delete()
-                    self.boarding_light_sprites[i].create()
-                else:
-                    self.boarding_light_sprites[i].delete()
-                    self.car_sprites[i].create()
+        # train which moved during the last simulation step is drawn on every frame until the next step
+        if self.car_position_step == SIMULATION_SCHEDULER.step:
+            UPDATE_SCHEDULER.on_schedule_view_update(self)
+
+        if self.car_instances is not None:
+            self.on_update_car_instances()
+            return
+
+        if len(self.car_sprites) == 0:
+            return
+
+        car_position = asarray(self.get_interpolated_car_position(), dtype=float)[:len(self.car_sprites)]
+        is_visible = MAP_SPRITE_POOL.get_visibility_mask(car_position, self.car_extents[:len(car_position)]).tolist()
+        for i, (x, y, rotation) in enumerate(car_position.tolist()):
+            # during boarding all cars except head and tail ones are displayed as boarding lights
+            is_boarding_light = i not in (0, len(self.car_sprites) - 1) and self.state == 'boarding_in_progress'
+            self.car_sprites[i] = self.on_update_sprite(
+                self.car_sprites[i], is_visible[i] and not is_boarding_light, self.car_textures[i], x, y, rotation
+            )
+            self.boarding_light_sprites[i] = self.on_update_sprite(
+                self.boarding_light_sprites[i], is_visible[i] and is_boarding_light,
+                self.boarding_light_image[self.car_image_collection], x, y, rotation
+            )
+
+    @final
+    def on_update_car_instances(self):
+        car_position = asarray(self.get_interpolated_car_position(), dtype=float)[:len(self.car_instances)]
+        self.car_visibility_mask = MAP_SPRITE_POOL.get_visibility_mask(
+            car_position, self.car_extents[:len(car_position)]
+        )
+        car_instances = self.car_instances[:len(car_position)]
+        car_instances[:, :3] = car_position
+        if self.state == 'boarding_in_progress':
+            car_instances[:, 3] = self.boarding_car_regions[:len(car_position)]
+        else:
+            car_instances[:, 3] = self.car_regions[:len(car_position)]
+
+        self.car_renderer.on_update_train(self, car_instances[self.car_visibility_mask])
+
+    @final
+    def on_update_car_regions(self):
+        self.car_regions = array([self.car_renderer.regions[t] for t in self.car_textures], dtype=float32)
+        # during boarding all cars except head and tail ones are displayed as boarding lights
+        self.boarding_car_regions = self.car_regions.copy()
+        self.boarding_car_regions[1:-1] \
+            = self.car_renderer.regions[self.boarding_light_image[self.car_image_collection]]
+
+    @final
+    def on_update_sprite(self, sprite, is_visible, texture, x, y, rotation):
+        # returns sprite which displays the car, or None if the car is not displayed
+        if not is_visible:
+            if sprite is not None:
+                MAP_SPRITE_POOL.on_release(sprite)
+
+            return None
+
+        if sprite is None:
+            return MAP_SPRITE_POOL.on_acquire(
+                texture, BATCHES['main_batch'], GROUPS['train'], x, y, rotation, self.opacity
+            )
+
+        sprite.update(x=x, y=y, rotation=rotation)
+        return sprite
 
     @final
     def on_update_opacity(self, new_opacity):
         super().on_update_opacity(new_opacity)
-        for i in range(len(self.car_sprites)):
-            self.car_sprites[i].on_update_opacity(self.opacity)
-            self.boarding_light_sprites[i].on_update_opacity(self.opacity)
+        for sprite in (*self.car_sprites, *self.boarding_light_sprites):
+            if sprite is not None:
+                if self.opacity > 0:
+                    sprite.opacity = self.opacity
+                else:
+                    MAP_SPRITE_POOL.on_release(sprite)
 
         if self.opacity <= 0:
             self.car_sprites = []
             self.boarding_light_sprites = []
 
+        if self.car_instances is not None:
+            if self.opacity > 0:
+                self.car_instances[:, 4] = self.opacity
+                if self.car_visibility_mask is not None:
+                    self.car_renderer.on_update_train(
+                        self, self.car_instances[:len(self.car_visibility_mask)][self.car_visibility_mask]
+                    )
+            else:
+                self.car_renderer.on_remove_train(self)
+                self.car_instances = None
+                self.car_visibility_mask = None
+
     @final
     def on_update_direction(self, new_direction):
         self.direction = new_direction
-        for i in range(len(self.car_sprites)):
-            if i == 0:
-                self.car_sprites[i].on_update_texture(self.car_head_image[self.car_image_collection][self.direction])
-            elif i == len(self.car_sprites) - 1:
-                self.car_sprites[i].on_update_texture(self.car_tail_image[self.car_image_collection][self.direction])
+        if len(self.car_sprites) > 0 or self.car_instances is not None:
+            self.car_textures[-1] = self.car_tail_image[self.car_image_collection][self.direction]
+            self.car_textures[0] = self.car_head_image[self.car_image_collection][self.direction]
+            if self.car_instances is not None:
+                self.on_update_car_regions()
+            else:
+                for i in {0, len(self.car_sprites) - 1}:
+                    if self.car_sprites[i] is not None:
+                        self.car_sprites[i].image = self.car_textures[i]
+
+        # car positions are reversed together with direction
+        UPDATE_SCHEDULER.on_schedule_view_update(self)